@@ -9,8 +9,16 @@ Supports two audio sources:
 
 Priority: WAV files are checked first, then MP3 files.
 
+Lookups go through an audio index (filename → size, mtime per directory)
+persisted to paths.AUDIO_INDEX_CACHE. The index is revalidated against the
+directory mtimes on every lookup and only newly added files are stat'ed, so
+scripts no longer list 1,600+ files on startup.
+
+Words are matched through word_normalization keys precomputed into the
+index, so NFD filenames, "ß"/"ss" and "ae"/"ä" spellings all resolve.
+
 Usage:
-    from audio_checker import check_audio, get_audio_path
+    from audio_checker import check_audio, find_audio_path, find_audio_paths
 
     audio_path = check_audio("Tisch")
     if audio_path:
@@ -19,8 +27,11 @@ Usage:
         print("Audio missing!")
 """
 
+import json
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add project root to Python path
@@ -28,40 +39,244 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import paths
+from flashcards.scripts.file_utils import atomic_write
+from flashcards.scripts.word_normalization import normalize_word, transliterate_word
 
 # Audio directories (checked in priority order)
-AUDIO_DIRS = [
-    {
-        'path': paths.AUDIO_GENERATED,
-        'extension': '.wav',
-        'description': 'Generated (Piper TTS)'
-    },
-    {
-        'path': paths.AUDIO_DUOLINGO,
-        'extension': '.mp3',
-        'description': 'Legacy (Duolingo)'
-    }
-]
+def get_audio_dirs():
+    """
+    Audio directories in priority order.
 
-def check_audio(word):
+    Resolved from paths at call time (tests monkeypatch the audio paths).
     """
-    Check if audio file exists for a given German word.
-    Checks both WAV (generated) and MP3 (legacy) directories.
+    return [
+        {
+            'path': paths.AUDIO_GENERATED,
+            'extension': '.wav',
+            'description': 'Generated (Piper TTS)'
+        },
+        {
+            'path': paths.AUDIO_DUOLINGO,
+            'extension': '.mp3',
+            'description': 'Legacy (Duolingo)'
+        }
+    ]
 
-    Uses case-insensitive matching to handle different word casings:
-    - "sehr" (lowercase adverb) → "Sehr.mp3"
-    - "Mann" (capitalized noun) → "Mann.mp3"
-    - "Frau" (capitalized) → "frau.mp3" (if file is lowercase)
+AUDIO_DIRS = get_audio_dirs()
+
+# Bump when the cache layout changes; older caches are rebuilt from scratch
+INDEX_CACHE_VERSION = 3
+
+# Directory mtimes this close to "now" may still change within the same
+# timestamp tick, so they are not trusted when persisted (forces a rescan)
+RACY_MTIME_NS = 2 * 1_000_000_000
+
+# In-memory index for this process: {dir path: entry}
+_audio_index = {}
+_cache_loaded = False
+
+def _stat_file(path):
+    """Worker: [size, mtime_ns] of one file (None if it vanished)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def _scan_directory(dir_path, extension, old_entry, workers=None):
+    """
+    Build an index entry for one audio directory.
+
+    Files already present in old_entry keep their cached size/mtime; only
+    newly added files are stat'ed. Removed files simply drop out.
 
     Args:
-        word (str): German word to check (e.g., "Tisch", "Büro", "sehr")
+        workers (int): Stat new files in a thread pool of this size
+                       (cold cache on slow/network storage); default: sequential
 
     Returns:
-        str: Filename if audio exists (e.g., "Tisch.wav" or "Sehr.mp3"), None otherwise
+        dict: {'mtime_ns': int, 'files': {filename: [size, mtime_ns]},
+               'keys': {normalized stem: filename},
+               'translit': {transliterated stem: filename}}
     """
-    if not word:
-        return None
+    try:
+        dir_mtime = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        return {'mtime_ns': None, 'files': {}, 'keys': {}, 'translit': {}}
+
+    old_files = old_entry['files'] if old_entry else {}
+    files = {}
+    new_names = []
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                if entry.name in old_files:
+                    files[entry.name] = old_files[entry.name]
+                else:
+                    new_names.append(entry.name)
+    except OSError:
+        pass  # Directory access error, keep what we have
+
+    if workers and workers > 1 and len(new_names) > workers:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            stats = pool.map(_stat_file, (os.path.join(dir_path, name) for name in new_names))
+            new_files = dict(zip(new_names, stats))
+    else:
+        new_files = {name: _stat_file(os.path.join(dir_path, name)) for name in new_names}
+    files.update((name, st) for name, st in new_files.items() if st is not None)
+
+    # Normalized stem lookups; sorted so collisions are deterministic
+    keys = {}
+    translit = {}
+    for name in sorted(files):
+        if name.endswith(extension):
+            key = normalize_word(Path(name).stem)
+            keys.setdefault(key, name)
+            translit.setdefault(transliterate_word(key), name)
+
+    return {'mtime_ns': dir_mtime, 'files': files, 'keys': keys, 'translit': translit}
+
+def _load_index_cache():
+    """Load persisted index entries from paths.AUDIO_INDEX_CACHE (if valid)"""
+    cache_file = paths.AUDIO_INDEX_CACHE
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(data, dict) or data.get('version') != INDEX_CACHE_VERSION:
+        return {}
+    return data.get('dirs', {})
+
+def _save_index_cache():
+    """Persist the in-memory index (write to temp file, then rename)"""
+    cache_file = paths.AUDIO_INDEX_CACHE
+    now_ns = time.time_ns()
+
+    dirs = {}
+    for dir_key, entry in _audio_index.items():
+        mtime_ns = entry['mtime_ns']
+        if mtime_ns is not None and now_ns - mtime_ns < RACY_MTIME_NS:
+            mtime_ns = None  # Racy: directory may change again within this tick
+        dirs[dir_key] = dict(entry, mtime_ns=mtime_ns)
+
+    try:
+        with atomic_write(cache_file) as f:
+            json.dump({'version': INDEX_CACHE_VERSION, 'dirs': dirs}, f, ensure_ascii=False)
+    except OSError:
+        pass  # Cache is an optimization only
+
+def get_audio_index(audio_dirs=None, workers=None):
+    """
+    Get the audio index, revalidated against directory mtimes.
+
+    Costs one stat() per audio directory when nothing changed. A changed
+    directory is re-listed and only its new files are stat'ed; the result
+    is written back to the on-disk cache.
+
+    Args:
+        audio_dirs (list): Audio directory configs (default: get_audio_dirs())
+        workers (int): Thread pool size for rescans; changed directories are
+                       scanned concurrently and new files stat'ed in parallel
+
+    Returns:
+        dict: {dir path (str): {'mtime_ns', 'files', 'keys', 'translit'}} for each directory
+    """
+    global _cache_loaded
+
+    if audio_dirs is None:
+        audio_dirs = get_audio_dirs()
+
+    if not _cache_loaded:
+        _audio_index.update(_load_index_cache())
+        _cache_loaded = True
+
+    stale = []
+    for audio_dir in audio_dirs:
+        dir_key = str(audio_dir['path'])
+        entry = _audio_index.get(dir_key)
+
+        try:
+            dir_mtime = os.stat(audio_dir['path']).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+
+        if entry is not None and dir_mtime is not None and entry['mtime_ns'] == dir_mtime:
+            continue  # Fast path: directory unchanged since last scan
+        if entry is not None and dir_mtime is None and not entry['files']:
+            continue  # Directory still missing
+
+        stale.append((dir_key, audio_dir, entry))
+
+    if len(stale) > 1 and workers and workers > 1:
+        # Cold cache: scan directories concurrently
+        with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+            futures = [
+                pool.submit(_scan_directory, audio_dir['path'], audio_dir['extension'], entry, workers)
+                for _, audio_dir, entry in stale
+            ]
+            for (dir_key, _, _), future in zip(stale, futures):
+                _audio_index[dir_key] = future.result()
+    else:
+        for dir_key, audio_dir, entry in stale:
+            _audio_index[dir_key] = _scan_directory(audio_dir['path'], audio_dir['extension'], entry, workers)
+
+    if stale:
+        _save_index_cache()
+
+    return {str(d['path']): _audio_index[str(d['path'])] for d in audio_dirs}
+
+def find_audio_path(filename):
+    """
+    Locate an audio file by exact filename (e.g. "Tisch.wav").
 
+    Args:
+        filename (str): Audio filename as referenced in the deck
+
+    Returns:
+        Path: Full path to the file, or None if not in any audio directory
+    """
+    return find_audio_paths([filename]).get(filename)
+
+def find_audio_paths(filenames):
+    """
+    Locate many audio files by exact filename, revalidating the index once.
+
+    Only the audio index is consulted (one stat() per directory); the
+    files themselves are not stat'ed or read.
+
+    Args:
+        filenames (iterable): Audio filenames as referenced in the deck
+
+    Returns:
+        dict: {filename: Path} for the files found (missing ones are left out)
+    """
+    audio_dirs = get_audio_dirs()
+    index = get_audio_index(audio_dirs)
+
+    found = {}
+    for filename in filenames:
+        for audio_dir in audio_dirs:
+            if filename in index[str(audio_dir['path'])]['files']:
+                found[filename] = audio_dir['path'] / filename
+                break
+    return found
+
+def _resolve_word(word, audio_dirs, index, transliterate=True):
+    """
+    Resolve one word against an already revalidated index.
+
+    Three passes, each over all directories in priority order: exact casing
+    variations, then the normalized key (NFC, lowercase), then optionally
+    the transliterated key. An exact "Masse.mp3" in a later directory
+    therefore wins over a fuzzy "Maße.wav" match in an earlier one.
+
+    Returns:
+        tuple: (filename, audio_dir config) or (None, None) if missing
+    """
     # Try multiple casing variations
     variations = [
         word[0].upper() + word[1:],  # Capitalize first letter (most common for audio files)
@@ -73,31 +288,93 @@ def check_audio(word):
     # Remove duplicates while preserving order
     variations = list(dict.fromkeys(variations))
 
-    # Check each audio directory in priority order
-    for audio_dir in AUDIO_DIRS:
-        # Try each variation
+    entries = [(audio_dir, index[str(audio_dir['path'])]) for audio_dir in audio_dirs]
+
+    for audio_dir, entry in entries:
         for variant in variations:
             filename = f"{variant}{audio_dir['extension']}"
-            filepath = audio_dir['path'] / filename
+            if filename in entry['files']:
+                return filename, audio_dir
+
+    # No exact match: normalized stem ("MÄNNER", NFD filenames)
+    key = normalize_word(word)
+    for audio_dir, entry in entries:
+        if key in entry['keys']:
+            return entry['keys'][key], audio_dir  # Actual filename with correct casing
 
-            if filepath.exists():
-                return filename
+    # "Maenner" → "Männer.wav", "Strasse" → "Straße.wav"
+    if transliterate:
+        translit_key = transliterate_word(key)
+        for audio_dir, entry in entries:
+            if translit_key in entry['translit']:
+                return entry['translit'][translit_key], audio_dir
 
-        # If no exact match found, do case-insensitive search in directory
-        if audio_dir['path'].exists():
-            try:
-                files = [f.name for f in audio_dir['path'].iterdir() if f.is_file()]
-                word_lower = word.lower()
+    return None, None
 
-                for file in files:
-                    # Check if filename (without extension) matches word (case-insensitive)
-                    file_base = Path(file).stem.lower()
-                    if file_base == word_lower and file.endswith(audio_dir['extension']):
-                        return file  # Return actual filename with correct casing
-            except OSError:
-                pass  # Directory access error, continue to next
+def check_audio(word):
+    """
+    Check if audio file exists for a given German word.
+    Checks both WAV (generated) and MP3 (legacy) directories.
+
+    Uses case-insensitive matching to handle different word casings:
+    - "sehr" (lowercase adverb) → "Sehr.mp3"
+    - "Mann" (capitalized noun) → "Mann.mp3"
+    - "Frau" (capitalized) → "frau.mp3" (if file is lowercase)
+    - "Maenner" (transliterated) → "Männer.wav"
+
+    Args:
+        word (str): German word to check (e.g., "Tisch", "Büro", "sehr")
+
+    Returns:
+        str: Filename if audio exists (e.g., "Tisch.wav" or "Sehr.mp3"), None otherwise
+    """
+    if not word:
+        return None
 
-    return None
+    audio_dirs = get_audio_dirs()
+    filename, _ = _resolve_word(word, audio_dirs, get_audio_index(audio_dirs))
+    return filename
+
+def lookup_audio_batch(words, transliterate=True, workers=None):
+    """
+    Resolve audio for a whole word list in one pass over the index.
+
+    The index is revalidated once for the batch (instead of once per word),
+    and repeated words are resolved only once. Use this instead of calling
+    check_audio() in a loop whenever more than a handful of words are checked.
+
+    Args:
+        words (iterable): German words to check
+        transliterate (bool): Also match umlaut transliterations ("Maenner" → "Männer")
+        workers (int): Thread pool size for a cold index (see get_audio_index)
+
+    Returns:
+        dict: {
+            'found': {word: filename, ...},
+            'missing': [word, ...],          # input order, no duplicates
+            'by_dir': {description: hits}    # per-directory hit statistics
+        }
+    """
+    audio_dirs = get_audio_dirs()
+    index = get_audio_index(audio_dirs, workers)
+
+    found = {}
+    missing = []
+    by_dir = {audio_dir['description']: 0 for audio_dir in audio_dirs}
+
+    for word in dict.fromkeys(words):
+        filename, audio_dir = _resolve_word(word, audio_dirs, index, transliterate) if word else (None, None)
+        if filename:
+            found[word] = filename
+            by_dir[audio_dir['description']] += 1
+        else:
+            missing.append(word)
+
+    return {
+        'found': found,
+        'missing': missing,
+        'by_dir': by_dir
+    }
 
 def get_audio_field(word):
     """
@@ -124,22 +401,16 @@ def check_multiple_words(words):
     Returns:
         dict: {
             'found': [(word, filename), ...],
-            'missing': [word, ...]
+            'missing': [word, ...],
+            'by_dir': {description: hits}
         }
     """
-    found = []
-    missing = []
-
-    for word in words:
-        audio = check_audio(word)
-        if audio:
-            found.append((word, audio))
-        else:
-            missing.append(word)
+    result = lookup_audio_batch(words)
 
     return {
-        'found': found,
-        'missing': missing
+        'found': list(result['found'].items()),
+        'missing': result['missing'],
+        'by_dir': result['by_dir']
     }
 
 def print_audio_report(words, word_type="words"):
@@ -158,6 +429,8 @@ def print_audio_report(words, word_type="words"):
     print(f"\n✅ Found ({len(result['found'])})")
     for word, filename in result['found']:
         print(f"   • {word:20} → {filename}")
+    for description, hits in result['by_dir'].items():
+        print(f"   {description}: {hits}")
 
     if result['missing']:
         print(f"\n❌ Missing ({len(result['missing'])})")
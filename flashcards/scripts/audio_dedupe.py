@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Duplicate audio detection across the generated and Duolingo libraries.
+
+Finds redundant copies in three stages, each cheaper stage narrowing the
+input of the next one:
+
+1. Size bucketing - only files sharing a byte size can be identical
+2. Content hashing - SHA-256 within each size bucket (byte-identical copies)
+3. Audio fingerprinting (optional, --pcm) - hash of the audio payload only:
+   WAV sample data without header/metadata chunks, MP3 frames without ID3
+   tags. Catches the same recording saved with different tags or headers.
+
+For every duplicate group the winner is chosen with the audio_checker
+priority (generated WAV before Duolingo MP3, then the file check_audio()
+actually resolves for its word); the rest are reported as redundant.
+
+Additionally reports "shadowed" MP3s: words that have audio in both
+libraries, where check_audio() always picks the WAV. Shadowed files still
+referenced by the deck's Audio column are marked as such and must be kept.
+
+Usage:
+    python3 audio_dedupe.py
+    python3 audio_dedupe.py --pcm          # also compare audio payloads
+    python3 audio_dedupe.py --workers 8
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from flashcards.scripts.audio_checker import get_audio_dirs, get_audio_index, lookup_audio_batch
+from flashcards.scripts.audio_formats import file_sha256, parse_wav
+from flashcards.scripts.media_manifest import format_mb, load_manifest, read_deck_audio_references
+from flashcards.scripts.word_normalization import normalize_word
+
+def collect_audio_files():
+    """
+    List all audio files with their size and audio_checker priority.
+
+    Returns:
+        list: [{'path', 'file', 'dir', 'priority', 'size'}, ...]
+    """
+    audio_dirs = get_audio_dirs()
+    index = get_audio_index(audio_dirs)
+
+    files = []
+    for priority, audio_dir in enumerate(audio_dirs):
+        for filename in sorted(index[str(audio_dir['path'])]['files']):
+            if not filename.endswith(audio_dir['extension']):
+                continue
+            path = audio_dir['path'] / filename
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue  # Removed since the index was built
+            files.append({
+                'path': path,
+                'file': filename,
+                'dir': audio_dir['description'],
+                'priority': priority,
+                'size': size,
+            })
+    return files
+
+def bucket_by_size(files):
+    """Stage 1: group files by size, keeping only buckets with 2+ files"""
+    buckets = defaultdict(list)
+    for record in files:
+        buckets[record['size']].append(record)
+    return [bucket for bucket in buckets.values() if len(bucket) > 1]
+
+def fingerprint_audio(data, extension):
+    """
+    Stage 3: hash of the audio payload only.
+
+    WAV: sample data (plus format parameters), ignoring header/LIST chunks.
+    MP3: everything between the ID3v2 tag and the ID3v1 trailer.
+
+    Returns:
+        str: Hex digest, or None if the file cannot be parsed
+    """
+    if extension == '.wav':
+        try:
+            wav = parse_wav(data)
+        except ValueError:
+            return None
+        payload = data[wav['data_offset']:wav['data_offset'] + wav['data_size']]
+        params = f"{wav['format_tag']}:{wav['channels']}:{wav['sample_rate']}:{wav['bits']}"
+        return hashlib.sha256(params.encode('ascii') + b'\0' + payload).hexdigest()
+
+    start, end = 0, len(data)
+    if data[:3] == b'ID3' and len(data) >= 10:
+        start = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+    if end - start >= 128 and data[end - 128:end - 125] == b'TAG':
+        end -= 128
+    return hashlib.sha256(data[start:end]).hexdigest()
+
+def _hash_file(record, manifest):
+    """Worker: SHA-256 of one file, reusing the media manifest when size+mtime match"""
+    try:
+        st = record['path'].stat()
+        entry = manifest['dirs'].get(str(record['path'].parent), {}).get(record['file'])
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            return entry['sha256']
+        return file_sha256(record['path'].read_bytes())
+    except OSError:
+        return None
+
+def _fingerprint_file(record):
+    """Worker: audio payload fingerprint of one file"""
+    try:
+        data = record['path'].read_bytes()
+    except OSError:
+        return None
+    return fingerprint_audio(data, record['path'].suffix)
+
+def _group(records, keys):
+    """Group records by key, keeping only groups with 2+ members"""
+    groups = defaultdict(list)
+    for record, key in zip(records, keys):
+        if key:
+            groups[key].append(record)
+    return [group for group in groups.values() if len(group) > 1]
+
+def choose_winner(group, resolved):
+    """
+    Order a duplicate group by audio_checker priority.
+
+    Args:
+        group (list): Duplicate file records
+        resolved (dict): {word: filename} as returned by lookup_audio_batch
+
+    Returns:
+        tuple: (winner record, [redundant records])
+    """
+    def sort_key(record):
+        stem = Path(record['file']).stem
+        is_resolved = resolved.get(stem) == record['file']
+        return (record['priority'], not is_resolved, record['file'])
+
+    ordered = sorted(group, key=sort_key)
+    return ordered[0], ordered[1:]
+
+def find_duplicates(pcm=False, workers=None):
+    """
+    Find redundant audio files.
+
+    Args:
+        pcm (bool): Also compare audio payload fingerprints (reads every file)
+        workers (int): Thread pool size (default: CPU count)
+
+    Returns:
+        dict: {
+            'total_files', 'total_bytes',
+            'identical': [{'winner', 'redundant', 'referenced'}, ...],   # byte-identical
+            'same_audio': [{'winner', 'redundant', 'referenced'}, ...],  # same payload (--pcm)
+            'shadowed': [{'winner', 'redundant', 'referenced'}, ...]
+        }
+        'referenced' lists the redundant files the deck's Audio column still
+        uses by filename: deleting them would break cards.
+    """
+    files = collect_audio_files()
+    resolved = lookup_audio_batch(Path(r['file']).stem for r in files)['found']
+    manifest = load_manifest()
+    references = read_deck_audio_references()
+
+    def duplicate_group(winner, redundant):
+        return {
+            'winner': winner,
+            'redundant': redundant,
+            'referenced': [r for r in redundant if r['file'] in references],
+        }
+
+    # Stage 1 + 2: size buckets, then content hashes within the buckets
+    candidates = [record for bucket in bucket_by_size(files) for record in bucket]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        hashes = list(pool.map(lambda r: _hash_file(r, manifest), candidates))
+
+        identical = []
+        grouped_paths = set()
+        for group in _group(candidates, hashes):
+            winner, redundant = choose_winner(group, resolved)
+            identical.append(duplicate_group(winner, redundant))
+            grouped_paths.update(r['path'] for r in redundant)
+
+        # Stage 3: audio payload fingerprints over the remaining files
+        same_audio = []
+        if pcm:
+            remaining = [r for r in files if r['path'] not in grouped_paths]
+            fingerprints = list(pool.map(_fingerprint_file, remaining))
+            for group in _group(remaining, fingerprints):
+                winner, redundant = choose_winner(group, resolved)
+                same_audio.append(duplicate_group(winner, redundant))
+
+    # Words with audio in several libraries: check_audio() only ever returns one
+    by_stem = defaultdict(list)
+    for record in files:
+        by_stem[normalize_word(Path(record['file']).stem)].append(record)
+
+    shadowed = []
+    for stem, group in sorted(by_stem.items()):
+        if len({r['priority'] for r in group}) < 2:
+            continue
+        winner, redundant = choose_winner(group, resolved)
+        redundant = [r for r in redundant if r['priority'] != winner['priority']]
+        shadowed.append(duplicate_group(winner, redundant))
+
+    return {
+        'total_files': len(files),
+        'total_bytes': sum(r['size'] for r in files),
+        'identical': identical,
+        'same_audio': same_audio,
+        'shadowed': shadowed,
+    }
+
+def reclaimable_bytes(report):
+    """Bytes freed by deleting every redundant file the deck does not reference"""
+    reclaimable = 0
+    counted = set()
+    for key in ('identical', 'same_audio', 'shadowed'):
+        for group in report[key]:
+            referenced = {r['path'] for r in group['referenced']}
+            for record in group['redundant']:
+                if record['path'] not in referenced and record['path'] not in counted:
+                    counted.add(record['path'])
+                    reclaimable += record['size']
+    return reclaimable
+
+def print_dedupe_report(report):
+    """Print duplicate groups and reclaimable space"""
+    print(f"\n🧹 Audio Duplicate Report for {report['total_files']} files ({format_mb(report['total_bytes'])})")
+    print("=" * 60)
+
+    sections = [
+        ('identical', "Byte-identical copies"),
+        ('same_audio', "Same audio, different headers/tags"),
+    ]
+    for key, title in sections:
+        groups = report[key]
+        if not groups:
+            continue
+        print(f"\n❌ {title} ({len(groups)} groups)")
+        for group in groups:
+            referenced = {r['path'] for r in group['referenced']}
+            print(f"   • keep {group['winner']['file']} [{group['winner']['dir']}]")
+            for record in group['redundant']:
+                note = " (referenced by deck - keep)" if record['path'] in referenced else ""
+                print(f"       redundant: {record['file']} [{record['dir']}]{note}")
+
+    if report['shadowed']:
+        shadowed_files = [r for g in report['shadowed'] for r in g['redundant']]
+        print(f"\n⚠️  Shadowed by higher-priority audio ({len(shadowed_files)} files)")
+        for group in report['shadowed']:
+            referenced = {r['path'] for r in group['referenced']}
+            for record in group['redundant']:
+                note = " (referenced by deck - keep)" if record['path'] in referenced else ""
+                print(f"   • {record['file']:30} → {group['winner']['file']}{note}")
+
+    if not (report['identical'] or report['same_audio'] or report['shadowed']):
+        print("\n✅ No duplicate audio found!")
+
+    print(f"\nReclaimable: {format_mb(reclaimable_bytes(report))}")
+    print("=" * 60)
+
+def main():
+    parser = argparse.ArgumentParser(description="Report duplicate audio files across both libraries")
+    parser.add_argument('--pcm', action='store_true',
+                        help='Also compare audio payload fingerprints (reads every file)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker threads (default: CPU count)')
+    args = parser.parse_args()
+
+    print_dedupe_report(find_duplicates(pcm=args.pcm, workers=args.workers))
+
+if __name__ == '__main__':
+    main()
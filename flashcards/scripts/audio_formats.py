@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Audio file format helpers shared by the audio tools.
+
+Parses WAV (RIFF chunks) and MP3 (MPEG frame headers) without external
+decoders, computes content hashes, and measures WAV levels with NumPy when
+it is installed. Used by audio_integrity.py, audio_dedupe.py and
+media_manifest.py.
+"""
+
+import hashlib
+import struct
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Level thresholds (WAV only)
+SILENCE_DBFS = -50.0      # RMS below this is treated as silence
+FLOOR_DBFS = -120.0       # Reported for digital silence (keeps the level finite and JSON-safe)
+CLIP_LEVEL = 0.999        # Fraction of full scale counted as clipped
+CLIP_RATIO = 0.001        # Flag when more than 0.1% of samples are clipped
+MIN_DURATION = 0.1        # Seconds; anything shorter is not a usable word
+
+# MPEG audio frame header tables
+MPEG_BITRATES = {
+    # (version_id is MPEG1, layer) -> kbps by index
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MPEG_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG1
+    2: [22050, 24000, 16000],  # MPEG2
+    0: [11025, 12000, 8000],   # MPEG2.5
+}
+
+def file_sha256(data):
+    """SHA-256 hex digest of file content (bytes)"""
+    return hashlib.sha256(data).hexdigest()
+
+def parse_wav(data):
+    """
+    Parse a RIFF/WAVE file.
+
+    Returns:
+        dict: {'format_tag', 'channels', 'sample_rate', 'bits',
+               'data_offset', 'data_size', 'truncated'}
+
+    Raises:
+        ValueError: If the header is not a valid WAVE header
+    """
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError("Not a RIFF/WAVE file")
+
+    fmt = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack('<I', data[pos + 4:pos + 8])[0]
+        body = pos + 8
+
+        if chunk_id == b'fmt ':
+            if chunk_size < 16 or body + 16 > len(data):
+                raise ValueError("Truncated fmt chunk")
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', data[body:body + 16])
+            if format_tag == 0xFFFE and chunk_size >= 26:
+                # WAVE_FORMAT_EXTENSIBLE: real format is the first 2 bytes of the subformat GUID
+                format_tag = struct.unpack('<H', data[body + 24:body + 26])[0]
+            fmt = {
+                'format_tag': format_tag,
+                'channels': channels,
+                'sample_rate': sample_rate,
+                'bits': bits,
+            }
+        elif chunk_id == b'data':
+            if fmt is None:
+                raise ValueError("data chunk before fmt chunk")
+            available = len(data) - body
+            return dict(
+                fmt,
+                data_offset=body,
+                data_size=min(chunk_size, available),
+                truncated=chunk_size > available,
+            )
+
+        pos = body + chunk_size + (chunk_size & 1)  # Chunks are word-aligned
+
+    if fmt is None:
+        raise ValueError("No fmt chunk")
+    # fmt present but the data chunk is missing entirely
+    return dict(fmt, data_offset=len(data), data_size=0, truncated=True)
+
+def wav_levels(data, wav):
+    """
+    Compute RMS level (dBFS) and clipped sample ratio with NumPy.
+
+    Returns:
+        tuple: (rms_dbfs, clipped_ratio), or (None, None) for unsupported formats;
+               rms_dbfs is clamped to FLOOR_DBFS (all-zero samples have no finite level)
+    """
+    raw = data[wav['data_offset']:wav['data_offset'] + wav['data_size']]
+    bits = wav['bits']
+
+    if wav['format_tag'] == 1 and bits == 16:
+        samples = np.frombuffer(raw[:len(raw) - len(raw) % 2], dtype='<i2').astype(np.float32) / 32768.0
+    elif wav['format_tag'] == 1 and bits == 32:
+        samples = np.frombuffer(raw[:len(raw) - len(raw) % 4], dtype='<i4').astype(np.float64) / 2147483648.0
+    elif wav['format_tag'] == 1 and bits == 8:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif wav['format_tag'] == 3 and bits == 32:
+        samples = np.frombuffer(raw[:len(raw) - len(raw) % 4], dtype='<f4')
+    else:
+        return None, None
+
+    if samples.size == 0:
+        return None, None
+
+    rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+    rms_dbfs = max(20.0 * np.log10(rms), FLOOR_DBFS) if rms > 0 else FLOOR_DBFS
+    clipped_ratio = float(np.count_nonzero(np.abs(samples) >= CLIP_LEVEL)) / samples.size
+    return round(float(rms_dbfs), 2), round(clipped_ratio, 6)
+
+def parse_mp3(data):
+    """
+    Walk the MPEG audio frames of an MP3 file.
+
+    Returns:
+        dict: {'sample_rate', 'channels', 'frames', 'duration', 'truncated'}
+
+    Raises:
+        ValueError: If no valid MPEG frame is found
+    """
+    pos = 0
+    end = len(data)
+
+    # Skip ID3v2 tag (size is a 28-bit synchsafe integer)
+    if data[:3] == b'ID3' and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        pos = 10 + size + (10 if data[5] & 0x10 else 0)
+
+    # Ignore ID3v1 trailer
+    if end - pos >= 128 and data[end - 128:end - 125] == b'TAG':
+        end -= 128
+
+    frames = 0
+    samples = 0
+    sample_rate = None
+    channels = None
+    truncated = False
+
+    while pos + 4 <= end:
+        b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+        if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+            if frames == 0:
+                pos += 1  # Still searching for the first frame sync
+                continue
+            break  # Lost sync after audio: trailing junk
+
+        version = (b1 >> 3) & 0x03   # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+        layer = 4 - ((b1 >> 1) & 0x03)
+        bitrate_index = b2 >> 4
+        rate_index = (b2 >> 2) & 0x03
+        padding = (b2 >> 1) & 0x01
+
+        if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+            if frames == 0:
+                pos += 1
+                continue
+            break
+
+        is_mpeg1 = version == 3
+        bitrate = MPEG_BITRATES[(is_mpeg1, layer)][bitrate_index] * 1000
+        rate = MPEG_SAMPLE_RATES[version][rate_index]
+
+        if layer == 1:
+            frame_len = (12 * bitrate // rate + padding) * 4
+            frame_samples = 384
+        elif layer == 3 and not is_mpeg1:
+            frame_len = 72 * bitrate // rate + padding
+            frame_samples = 576
+        else:
+            frame_len = 144 * bitrate // rate + padding
+            frame_samples = 1152
+
+        if pos + frame_len > end:
+            truncated = True
+            break
+
+        frames += 1
+        samples += frame_samples
+        sample_rate = rate
+        channels = 1 if (b3 >> 6) == 3 else 2
+        pos += frame_len
+
+    if frames == 0:
+        raise ValueError("No MPEG audio frames found")
+
+    return {
+        'sample_rate': sample_rate,
+        'channels': channels,
+        'frames': frames,
+        'duration': samples / sample_rate,
+        'truncated': truncated,
+    }
+
+def analyze_audio(data, extension, levels=True):
+    """
+    Analyze one audio file's content.
+
+    Args:
+        data (bytes): File content
+        extension (str): '.wav' or '.mp3'
+        levels (bool): Measure RMS level and clipping (WAV, needs NumPy)
+
+    Returns:
+        dict: {'size', 'duration', 'sample_rate', 'channels',
+               'rms_dbfs', 'clipped_ratio', 'issues': [...]}
+    """
+    result = {
+        'size': len(data),
+        'duration': None,
+        'sample_rate': None,
+        'channels': None,
+        'rms_dbfs': None,
+        'clipped_ratio': None,
+        'issues': [],
+    }
+
+    if not data:
+        result['issues'].append('empty')
+        return result
+
+    try:
+        if extension == '.wav':
+            wav = parse_wav(data)
+            frame_bytes = wav['channels'] * wav['bits'] // 8
+            result['sample_rate'] = wav['sample_rate']
+            result['channels'] = wav['channels']
+            if frame_bytes and wav['sample_rate']:
+                result['duration'] = round(wav['data_size'] / frame_bytes / wav['sample_rate'], 3)
+            if wav['truncated']:
+                result['issues'].append('truncated')
+            if levels and HAS_NUMPY and wav['data_size']:
+                rms_dbfs, clipped_ratio = wav_levels(data, wav)
+                result['rms_dbfs'] = rms_dbfs
+                result['clipped_ratio'] = clipped_ratio
+                if rms_dbfs is not None and rms_dbfs < SILENCE_DBFS:
+                    result['issues'].append('silent')
+                if clipped_ratio is not None and clipped_ratio > CLIP_RATIO:
+                    result['issues'].append('clipped')
+        else:
+            mp3 = parse_mp3(data)
+            result['sample_rate'] = mp3['sample_rate']
+            result['channels'] = mp3['channels']
+            result['duration'] = round(mp3['duration'], 3)
+            if mp3['truncated']:
+                result['issues'].append('truncated')
+    except ValueError as e:
+        result['issues'].append('corrupt')
+        result['error'] = str(e)
+        return result
+
+    if not result['duration'] or result['duration'] < MIN_DURATION:
+        result['issues'].append('empty')
+
+    return result
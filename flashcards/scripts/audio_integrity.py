@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Audio integrity and silence verifier for both audio directories.
+
+audio_checker.py only checks that a file exists. This scanner parses the
+WAV/MP3 headers of every file and flags the ones that would end up as broken
+cards in a package:
+
+- empty:     zero-length file or no audio frames/samples
+- corrupt:   header cannot be parsed (not RIFF/WAVE, no MPEG frame sync)
+- truncated: data chunk or last MPEG frame extends past the end of file
+- silent:    RMS level below SILENCE_DBFS (WAV only, needs NumPy)
+- clipped:   too many samples at full scale (WAV only, needs NumPy)
+
+Files are analyzed in a thread pool. Results are cached by content hash in
+paths.AUDIO_INTEGRITY_CACHE; hashes come from the media manifest, so files
+whose size and mtime did not change are not even re-read and re-scans cost
+almost nothing.
+
+Usage:
+    python3 audio_integrity.py
+    python3 audio_integrity.py --workers 8
+    python3 audio_integrity.py --no-cache   # re-analyze everything
+
+Exit code: 0 if all files are OK, 1 if any problems were found
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import paths
+from flashcards.scripts.audio_checker import get_audio_dirs
+from flashcards.scripts.audio_formats import HAS_NUMPY, analyze_audio
+from flashcards.scripts.file_utils import atomic_write
+from flashcards.scripts.media_manifest import update_manifest
+
+# Bump when analysis logic or cache layout changes; older cached results are discarded
+INTEGRITY_CACHE_VERSION = 3
+
+def _analyze_file(path, extension):
+    """Worker: read and analyze one file"""
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        return {'size': 0, 'issues': ['corrupt'], 'error': str(e)}
+    return analyze_audio(data, extension)
+
+def load_integrity_cache():
+    """Load cached results: {'results': {sha256: result}}"""
+    try:
+        with open(paths.AUDIO_INTEGRITY_CACHE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {'results': {}}
+
+    if not isinstance(data, dict) or data.get('version') != INTEGRITY_CACHE_VERSION:
+        return {'results': {}}
+    return {'results': data.get('results', {})}
+
+def save_integrity_cache(cache):
+    """Persist cached results (write to temp file, then rename)"""
+    cache_file = paths.AUDIO_INTEGRITY_CACHE
+    try:
+        with atomic_write(cache_file) as f:
+            json.dump(dict(cache, version=INTEGRITY_CACHE_VERSION), f, ensure_ascii=False)
+    except OSError:
+        pass  # Cache is an optimization only
+
+def scan_audio(workers=None, use_cache=True):
+    """
+    Verify every audio file in both audio directories.
+
+    Content hashes come from the media manifest (size+mtime fast path), so
+    only files whose hash has no cached result are read and analyzed.
+
+    Args:
+        workers (int): Thread pool size (default: CPU count)
+        use_cache (bool): Reuse cached results by content hash
+
+    Returns:
+        list: One dict per file: analyze_audio() result plus 'file', 'dir', 'sha256'
+    """
+    manifest = update_manifest(workers=workers)
+    cache = load_integrity_cache() if use_cache else {'results': {}}
+
+    results = []
+    to_analyze = []
+    live_hashes = set()
+
+    for audio_dir in get_audio_dirs():
+        entries = manifest['dirs'].get(str(audio_dir['path']), {})
+        for filename, entry in sorted(entries.items()):
+            record = {'file': filename, 'dir': audio_dir['description'], 'sha256': entry['sha256']}
+            live_hashes.add(entry['sha256'])
+            if entry['sha256'] in cache['results']:
+                # Fast path: same content analyzed before, no need to read it
+                record.update(cache['results'][entry['sha256']])
+                results.append(record)
+            else:
+                to_analyze.append((record, audio_dir['path'] / filename, audio_dir['extension']))
+
+    if to_analyze:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [
+                pool.submit(_analyze_file, path, extension)
+                for _, path, extension in to_analyze
+            ]
+            for (record, _, _), future in zip(to_analyze, futures):
+                result = future.result()
+                record.update(result)
+                results.append(record)
+                cache['results'][record['sha256']] = result
+
+    if use_cache:
+        # Keep only results for content that still exists in the library
+        save_integrity_cache({
+            'results': {h: r for h, r in cache['results'].items() if h in live_hashes},
+        })
+
+    results.sort(key=lambda r: (r['dir'], r['file']))
+    return results
+
+def print_integrity_report(results, analyzed_levels=HAS_NUMPY):
+    """Print problems grouped by issue type; returns number of problem files"""
+    problems = [r for r in results if r['issues']]
+
+    print(f"\n🔎 Audio Integrity Report for {len(results)} files")
+    print("=" * 60)
+
+    if not analyzed_levels:
+        print("⚠️  WARNING: numpy library not installed")
+        print("   Install with: pip install numpy")
+        print("   Silence and clipping checks were skipped")
+
+    for issue in ('corrupt', 'empty', 'truncated', 'silent', 'clipped'):
+        affected = [r for r in problems if issue in r['issues']]
+        if not affected:
+            continue
+        print(f"\n❌ {issue.capitalize()} ({len(affected)})")
+        for r in affected:
+            details = []
+            if r.get('duration') is not None:
+                details.append(f"{r['duration']:.2f}s")
+            if r.get('rms_dbfs') is not None:
+                details.append(f"{r['rms_dbfs']} dBFS")
+            if r.get('error'):
+                details.append(r['error'])
+            suffix = f" ({', '.join(details)})" if details else ""
+            print(f"   • {r['file']:30} [{r['dir']}]{suffix}")
+
+    if not problems:
+        print("\n✅ All audio files passed integrity checks!")
+
+    print("=" * 60)
+    return len(problems)
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify integrity and levels of all audio files")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker threads (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore cached results and re-analyze every file')
+    args = parser.parse_args()
+
+    results = scan_audio(workers=args.workers, use_cache=not args.no_cache)
+    problems = print_integrity_report(results)
+    return 1 if problems else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Pending-card queue for parallel card-generation workers.
+
+Instead of each worker overwriting pending_cards.json, producers enqueue
+cards into an SQLite queue (paths.CARD_QUEUE_DB) and one consumer drains it
+into the deck in batches through insert_cards:
+
+    cards(seq, producer, enqueued_at, payload, batch_id)
+
+- Producers: any number, concurrently. An enqueue is one short write
+  transaction (WAL mode), validated up front. When more than MAX_PENDING
+  cards are waiting, enqueue blocks until the consumer catches up
+  (backpressure) and raises TimeoutError if it does not.
+- Consumer: one at a time (file lock on the queue). A batch is claimed,
+  inserted, then deleted from the queue. A batch left claimed by a
+  crashed consumer is delivered again first; inserts are idempotent
+  (content-derived IDs + duplicate suppression), so each card ends up in
+  the deck exactly once.
+
+Usage:
+    python3 card_queue.py enqueue pending_cards.json --producer worker-1
+    python3 card_queue.py enqueue cards.jsonl
+    python3 card_queue.py drain [--batch-size 500]
+    python3 card_queue.py status
+
+    from flashcards.scripts.card_queue import enqueue_cards
+    enqueue_cards(cards, producer='worker-1')
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import paths
+from flashcards.scripts.file_utils import file_lock
+from flashcards.scripts.insert_cards import (
+    JSONL_BATCH_SIZE, insert_cards_into_deck, iter_jsonl_cards, validate_card, validate_json_structure
+)
+
+# Bump when the schema changes (queued cards are kept: migrate, don't drop)
+QUEUE_VERSION = 1
+
+# Waiting cards above which enqueue blocks (backpressure)
+MAX_PENDING = 10000
+
+# Seconds an enqueue waits for the queue to drain below MAX_PENDING
+ENQUEUE_TIMEOUT = 300
+
+# Seconds SQLite waits for another writer
+BUSY_TIMEOUT = 30
+
+# Duplicate modes that are safe to repeat when a batch is delivered again
+DRAIN_DUPLICATE_MODES = ('skip', 'merge')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cards (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    producer TEXT,
+    enqueued_at TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    batch_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS cards_batch ON cards(batch_id, seq);
+"""
+
+def connect(db_file=None):
+    """
+    Open (and if needed create) the queue database.
+
+    Args:
+        db_file (Path): Database file (default: paths.CARD_QUEUE_DB)
+
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode (transactions are explicit)
+    """
+    db_file = Path(db_file or paths.CARD_QUEUE_DB)
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = FULL")
+    conn.executescript(SCHEMA)
+    conn.execute(f"PRAGMA user_version = {QUEUE_VERSION}")
+    return conn
+
+def pending_count(conn):
+    """Number of cards waiting (claimed or not)"""
+    return conn.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+
+def enqueue_cards(cards, producer=None, db_file=None, timeout=ENQUEUE_TIMEOUT, max_pending=MAX_PENDING):
+    """
+    Add cards to the queue.
+
+    All cards are validated first; nothing is enqueued if any is invalid.
+    The cards are added in one transaction, so a batch is never half-queued.
+
+    Args:
+        cards (list): Card dicts (same fields as pending_cards.json)
+        producer (str): Name of the producing worker (for status output)
+        db_file (Path): Queue database (default: paths.CARD_QUEUE_DB)
+        timeout (float): Seconds to wait while the queue is full
+        max_pending (int): Backpressure threshold
+
+    Returns:
+        int: Number of cards enqueued
+
+    Raises:
+        ValueError: If a card is invalid
+        TimeoutError: If the queue stayed full for timeout seconds
+    """
+    errors = [f"card {i}: {message}" for i, card in enumerate(cards) for message in validate_card(card)]
+    if errors:
+        raise ValueError("Invalid cards:\n" + "\n".join(errors))
+
+    now = datetime.now().isoformat(timespec='seconds')
+    rows = [(producer, now, json.dumps(card, ensure_ascii=False)) for card in cards]
+
+    conn = connect(db_file)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            waiting = pending_count(conn)
+            if waiting + len(rows) <= max_pending or waiting == 0:
+                conn.executemany("INSERT INTO cards (producer, enqueued_at, payload) VALUES (?, ?, ?)", rows)
+                conn.execute("COMMIT")
+                return len(rows)
+            conn.execute("ROLLBACK")
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Card queue still full ({max_pending} cards) after {timeout}s")
+            time.sleep(0.5)
+    finally:
+        conn.close()
+
+def claim_batch(conn, batch_size):
+    """
+    Claim the next batch: a batch left claimed by a crashed consumer first,
+    otherwise up to batch_size unclaimed cards in queue order.
+
+    Returns:
+        tuple: (batch id, [cards]); (None, []) if the queue is empty
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    row = conn.execute("SELECT MIN(batch_id) FROM cards WHERE batch_id IS NOT NULL").fetchone()
+    batch_id = row[0]
+    if batch_id is None:
+        # The batch is named after its first card's seq (never reused)
+        batch_id = conn.execute("SELECT MIN(seq) FROM cards WHERE batch_id IS NULL").fetchone()[0]
+        conn.execute(
+            "UPDATE cards SET batch_id = ? WHERE seq IN "
+            "(SELECT seq FROM cards WHERE batch_id IS NULL ORDER BY seq LIMIT ?)",
+            (batch_id, batch_size),
+        )
+    payloads = conn.execute("SELECT payload FROM cards WHERE batch_id = ? ORDER BY seq", (batch_id,)).fetchall()
+    conn.execute("COMMIT")
+    if not payloads:
+        return None, []
+    return batch_id, [json.loads(payload) for (payload,) in payloads]
+
+def ack_batch(conn, batch_id):
+    """Remove a batch that is in the deck"""
+    conn.execute("DELETE FROM cards WHERE batch_id = ?", (batch_id,))
+
+def drain_queue(batch_size=JSONL_BATCH_SIZE, on_duplicate='skip', db_file=None, max_batches=None):
+    """
+    Insert queued cards into the deck, one batch per deck write.
+
+    Only one consumer runs at a time (producers are not blocked).
+
+    Args:
+        batch_size (int): Cards per batch
+        on_duplicate (str): 'skip' or 'merge' (see insert_cards.py)
+        db_file (Path): Queue database (default: paths.CARD_QUEUE_DB)
+        max_batches (int): Stop after this many batches (None: until empty)
+
+    Returns:
+        tuple: (batches processed, rows inserted)
+    """
+    if on_duplicate not in DRAIN_DUPLICATE_MODES:
+        raise ValueError(f"on_duplicate must be one of {DRAIN_DUPLICATE_MODES} when draining")
+
+    db_file = Path(db_file or paths.CARD_QUEUE_DB)
+    batches = 0
+    inserted = 0
+    with file_lock(db_file):
+        conn = connect(db_file)
+        try:
+            while max_batches is None or batches < max_batches:
+                batch_id, cards = claim_batch(conn, batch_size)
+                if not cards:
+                    break
+                print(f"\nBatch {batches + 1}: {len(cards)} cards")
+                inserted += insert_cards_into_deck(cards, on_duplicate)
+                ack_batch(conn, batch_id)
+                batches += 1
+        finally:
+            conn.close()
+    return batches, inserted
+
+def queue_status(db_file=None):
+    """
+    Waiting cards per producer.
+
+    Returns:
+        dict: {producer: count}
+    """
+    conn = connect(db_file)
+    try:
+        rows = conn.execute("SELECT COALESCE(producer, '—'), COUNT(*) FROM cards GROUP BY 1 ORDER BY 1").fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+def read_cards_file(path):
+    """
+    Cards from a pending_cards.json-style file or a JSONL file.
+
+    A .json file is a {"cards": [...]} object (or a bare list of cards),
+    checked with insert_cards.validate_json_structure().
+
+    Raises:
+        ValueError: If any JSONL line is malformed or invalid (all of them
+                    are listed with their line numbers; nothing is returned),
+                    or if a .json file does not have that structure
+    """
+    path = Path(path)
+    if path.suffix == '.jsonl':
+        cards = []
+        errors = []
+        for line_number, card, card_errors in iter_jsonl_cards(path):
+            if card_errors:
+                errors.extend(f"line {line_number}: {message}" for message in card_errors)
+            else:
+                cards.append(card)
+        if errors:
+            raise ValueError(f"Invalid records in {path.name}:\n" + "\n".join(errors))
+        return cards
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {'cards': data}
+    is_valid, message = validate_json_structure(data)
+    if not is_valid:
+        raise ValueError(f"Invalid {path.name}: {message}")
+    return data['cards']
+
+def main():
+    parser = argparse.ArgumentParser(description="Queue cards from parallel workers and insert them in batches")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    enqueue_parser = subparsers.add_parser('enqueue', help='Add cards from a JSON or JSONL file')
+    enqueue_parser.add_argument('file', help='pending_cards.json-style file or JSONL file')
+    enqueue_parser.add_argument('--producer', default=None, help='Worker name')
+
+    drain_parser = subparsers.add_parser('drain', help='Insert queued cards into the deck')
+    drain_parser.add_argument('--batch-size', type=int, default=JSONL_BATCH_SIZE,
+                              help=f'Cards per deck write (default: {JSONL_BATCH_SIZE})')
+    drain_parser.add_argument('--on-duplicate', choices=DRAIN_DUPLICATE_MODES, default='skip',
+                              help='What to do with duplicate cards (default: skip)')
+
+    subparsers.add_parser('status', help='Show waiting cards per producer')
+    args = parser.parse_args()
+
+    if args.command == 'enqueue':
+        try:
+            count = enqueue_cards(read_cards_file(args.file), producer=args.producer)
+        except (OSError, ValueError, TimeoutError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+        print(f"✅ Enqueued {count} cards")
+
+    elif args.command == 'drain':
+        print("=" * 60)
+        print("DRAIN CARD QUEUE")
+        print("=" * 60)
+        batches, inserted = drain_queue(args.batch_size, args.on_duplicate)
+        print()
+        print("=" * 60)
+        print(f"Batches: {batches}")
+        print(f"Inserted: {inserted} cards")
+        print("=" * 60)
+
+    else:
+        status = queue_status()
+        print(f"{sum(status.values())} cards waiting")
+        for producer, count in status.items():
+            print(f"  {producer}: {count}")
+
+if __name__ == '__main__':
+    main()
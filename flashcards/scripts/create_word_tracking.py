@@ -2,8 +2,18 @@
 """
 Create word_tracking.md from cleaned_german_words.md
 Checks audio availability and deck status
+
+Single pass: audio is resolved for the whole word list in one batch
+(optionally with a thread pool for a cold audio index), then every row is
+streamed into the tracking store (tracking_store.py) and word_tracking.md
+is rendered from it without holding the table in memory.
+
+Usage:
+    python3 create_word_tracking.py
+    python3 create_word_tracking.py --workers 8
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -13,7 +23,10 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import paths
-from audio_checker import check_audio as get_audio_filename
+from flashcards.scripts.audio_checker import lookup_audio_batch
+from flashcards.scripts.deck_index import deck_membership, load_deck_index, word_keys
+from flashcards.scripts.file_utils import file_lock
+from flashcards.scripts.tracking_store import connect, count_statuses, replace_rows, write_markdown
 
 # Paths
 CLEANED_WORDS = paths.CLEANED_WORDS_FILE
@@ -22,6 +35,18 @@ DECK_FILE = paths.DECK_FILE
 
 # Note: Audio checking now handled by audio_checker.py
 
+# Text above the table in word_tracking.md
+PREAMBLE = (
+    "# Word Tracking\n\n"
+    "**Purpose:** Track all words from cleaned list and their processing status\n\n"
+    "**Status values:**\n"
+    "- `in_deck` - Already added to german_vocabulary_b1.md\n"
+    "- `pending` - Not processed yet, has audio\n"
+    "- `missing_audio` - No audio file found\n"
+    "- `error` - Generation/validation failed\n\n"
+    "---\n\n"
+)
+
 def read_cleaned_words():
     """Read all words from cleaned list"""
     words = []
@@ -39,36 +64,24 @@ def read_cleaned_words():
     return words
 
 def read_words_in_deck():
-    """Get set of words already in deck (lowercase for comparison)"""
-    in_deck = set()
-    try:
-        with open(DECK_FILE, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Extract German words from table (column 5)
-            for line in content.split('\n'):
-                if line.startswith('|') and 'Reverse' in line or 'Cloze' in line:
-                    parts = [p.strip() for p in line.split('|')]
-                    if len(parts) >= 6:
-                        german = parts[5]  # German column
-                        # Extract base word (remove articles, cloze markers)
-                        german = german.replace('der ', '').replace('die ', '').replace('das ', '')
-                        german = german.replace('{{c1::', '').replace('}}', '')
-                        german = german.split()[0] if german else ''  # First word
-                        if german:
-                            in_deck.add(german.lower())
-    except FileNotFoundError:
-        pass
-    return in_deck
-
-def check_audio(word):
-    """Check if audio exists for word using audio_checker.py"""
-    audio_file = get_audio_filename(word)
+    """Get set of deck lemma/surface keys (shared deck index, see deck_index.py)"""
+    words_set, _ = deck_membership(load_deck_index(DECK_FILE))
+    return words_set
+
+def format_audio(audio_file):
+    """Format the Audio column for a resolved audio filename (or None)"""
     if audio_file:
         return f"✅ {audio_file}"
     return "❌ missing"
 
-def create_tracking_file():
-    """Create word_tracking.md"""
+def create_tracking_file(workers=None):
+    """
+    Create word_tracking.md.
+
+    Args:
+        workers (int): Thread pool size for scanning the audio directories
+                       when the audio index cache is cold
+    """
     print("Reading cleaned words list...")
     words = read_cleaned_words()
     print(f"Found {len(words)} words")
@@ -77,63 +90,41 @@ def create_tracking_file():
     in_deck = read_words_in_deck()
     print(f"Found {len(in_deck)} words already in deck")
 
+    print("\nChecking audio availability...")
+    audio_found = lookup_audio_batch(words, workers=workers)['found']
+    print(f"Found audio for {len(audio_found)} words")
+
     print("\nGenerating word_tracking.md...")
 
-    # Count statuses
-    stats = {
-        'in_deck': 0,
-        'pending': 0,
-        'missing_audio': 0
-    }
-
-    with open(WORD_TRACKING, 'w', encoding='utf-8') as f:
-        # Header
-        f.write("# Word Tracking\n\n")
-        f.write("**Purpose:** Track all words from cleaned list and their processing status\n\n")
-        f.write("**Status values:**\n")
-        f.write("- `in_deck` - Already added to german_vocabulary_b1.md\n")
-        f.write("- `pending` - Not processed yet, has audio\n")
-        f.write("- `missing_audio` - No audio file found\n")
-        f.write("- `error` - Generation/validation failed\n\n")
-        f.write("---\n\n")
-
-        # Table header
-        f.write("| Word | Status | Audio | IPA | Word Type | Date Added | Notes |\n")
-        f.write("|------|--------|-------|-----|-----------|------------|-------|\n")
-
-        # Process each word
+    def build_rows():
         for word in words:
-            word_lower = word.lower()
-
             # Determine status
-            if word_lower in in_deck:
+            if not in_deck.isdisjoint(word_keys(word)):
                 status = 'in_deck'
                 date_added = '2025-11-08'
-                stats['in_deck'] += 1
             else:
                 # Check audio
-                audio_check = check_audio(word)
-                if '✅' in audio_check:
-                    status = 'pending'
-                    stats['pending'] += 1
-                else:
-                    status = 'missing_audio'
-                    stats['missing_audio'] += 1
+                status = 'pending' if word in audio_found else 'missing_audio'
                 date_added = '—'
 
-            audio = check_audio(word)
-
-            # Write row (IPA column initially empty)
-            f.write(f"| {word} | {status} | {audio} | — | — | {date_added} | — |\n")
-
-        # Footer with stats
-        f.write("\n---\n\n")
-        f.write("## Statistics\n\n")
-        f.write(f"- **Total words:** {len(words)}\n")
-        f.write(f"- **In deck:** {stats['in_deck']}\n")
-        f.write(f"- **Pending (with audio):** {stats['pending']}\n")
-        f.write(f"- **Missing audio:** {stats['missing_audio']}\n")
-        f.write(f"- **Ready to process:** {stats['pending']}\n")
+            # IPA, word type and notes initially empty
+            yield {
+                'word': word,
+                'status': status,
+                'audio': format_audio(audio_found.get(word)),
+                'ipa': '—',
+                'word_type': '—',
+                'date_added': date_added,
+                'notes': '—',
+            }
+
+    # Fill the tracking store, then render word_tracking.md from it
+    with file_lock(WORD_TRACKING):
+        conn = connect()
+        replace_rows(conn, build_rows(), preamble=PREAMBLE)
+        write_markdown(conn, WORD_TRACKING)
+        stats = count_statuses(conn)
+        conn.close()
 
     print("\n" + "="*60)
     print("WORD TRACKING FILE CREATED")
@@ -145,5 +136,13 @@ def create_tracking_file():
     print(f"Missing audio: {stats['missing_audio']}")
     print("="*60)
 
+def main():
+    parser = argparse.ArgumentParser(description="Create word_tracking.md from the cleaned word list")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Threads for a cold audio index scan (default: CPU count)')
+    args = parser.parse_args()
+
+    create_tracking_file(workers=args.workers)
+
 if __name__ == '__main__':
-    create_tracking_file()
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Inverted index over the deck's German column.
+
+Maps normalized lemma and surface forms to the cards that contain them:
+
+    "der Hund"          → lemma "Hund",   forms "der Hund", "Hund"
+    "{{c1::das}} Auto"  → lemma "Auto",   forms "das Auto", "Auto"
+    "an|fangen"         → lemma "anfangen"
+    "sich freuen"       → lemma "freuen", forms "sich freuen", "freuen"
+
+Keys are word_normalization.normalize_word() values, so any casing or
+Unicode form hits the same entry while "Buße" and "Busse" stay different
+words. ASCII spellings of umlauts ("Buero", "Maenner") fall back to the
+transliterated forms of deck words with ä/ö/ü when nothing matches exactly;
+"ß" alone does not count ("ss" is a spelling of its own). The index is built once per deck version and
+cached in paths.DECK_INDEX_CACHE (keyed by the deck's SHA-256); both
+tracking scripts and the validator query it instead of each parsing the
+German column their own way.
+
+Usage:
+    from flashcards.scripts.deck_index import load_deck_index, lookup_cards
+
+    index = load_deck_index()
+    lookup_cards(index, "Hund")   # [{'id': ..., 'card_type': ..., 'word_type': ...}, ...]
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import paths
+from flashcards.scripts.file_utils import atomic_write
+from flashcards.scripts.word_normalization import normalize_word, transliterate_word
+
+# Bump when form extraction or cache layout changes; older caches are rebuilt
+DECK_INDEX_VERSION = 2
+
+# Leading words that are not part of the lemma
+ARTICLES = {'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einen', 'einem', 'einer', 'eines'}
+REFLEXIVE = {'sich'}
+
+CLOZE_PATTERN = re.compile(r'\{\{c\d+::(.*?)(?:::[^}]*)?\}\}')
+HTML_PATTERN = re.compile(r'<[^>]+>')
+SEPARABLE_MARK_PATTERN = re.compile(r'[|·]')
+PARENTHESES_PATTERN = re.compile(r'[()]')
+UMLAUT_PATTERN = re.compile(r'[äöü]')
+
+# In-memory index for this process: (deck path, size, mtime_ns) → index
+_memo = {}
+
+def card_forms(german):
+    """
+    Extract lemma and surface forms from a German column value.
+
+    Args:
+        german (str): German column, e.g. "{{c1::der}} Schritt"
+
+    Returns:
+        tuple: (lemma, [surface forms]) as plain text (not yet normalized);
+               lemma is '' for an empty column
+    """
+    text = CLOZE_PATTERN.sub(r'\1', german)
+    text = HTML_PATTERN.sub(' ', text)
+    text = SEPARABLE_MARK_PATTERN.sub('', text)
+    text = PARENTHESES_PATTERN.sub('', text)
+    tokens = text.split()
+    if not tokens:
+        return '', []
+
+    # Strip a leading article or reflexive pronoun ("der Hund", "sich freuen"),
+    # but keep single-word entries as they are ("der" the article, "sich")
+    lemma_tokens = tokens
+    if len(tokens) > 1 and tokens[0].lower() in ARTICLES | REFLEXIVE:
+        lemma_tokens = tokens[1:]
+
+    lemma = ' '.join(lemma_tokens)
+    forms = list(dict.fromkeys([' '.join(tokens), lemma]))
+    return lemma, forms
+
+def word_keys(word):
+    """
+    Index keys to query for a word as written in tracking files.
+
+    "der Hund" is looked up both as the phrase and as the lemma "Hund".
+    """
+    _, forms = card_forms(word)
+    return {normalize_word(form) for form in forms}
+
+def lemma_key(german):
+    """Normalized lemma of a German column value ('' if empty)"""
+    lemma, _ = card_forms(german)
+    return normalize_word(lemma)
+
+def parse_deck_rows(lines):
+    """
+    Yield card rows from the deck markdown.
+
+    Returns:
+        iterator: {'id', 'card_type', 'word_type', 'german', 'line'} per card
+                  row ('line' is the index into lines)
+    """
+    for i, line in enumerate(lines):
+        if not line.startswith('|') or line.startswith('| ID |') or line.startswith('|-'):
+            continue
+        parts = [p.strip() for p in line.strip().split('|')[1:-1]]
+        if len(parts) != 10:
+            continue
+        yield {'id': parts[0], 'card_type': parts[1], 'word_type': parts[2], 'german': parts[4], 'line': i}
+
+def build_deck_index(lines):
+    """
+    Build the index from deck markdown lines.
+
+    Returns:
+        dict: {'cards': {card id: {'card_type', 'word_type', 'german', 'lemma'}},
+               'keys': {form key: [card id, ...]},
+               'translit': {transliterated form key: [card id, ...]} for
+                           forms with ä/ö/ü that no exact key spells,
+               'lemmas': {card id: lemma key}}
+    """
+    cards = {}
+    keys = defaultdict(list)
+    translit = defaultdict(list)
+    lemmas = {}
+    for row in parse_deck_rows(lines):
+        lemma, forms = card_forms(row['german'])
+        if not lemma:
+            continue
+        cards[row['id']] = {
+            'card_type': row['card_type'],
+            'word_type': row['word_type'],
+            'german': row['german'],
+            'lemma': lemma,
+        }
+        lemmas[row['id']] = normalize_word(lemma)
+        for key in dict.fromkeys(normalize_word(form) for form in forms):
+            keys[key].append(row['id'])
+            if UMLAUT_PATTERN.search(key):
+                translit[transliterate_word(key)].append(row['id'])
+    translit = {key: ids for key, ids in translit.items() if key not in keys}
+    return {'cards': cards, 'keys': dict(keys), 'translit': translit, 'lemmas': lemmas}
+
+def _load_cache(sha256):
+    try:
+        with open(paths.DECK_INDEX_CACHE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get('version') != DECK_INDEX_VERSION:
+        return None
+    if data.get('sha256') != sha256:
+        return None
+    return data['index']
+
+def _save_cache(sha256, index):
+    try:
+        with atomic_write(paths.DECK_INDEX_CACHE) as f:
+            json.dump({'version': DECK_INDEX_VERSION, 'sha256': sha256, 'index': index}, f, ensure_ascii=False)
+    except OSError:
+        pass  # Cache is an optimization only
+
+def load_deck_index(deck_file=None):
+    """
+    Get the index for the current deck version.
+
+    Reuses the in-process index while the deck's size and mtime are
+    unchanged, then the on-disk cache while its content hash is unchanged;
+    rebuilds only for a new deck version.
+
+    Args:
+        deck_file (Path): Deck markdown (default: paths.DECK_FILE)
+
+    Returns:
+        dict: Index (see build_deck_index); empty if the deck does not exist
+    """
+    deck_file = Path(deck_file or paths.DECK_FILE)
+    try:
+        st = os.stat(deck_file)
+    except OSError:
+        return {'cards': {}, 'keys': {}, 'translit': {}, 'lemmas': {}}
+
+    memo_key = (str(deck_file), st.st_size, st.st_mtime_ns)
+    if memo_key in _memo:
+        return _memo[memo_key]
+
+    data = deck_file.read_bytes()
+    sha256 = hashlib.sha256(data).hexdigest()
+    index = _load_cache(sha256)
+    if index is None:
+        index = build_deck_index(data.decode('utf-8').splitlines())
+        _save_cache(sha256, index)
+
+    _memo.clear()
+    _memo[memo_key] = index
+    return index
+
+def lookup_cards(index, word):
+    """
+    Cards whose lemma or surface form matches a word.
+
+    Each key is matched exactly first; a key with no exact match is tried
+    against the transliterated forms ("Buero" → "Büro").
+
+    Args:
+        index (dict): From load_deck_index()
+        word (str): Word or phrase ("Hund", "der Hund", "Buero")
+
+    Returns:
+        list: [{'id', 'card_type', 'word_type', 'german', 'lemma'}, ...]
+    """
+    ids = {}
+    for key in sorted(word_keys(word)):
+        ids.update(dict.fromkeys(index['keys'].get(key) or index['translit'].get(key, ())))
+    return [dict(index['cards'][card_id], id=card_id) for card_id in ids]
+
+def deck_membership(index):
+    """
+    Deck words for set-based matching.
+
+    Returns:
+        tuple: (words_set, words_with_types) - all form keys plus the
+               transliterated fallback keys, and key → set of word types
+    """
+    words_with_types = {}
+    for key, ids in list(index['keys'].items()) + list(index['translit'].items()):
+        words_with_types[key] = {index['cards'][card_id]['word_type'] for card_id in ids}
+    return set(words_with_types), words_with_types
+
+def duplicate_lemmas(index):
+    """
+    Cards sharing lemma, word type and card type.
+
+    Returns:
+        dict: {(lemma key, word type, card type): [card id, ...]} for groups of 2+
+    """
+    groups = defaultdict(list)
+    for card_id, card in index['cards'].items():
+        groups[(index['lemmas'][card_id], card['word_type'], card['card_type'])].append(card_id)
+    return {group: ids for group, ids in groups.items() if len(ids) > 1}
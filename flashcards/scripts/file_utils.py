@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Safe file writing for the flashcard scripts.
+
+Two building blocks used by every script that writes the deck, the tracking
+file, reports or caches:
+
+- file_lock(path): exclusive advisory lock on "<path>.lock" (fcntl), so
+  several card-generation workers can run pipeline steps in parallel without
+  interleaving read-modify-write cycles. Re-entrant within one process.
+- atomic_write(path): write to a temp file in the same directory, fsync,
+  then rename over the target. Readers see either the old or the new file,
+  never a half-written one, and a crash mid-write loses nothing.
+
+Usage:
+    from flashcards.scripts.file_utils import atomic_write, file_lock
+
+    with file_lock(paths.DECK_FILE):
+        content = paths.DECK_FILE.read_text(encoding='utf-8')
+        with atomic_write(paths.DECK_FILE) as f:
+            f.write(content + new_rows)
+"""
+
+import os
+import stat
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False  # Windows: in-process locking only
+
+# Seconds to wait for another process to release a lock
+LOCK_TIMEOUT = 60
+
+# Permissions for newly created files (mkstemp would create them 0600)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_FILE_MODE = 0o666 & ~_UMASK
+
+# Per-path in-process state: {lock path: [RLock, hold count, lock file handle]}
+_locks = {}
+_locks_guard = threading.Lock()
+
+def _lock_path(path):
+    path = Path(path).resolve()
+    return path.with_name(path.name + '.lock')
+
+@contextmanager
+def file_lock(path, timeout=LOCK_TIMEOUT):
+    """
+    Hold an exclusive lock for a file while reading and writing it.
+
+    Args:
+        path (Path): File to protect (the lock lives in "<path>.lock")
+        timeout (float): Seconds to wait before giving up
+
+    Raises:
+        TimeoutError: If the lock is still held elsewhere after timeout
+    """
+    lock_path = _lock_path(path)
+    with _locks_guard:
+        state = _locks.setdefault(lock_path, [threading.RLock(), 0, None])
+
+    if not state[0].acquire(timeout=timeout):
+        raise TimeoutError(f"Timed out waiting for lock on {path}")
+    try:
+        if state[1] == 0:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            handle = open(lock_path, 'a')
+            if HAS_FCNTL:
+                deadline = time.monotonic() + timeout
+                while True:
+                    try:
+                        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() >= deadline:
+                            handle.close()
+                            raise TimeoutError(f"Timed out waiting for lock on {path}")
+                        time.sleep(0.05)
+            state[2] = handle
+        state[1] += 1
+        try:
+            yield
+        finally:
+            state[1] -= 1
+            if state[1] == 0:
+                handle, state[2] = state[2], None
+                if HAS_FCNTL:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+    finally:
+        state[0].release()
+
+@contextmanager
+def atomic_write(path, mode='w', encoding='utf-8'):
+    """
+    Write a file via temp file + rename.
+
+    The temp file is created next to the target (same filesystem), keeps the
+    target's permissions, and is removed again if the block raises.
+
+    Args:
+        path (Path): Target file
+        mode (str): 'w' (text) or 'wb' (binary)
+        encoding (str): Text encoding (ignored for binary mode)
+
+    Yields:
+        file: Open temp file to write to
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix='.tmp', dir=path.parent)
+    try:
+        with os.fdopen(fd, mode, encoding=None if 'b' in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_name, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            os.chmod(tmp_name, NEW_FILE_MODE)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+def write_text_atomic(path, content, encoding='utf-8'):
+    """Replace a text file's content atomically"""
+    with atomic_write(path, 'w', encoding) as f:
+        f.write(content)
@@ -21,6 +21,9 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import paths
+from flashcards.scripts.file_utils import atomic_write
+from flashcards.scripts.audio_checker import find_audio_paths
+from flashcards.scripts.media_manifest import format_mb, load_manifest, media_usage
 
 # Configuration
 LANGUAGE_PREFIX = "de"  # Language prefix for audio files
@@ -44,7 +47,7 @@ class Logger:
         self.log_buffer.append(message)
 
     def write_log(self):
-        with open(self.log_file, 'w', encoding='utf-8') as f:
+        with atomic_write(self.log_file) as f:
             f.write('\n'.join(self.log_buffer))
 
 logger = Logger(LOG_FILE)
@@ -593,31 +596,30 @@ def main():
     # Create temp directory for prefixed audio files
     temp_dir = Path(tempfile.mkdtemp())
 
-    # Build full paths to audio files (check both audio directories)
-    audio_dirs = [paths.AUDIO_DUOLINGO, paths.AUDIO_GENERATED]
-
+    # Resolve audio files through the audio index (no per-file stat/hash calls)
+    audio_paths = find_audio_paths(unique_audio)
     for audio_file in unique_audio:
-        found = False
-        for audio_dir in audio_dirs:
-            audio_path = audio_dir / audio_file
-            if audio_path.exists():
-                # Create prefixed filename
-                prefixed_name = f"{LANGUAGE_PREFIX}_{audio_file}"
-                prefixed_path = temp_dir / prefixed_name
-
-                # Copy to temp with new name
-                shutil.copy2(audio_path, prefixed_path)
-                media_files.append(str(prefixed_path))
-                audio_mapping[audio_file] = prefixed_name
-
-                logger.log(f"  ✅ {audio_file} → {prefixed_name}")
-                found = True
-                break
-
-        if not found:
+        audio_path = audio_paths.get(audio_file)
+        if audio_path:
+            # Create prefixed filename
+            prefixed_name = f"{LANGUAGE_PREFIX}_{audio_file}"
+            prefixed_path = temp_dir / prefixed_name
+
+            # Copy to temp with new name
+            shutil.copy2(audio_path, prefixed_path)
+            media_files.append(str(prefixed_path))
+            audio_mapping[audio_file] = prefixed_name
+
+            logger.log(f"  ✅ {audio_file} → {prefixed_name}")
+        else:
             logger.log(f"  ⚠️  {audio_file} (not found)")
 
-    logger.log(f"Found {len(media_files)} audio files")
+    # Sizes from the stored media manifest only (media_manifest.py refreshes it)
+    usage = media_usage(load_manifest(), audio_mapping)
+    size_note = format_mb(usage['bytes'])
+    if usage['missing']:
+        size_note += f", {len(usage['missing'])} not in media manifest"
+    logger.log(f"Found {len(media_files)} audio files ({size_note})")
     logger.log("")
 
     # Update all notes to reference prefixed audio files
@@ -643,7 +645,9 @@ def main():
     # Generate package
     logger.log(f"Generating package: {OUTPUT_FILE}")
     try:
-        genanki.Package(deck, media_files=media_files).write_to_file(OUTPUT_FILE)
+        # Build into a temp file and rename, so a failed run keeps the old package
+        with atomic_write(OUTPUT_FILE, 'wb') as f:
+            genanki.Package(deck, media_files=media_files).write_to_file(f)
         logger.log("✅ Package generated successfully!")
     except Exception as e:
         logger.log(f"❌ ERROR: Failed to generate package: {e}")
@@ -5,12 +5,49 @@ STABLE SCRIPT - Should not need modifications
 
 Reads: pending_cards.json
 Updates: german_vocabulary_b1.md
+
+The deck is locked for the whole insert + metadata update and every write
+goes through a temp file + rename (file_utils.py), so concurrent runs
+cannot interleave and a crash never leaves a half-written deck.
+
+Each insert is a transaction: a journal (german_vocabulary_b1.md.journal)
+recording the rows to append, merged rows and the new header is written
+before the deck and removed after it. The next run finds any journal left
+by a crash and rolls it forward (deck untouched) or back (deck changed in
+between) before doing anything else.
+
+Card IDs are derived from the card content (German + card type), not from
+the clock. Every new ID is checked against the IDs already in the deck and
+in deleted_card_ids.md: an ID taken by a different card is re-hashed with a
+salt, and a card whose ID is already in the deck with the same content is
+skipped, so re-running an insert is idempotent.
+
+Duplicates are caught before IDs are assigned: incoming cards are checked
+against an index of the deck's (normalized lemma, word type, card type)
+keys - the same key validate_deck.py reports duplicates by - and against
+earlier cards of the same batch. --on-duplicate chooses what happens:
+  skip   - drop duplicates, insert the rest (default)
+  report - list all duplicates and insert nothing (in JSONL mode the
+           whole file is checked before the first batch is written)
+  merge  - fill empty ('—') fields of the existing card from the duplicate
+
+JSONL mode (--jsonl) streams pending_cards.jsonl - one card object per
+line - instead of loading one JSON document. Every record is validated
+(required fields, WordType.validate_strict), all errors are collected with
+their line numbers, and valid cards are inserted in batches of
+--batch-size, so memory use does not grow with the number of records.
+
+Usage:
+    python3 insert_cards.py
+    python3 insert_cards.py --on-duplicate report
+    python3 insert_cards.py --jsonl [pending_cards.jsonl] [--batch-size 500]
 """
 
+import argparse
 import json
+import re
 import sys
 import hashlib
-import time
 from datetime import datetime
 from pathlib import Path
 
@@ -19,9 +56,20 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import paths
+from flashcards.scripts.deck_index import card_forms, parse_deck_rows
+from flashcards.scripts.file_utils import atomic_write, file_lock
+from flashcards.scripts.word_normalization import normalize_word
+from flashcards.scripts.word_types import WordType
 
 # File paths
 PENDING_CARDS = paths.FLASHCARDS_SCRIPTS / 'pending_cards.json'
+PENDING_CARDS_JSONL = paths.FLASHCARDS_SCRIPTS / 'pending_cards.jsonl'
+
+# Valid JSONL cards inserted per deck write
+JSONL_BATCH_SIZE = 500
+
+# Bump when the journal layout changes; unknown journals are discarded
+JOURNAL_VERSION = 1
 
 # Required fields for each card (id will be generated, not required in JSON)
 REQUIRED_FIELDS = [
@@ -29,6 +77,25 @@ REQUIRED_FIELDS = [
     'extra', 'example_de', 'example_ru', 'notes', 'audio'
 ]
 
+# Deck columns (after ID) in card JSON field names
+ROW_FIELDS = [
+    'card_type', 'word_type', 'russian', 'german',
+    'extra', 'example_de', 'example_ru', 'notes', 'audio'
+]
+
+# Fields --on-duplicate merge may fill in on an existing card
+MERGE_FIELDS = ['russian', 'extra', 'example_de', 'example_ru', 'notes', 'audio']
+
+DUPLICATE_MODES = ('skip', 'report', 'merge')
+
+class DuplicateCardsError(Exception):
+    """--on-duplicate report found duplicates; nothing was inserted"""
+
+    def __init__(self, duplicates):
+        self.duplicates = duplicates
+        super().__init__(f"{len(duplicates)} duplicate cards, nothing inserted "
+                         f"(use --on-duplicate skip or merge to continue)")
+
 def validate_json_structure(data):
     """Validate JSON has correct structure"""
     if not isinstance(data, dict):
@@ -54,13 +121,78 @@ def validate_json_structure(data):
 
     return True, "Valid"
 
-def generate_card_id(german_word, card_type):
-    """Generate unique 8-character hash for card ID"""
-    timestamp = str(time.time())
-    content = f"{german_word}_{card_type}_{timestamp}"
+# Give up after this many salted re-hashes (only reachable with a corrupt ID index)
+MAX_ID_PROBES = 1000
+
+CARD_ID_PATTERN = re.compile(r'^[0-9a-f]{8}$')
+
+def generate_card_id(german_word, card_type, salt=0):
+    """
+    Generate the 8-character content hash used as card ID.
+
+    The same German + card type always gives the same ID; salt > 0 gives
+    the alternatives tried when that ID is already taken.
+    """
+    content = f"{normalize_word(german_word)}_{card_type}"
+    if salt:
+        content += f"_{salt}"
     hash_obj = hashlib.sha256(content.encode('utf-8'))
     return hash_obj.hexdigest()[:8]
 
+def card_content_key(card):
+    """Identity of a card for ID checks: (normalized German, word type, card type)"""
+    return (normalize_word(card['german']), card['word_type'].strip(), card['card_type'].strip())
+
+def load_deleted_ids():
+    """Card IDs listed in deleted_card_ids.md (never reused for new cards)"""
+    try:
+        with open(paths.DELETED_CARD_IDS_FILE, 'r', encoding='utf-8') as f:
+            return {line.strip() for line in f if CARD_ID_PATTERN.match(line.strip())}
+    except FileNotFoundError:
+        return set()
+
+def load_card_ids(rows):
+    """
+    Index of IDs already in use.
+
+    Args:
+        rows (list): Deck rows from deck_index.parse_deck_rows()
+
+    Returns:
+        tuple: ({deck card id: content key}, set of deleted card ids)
+    """
+    deck_ids = {row['id']: card_content_key(row) for row in rows}
+    return deck_ids, load_deleted_ids()
+
+def assign_card_id(card, deck_ids, deleted_ids):
+    """
+    Find the ID for a card, checking it against every ID in use.
+
+    Args:
+        card (dict): Expanded card
+        deck_ids (dict): Card id → content key; the new ID is registered here,
+                         so later cards of the same batch see it
+        deleted_ids (set): IDs of deleted cards
+
+    Returns:
+        tuple: (card id, True if new / False if this card is already in the deck)
+
+    Raises:
+        RuntimeError: If no free ID is found within MAX_ID_PROBES attempts
+    """
+    key = card_content_key(card)
+    for salt in range(MAX_ID_PROBES):
+        card_id = generate_card_id(card['german'], card['card_type'], salt)
+        if card_id in deleted_ids:
+            continue
+        if card_id in deck_ids:
+            if deck_ids[card_id] == key:
+                return card_id, False
+            continue  # Taken by a different card → try the next salt
+        deck_ids[card_id] = key
+        return card_id, True
+    raise RuntimeError(f"No free card ID for {card['german']} ({card['card_type']})")
+
 def load_pending_cards():
     """Load and validate pending_cards.json"""
     print(f"Reading {PENDING_CARDS}...")
@@ -86,6 +218,128 @@ def load_pending_cards():
 
     return data['cards']
 
+def validate_card(card):
+    """
+    Validate one card record.
+
+    Returns:
+        list: Error messages (empty if the card is valid)
+    """
+    if not isinstance(card, dict):
+        return ["not an object"]
+
+    errors = []
+    for field in REQUIRED_FIELDS:
+        if field not in card:
+            errors.append(f"missing required field: {field}")
+        elif not isinstance(card[field], str):
+            errors.append(f"field '{field}' must be a string")
+
+    if isinstance(card.get('word_type'), str):
+        try:
+            WordType.validate_strict(card['word_type'])
+        except ValueError as e:
+            errors.append(' '.join(str(e).split('\n')))
+
+    return errors
+
+def iter_jsonl_cards(jsonl_file):
+    """
+    Stream card records from a JSONL file.
+
+    Yields:
+        tuple: (line number, card or None, [error messages])
+    """
+    with open(jsonl_file, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                card = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, None, [f"invalid JSON: {e.msg} (column {e.colno})"]
+                continue
+            yield line_number, card, validate_card(card)
+
+def scan_jsonl_duplicates(jsonl_file, lines):
+    """
+    Duplicates anywhere in a JSONL file, against the deck and earlier records.
+
+    Keeps only the duplicate keys seen so far, not the cards.
+
+    Returns:
+        list: [(card, existing description)]
+    """
+    deck_rows = deck_duplicate_index(parse_deck_rows(lines))
+    seen = set()
+    duplicates = []
+    for _, card, card_errors in iter_jsonl_cards(jsonl_file):
+        if card_errors:
+            continue
+        for expanded in expand_reverse_card(card):
+            key = duplicate_key(expanded)
+            if key is None:
+                continue
+            if key in deck_rows:
+                duplicates.append((expanded, f"deck card {deck_rows[key]['id']}"))
+            elif key in seen:
+                duplicates.append((expanded, "earlier card in this file"))
+            else:
+                seen.add(key)
+    return duplicates
+
+def insert_jsonl_cards(jsonl_file, on_duplicate='skip', batch_size=JSONL_BATCH_SIZE):
+    """
+    Validate and insert cards from a JSONL file in batches.
+
+    Invalid records are reported, not inserted; valid ones still are.
+    Only the current batch and the error list are held in memory.
+
+    With on_duplicate='report' the whole file is scanned for duplicates
+    first (under the deck lock, held until the last batch), so no batch is
+    committed when any record is a duplicate.
+
+    Args:
+        jsonl_file (Path): JSONL file, one card object per line
+        on_duplicate (str): Passed to insert_cards_into_deck()
+        batch_size (int): Valid cards per deck write
+
+    Returns:
+        tuple: (rows inserted, valid records, [(line number, error message)])
+
+    Raises:
+        DuplicateCardsError: With on_duplicate='report', if any record is a duplicate
+    """
+    if on_duplicate != 'report':
+        return _insert_jsonl_batches(jsonl_file, on_duplicate, batch_size)
+
+    with file_lock(paths.DECK_FILE):
+        recover_journal()
+        with open(paths.DECK_FILE, 'r', encoding='utf-8') as f:
+            lines = f.read().split('\n')
+        duplicates = scan_jsonl_duplicates(jsonl_file, lines)
+        if duplicates:
+            raise DuplicateCardsError(duplicates)
+        return _insert_jsonl_batches(jsonl_file, on_duplicate, batch_size)
+
+def _insert_jsonl_batches(jsonl_file, on_duplicate, batch_size):
+    inserted = 0
+    valid = 0
+    errors = []
+    batch = []
+    for line_number, card, card_errors in iter_jsonl_cards(jsonl_file):
+        if card_errors:
+            errors.extend((line_number, message) for message in card_errors)
+            continue
+        valid += 1
+        batch.append(card)
+        if len(batch) >= batch_size:
+            inserted += insert_cards_into_deck(batch, on_duplicate)
+            batch = []
+    if batch:
+        inserted += insert_cards_into_deck(batch, on_duplicate)
+    return inserted, valid, errors
+
 def expand_reverse_card(card):
     """
     If card_type is 'Reverse', expand into two separate cards:
@@ -107,24 +361,245 @@ def expand_reverse_card(card):
         # Cloze cards or other types - return as-is
         return [card]
 
+def duplicate_key(card):
+    """
+    Duplicate identity: (normalized lemma, word type, card type); None if German is empty.
+
+    The lemma is compared without transliteration - Buße and Busse, Maße and
+    Masse are different words, not two spellings of one card.
+    """
+    key = normalize_word(card_forms(card['german'])[0])
+    if not key:
+        return None
+    return (key, card['word_type'].strip(), card['card_type'].strip())
+
+def merge_card(target, duplicate):
+    """
+    Fill empty fields of target from a duplicate card.
+
+    Returns:
+        list: Names of the fields that were filled
+    """
+    filled = []
+    for field in MERGE_FIELDS:
+        if target.get(field, '—').strip() in ('', '—') and duplicate[field].strip() not in ('', '—'):
+            target[field] = duplicate[field]
+            filled.append(field)
+    return filled
+
+def deck_duplicate_index(rows):
+    """Deck rows by duplicate_key() (first row per key)"""
+    deck_rows = {}
+    for row in rows:
+        key = duplicate_key(row)
+        if key is not None:
+            deck_rows.setdefault(key, row)
+    return deck_rows
+
+def resolve_duplicates(cards, lines, rows, on_duplicate='skip'):
+    """
+    Drop incoming cards that duplicate a deck card or an earlier batch card.
+
+    One pass over the deck rows builds the key index; each incoming card
+    then costs one dictionary lookup.
+
+    Args:
+        cards (list): Expanded incoming cards
+        lines (list): Deck lines (merged rows are re-read from here)
+        rows (list): Deck rows from deck_index.parse_deck_rows()
+        on_duplicate (str): 'skip', 'report' or 'merge'
+
+    Returns:
+        tuple: (unique cards, [(card, existing description)],
+                {line index: merged row} for deck rows changed by merge)
+    """
+    deck_rows = deck_duplicate_index(rows)
+
+    unique = {}
+    keyless = []
+    duplicates = []
+    merged_rows = {}
+    for card in cards:
+        key = duplicate_key(card)
+        if key is None:
+            keyless.append(card)
+        elif key in deck_rows:
+            row = deck_rows[key]
+            duplicates.append((card, f"deck card {row['id']}"))
+            if on_duplicate == 'merge':
+                existing = merged_rows.get(row['line'])
+                if existing is None:
+                    parts = [p.strip() for p in lines[row['line']].strip().split('|')[1:-1]]
+                    existing = dict(zip(['id'] + ROW_FIELDS, parts))
+                if merge_card(existing, card):
+                    merged_rows[row['line']] = existing
+        elif key in unique:
+            duplicates.append((card, "earlier card in this batch"))
+            if on_duplicate == 'merge':
+                merge_card(unique[key], card)
+        else:
+            unique[key] = dict(card)
+
+    replaced_rows = {line_index: card_to_markdown_row(existing) for line_index, existing in merged_rows.items()}
+    return list(unique.values()) + keyless, duplicates, replaced_rows
+
+def print_duplicates(duplicates):
+    for card, existing in duplicates:
+        print(f"⚠️  Duplicate: {card['german']} ({card['word_type']}, {card['card_type']}) - {existing}")
+
 def card_to_markdown_row(card):
-    """Transform card JSON to markdown table row with generated ID"""
-    # Generate unique ID based on German word and card type
-    card_id = generate_card_id(card['german'], card['card_type'])
+    """Transform card JSON to markdown table row (ID from card['id'] if assigned)"""
+    card_id = card.get('id') or generate_card_id(card['german'], card['card_type'])
 
     return f"| {card_id} | {card['card_type']} | {card['word_type']} | {card['russian']} | {card['german']} | {card['extra']} | {card['example_de']} | {card['example_ru']} | {card['notes']} | {card['audio']} |"
 
-def insert_cards_into_deck(cards):
-    """Append card rows to end of german_vocabulary_b1.md"""
-    DECK_FILE = paths.DECK_FILE
-    print(f"\nReading {DECK_FILE}...")
+def is_card_row(line):
+    """True for table body rows (not the header or separator)"""
+    return line.startswith('|') and not line.startswith('| ID |') and not line.startswith('|-')
 
-    try:
-        with open(DECK_FILE, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except FileNotFoundError:
-        print(f"ERROR: {DECK_FILE} not found")
-        sys.exit(1)
+def update_metadata_lines(lines, total_cards, today):
+    """
+    Set "- Total cards:" and "- Generated:" in the deck header, in place.
+
+    Only the header above the card table is scanned.
+
+    Args:
+        lines (list): Deck lines (modified in place)
+        total_cards (int): Card count to record
+        today (str): Generation date to record
+
+    Returns:
+        int: Previous "Total cards" value (None if the line is missing)
+    """
+    old_count = None
+    for i, line in enumerate(lines):
+        if line.startswith('| ID |'):
+            break
+        if line.startswith('- Total cards:'):
+            old_count = int(line.split(':')[1].strip())
+            lines[i] = f'- Total cards: {total_cards}'
+        elif line.startswith('- Generated:'):
+            lines[i] = f'- Generated: {today}'
+    return old_count
+
+def journal_file():
+    """Path of the insert journal (next to the deck)"""
+    return paths.DECK_FILE.with_name(paths.DECK_FILE.name + '.journal')
+
+def content_sha256(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def apply_journal(content, journal):
+    """
+    Deck content after the change described by a journal.
+
+    Returns:
+        tuple: (new content, previous "Total cards" value or None)
+    """
+    lines = content.split('\n')
+    for line_index, row in journal['replace_rows'].items():
+        lines[int(line_index)] = row
+    header = journal['header']
+    old_count = update_metadata_lines(lines, header['total_cards'], header['generated'])
+    if lines[-1] == '':
+        lines.pop()  # Content ended with a newline
+    new_content = '\n'.join(lines) + ('\n' if lines else '')
+    new_content += ''.join(row + '\n' for row in journal['append_rows'])
+    return new_content, old_count
+
+def commit_journal(content, journal):
+    """
+    Apply a journaled change to the deck (caller holds the deck lock).
+
+    The journal is written (atomically) before the deck and removed after
+    it, so a crash at any point leaves either no journal and an untouched
+    or fully updated deck, or a journal recover_journal() can finish.
+    """
+    new_content, old_count = apply_journal(content, journal)
+    journal['result_sha256'] = content_sha256(new_content)
+
+    with atomic_write(journal_file()) as f:
+        json.dump(journal, f, ensure_ascii=False)
+    with atomic_write(paths.DECK_FILE) as f:
+        f.write(new_content)
+    journal_file().unlink()
+
+    header = journal['header']
+    if old_count is not None:
+        print(f"✅ Updated card count: {old_count} (old metadata) → {header['total_cards']} (actual cards in file)")
+    print(f"✅ Updated generation date: {header['generated']}")
+
+def recover_journal():
+    """
+    Finish or discard an insert interrupted by a crash.
+
+    - Deck already matches the journal's result: the insert completed, the
+      journal is just removed
+    - Deck still matches the journal's base: roll forward (apply it now)
+    - Deck changed otherwise (hand edit): roll back, i.e. keep the deck as
+      it is and discard the journal
+
+    Returns:
+        str: 'committed', 'rolled_forward', 'rolled_back', or None if there
+             was no journal
+    """
+    with file_lock(paths.DECK_FILE):
+        path = journal_file()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            journal = None
+
+        try:
+            with open(paths.DECK_FILE, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            content = None
+        deck_sha256 = None if content is None else content_sha256(content)
+
+        if not isinstance(journal, dict) or journal.get('version') != JOURNAL_VERSION:
+            outcome = 'rolled_back'
+        elif deck_sha256 == journal.get('result_sha256'):
+            outcome = 'committed'
+        elif deck_sha256 == journal.get('base_sha256'):
+            new_content, _ = apply_journal(content, journal)
+            with atomic_write(paths.DECK_FILE) as f:
+                f.write(new_content)
+            outcome = 'rolled_forward'
+        else:
+            outcome = 'rolled_back'
+        path.unlink()
+
+    if outcome == 'rolled_forward':
+        print(f"⚠️  Completed an interrupted insert from {path.name} "
+              f"({len(journal['append_rows'])} rows)")
+    elif outcome == 'rolled_back':
+        print(f"⚠️  Discarded {path.name}: the deck changed since the interrupted insert")
+    return outcome
+
+def insert_cards_into_deck(cards, on_duplicate='skip'):
+    """
+    Append card rows to end of german_vocabulary_b1.md and update its header.
+
+    The deck is read and its rows parsed once; the same rows feed the ID
+    index, the duplicate index and the header card count, and the result is
+    written once. Nothing is written if no card is new.
+
+    Args:
+        cards (list): Cards from pending_cards.json
+        on_duplicate (str): 'skip', 'report' or 'merge' (see module docstring)
+
+    Returns:
+        int: Number of rows appended
+
+    Raises:
+        DuplicateCardsError: With on_duplicate='report', if any card is a duplicate
+        FileNotFoundError: If the deck does not exist
+    """
+    DECK_FILE = paths.DECK_FILE
 
     # Expand 'Reverse' cards into RU→DE and DE→RU pairs
     print(f"Expanding {len(cards)} JSON entries...")
@@ -134,72 +609,135 @@ def insert_cards_into_deck(cards):
 
     print(f"✅ Expanded to {len(expanded_cards)} total cards (Reverse entries became 2 cards each)")
 
-    # Convert cards to markdown rows
-    print(f"Converting {len(expanded_cards)} cards to markdown...")
-    card_rows = [card_to_markdown_row(card) for card in expanded_cards]
+    with file_lock(DECK_FILE):
+        recover_journal()
 
-    # Append rows to end of file
-    print(f"Appending {len(card_rows)} rows to end of file...")
-    with open(DECK_FILE, 'a', encoding='utf-8') as f:
-        for row in card_rows:
-            f.write(row + '\n')
+        print(f"\nReading {DECK_FILE}...")
+        with open(DECK_FILE, 'r', encoding='utf-8') as f:
+            content = f.read()
+        lines = content.split('\n')
+        deck_rows = list(parse_deck_rows(lines))
+
+        # Suppress duplicates of deck cards and within the batch
+        unique_cards, duplicates, replaced_rows = resolve_duplicates(expanded_cards, lines, deck_rows, on_duplicate)
+        if duplicates and on_duplicate == 'report':
+            raise DuplicateCardsError(duplicates)
+        print_duplicates(duplicates)
+        if duplicates:
+            print(f"Skipped {len(duplicates)} duplicate cards")
+        if replaced_rows:
+            print(f"✅ Merged new field values into {len(replaced_rows)} existing cards")
+
+        # Assign content-derived IDs, checked against deck and deleted IDs
+        deck_ids, deleted_ids = load_card_ids(deck_rows)
+        new_cards = []
+        for card in unique_cards:
+            card_id, is_new = assign_card_id(card, deck_ids, deleted_ids)
+            if is_new:
+                new_cards.append(dict(card, id=card_id))
+            else:
+                print(f"⏭️  Already in deck: {card['german']} ({card['card_type']}) as {card_id}")
+        if len(new_cards) < len(unique_cards):
+            print(f"Skipped {len(unique_cards) - len(new_cards)} cards already in the deck")
+
+        if not new_cards and not replaced_rows:
+            print("No new cards, deck left unchanged")
+            return 0
+
+        # Convert cards to markdown rows
+        print(f"Converting {len(new_cards)} cards to markdown...")
+        card_rows = [card_to_markdown_row(card) for card in new_cards]
+
+        # Update header: rows already in the deck plus the appended ones
+        today = datetime.now().strftime('%Y-%m-%d')
+        journal = {
+            'version': JOURNAL_VERSION,
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'base_sha256': content_sha256(content),
+            'header': {'total_cards': len(deck_rows) + len(card_rows), 'generated': today},
+            'replace_rows': {str(i): row for i, row in replaced_rows.items()},
+            'append_rows': card_rows,
+        }
+
+        # Journal first, then the deck, then drop the journal (= commit)
+        print(f"\nAppending {len(card_rows)} rows and updating deck metadata...")
+        commit_journal(content, journal)
 
     print(f"✅ Appended {len(card_rows)} card rows")
 
     return len(card_rows)
 
 def update_deck_metadata(card_count):
-    """Update deck info (total cards, generation date)"""
+    """
+    Re-count the deck and update deck info (total cards, generation date).
+
+    insert_cards_into_deck() already keeps the header current; use this to
+    repair it after the deck was edited by hand.
+    """
     print(f"\nUpdating deck metadata...")
 
     DECK_FILE = paths.DECK_FILE
-    with open(DECK_FILE, 'r', encoding='utf-8') as f:
-        content = f.read()
+    with file_lock(DECK_FILE):
+        recover_journal()
 
-    lines = content.split('\n')
+        with open(DECK_FILE, 'r', encoding='utf-8') as f:
+            content = f.read()
 
-    # Count actual cards in the table
-    actual_count = 0
-    for line in lines:
-        # Count table rows (skip header and separator)
-        if line.startswith('|') and not line.startswith('| ID |') and not line.startswith('|-'):
-            actual_count += 1
+        lines = content.split('\n')
 
-    # Update "Total cards" line
-    for i, line in enumerate(lines):
-        if line.startswith('- Total cards:'):
-            old_metadata_count = int(line.split(':')[1].strip())
-            lines[i] = f'- Total cards: {actual_count}'
+        # Count actual cards in the table
+        actual_count = sum(1 for line in lines if is_card_row(line))
+
+        today = datetime.now().strftime('%Y-%m-%d')
+        old_metadata_count = update_metadata_lines(lines, actual_count, today)
+        if old_metadata_count is not None:
             print(f"✅ Updated card count: {old_metadata_count} (old metadata) → {actual_count} (actual cards in file)")
             print(f"   Added this session: {card_count} cards")
-            break
-
-    # Update "Generated" date
-    today = datetime.now().strftime('%Y-%m-%d')
-    for i, line in enumerate(lines):
-        if line.startswith('- Generated:'):
-            lines[i] = f'- Generated: {today}'
-            print(f"✅ Updated generation date: {today}")
-            break
+        print(f"✅ Updated generation date: {today}")
 
-    # Write back
-    with open(DECK_FILE, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+        # Write back
+        with atomic_write(DECK_FILE) as f:
+            f.write('\n'.join(lines))
 
 def main():
+    parser = argparse.ArgumentParser(description="Insert pending_cards.json into the deck")
+    parser.add_argument('--on-duplicate', choices=DUPLICATE_MODES, default='skip',
+                        help='What to do with cards that duplicate a deck card or an earlier card (default: skip)')
+    parser.add_argument('--jsonl', nargs='?', const=str(PENDING_CARDS_JSONL), metavar='FILE',
+                        help=f'Stream cards from a JSONL file (default: {PENDING_CARDS_JSONL.name})')
+    parser.add_argument('--batch-size', type=int, default=JSONL_BATCH_SIZE,
+                        help=f'Cards per deck write in JSONL mode (default: {JSONL_BATCH_SIZE})')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("INSERT CARDS INTO DECK")
     print("=" * 60)
     print()
 
-    # Load pending cards
-    cards = load_pending_cards()
-
-    # Insert into deck
-    card_count = insert_cards_into_deck(cards)
-
-    # Update metadata
-    update_deck_metadata(card_count)
+    errors = []
+    try:
+        if args.jsonl:
+            # Stream, validate and insert in batches
+            print(f"Streaming {args.jsonl}...")
+            card_count, valid, errors = insert_jsonl_cards(Path(args.jsonl), args.on_duplicate, args.batch_size)
+            print(f"\n✅ {valid} valid records")
+            if errors:
+                print(f"❌ {len(errors)} errors (records not inserted):")
+                for line_number, message in errors:
+                    print(f"  line {line_number}: {message}")
+        else:
+            # Load pending cards
+            cards = load_pending_cards()
+
+            # Insert into deck (header metadata is updated in the same write)
+            card_count = insert_cards_into_deck(cards, on_duplicate=args.on_duplicate)
+    except DuplicateCardsError as e:
+        print_duplicates(e.duplicates)
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    except FileNotFoundError as e:
+        print(f"ERROR: {e.filename} not found")
+        sys.exit(1)
 
     print()
     print("=" * 60)
@@ -214,5 +752,8 @@ def main():
     print("3. Import german_vocabulary_b1.apkg into Anki")
     print("=" * 60)
 
+    if errors:
+        sys.exit(1)
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Media manifest for both audio directories.
+
+One JSON file (paths.MEDIA_MANIFEST_FILE) describing every audio file in
+paths.AUDIO_GENERATED and paths.AUDIO_DUOLINGO:
+
+    filename → size, mtime_ns, sha256, duration, sample_rate
+
+The manifest is updated incrementally: files whose size and mtime are
+unchanged keep their entry, only new or modified files are read and hashed.
+Only this script and the explicit audio tools update it. Deck generators
+and the validator resolve files through the audio index and read sizes and
+durations from the stored manifest (load_manifest), so a build never stats
+or hashes the whole library.
+
+Usage:
+    python3 media_manifest.py           # update manifest, print library summary
+    python3 media_manifest.py --deck    # also report audio referenced by the deck
+
+    from flashcards.scripts.media_manifest import update_manifest, media_usage
+    manifest = update_manifest()
+    usage = media_usage(manifest, ["Tisch.wav", "Sehr.mp3"])
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import paths
+from flashcards.scripts.audio_checker import get_audio_dirs, get_audio_index
+from flashcards.scripts.audio_formats import analyze_audio, file_sha256
+from flashcards.scripts.file_utils import atomic_write
+
+# Bump when the entry layout changes; older manifests are rebuilt from scratch
+MANIFEST_VERSION = 1
+
+def load_manifest():
+    """
+    Load the manifest as stored on disk (no revalidation).
+
+    Returns:
+        dict: {'version': int, 'dirs': {dir path (str): {filename: entry}}}
+    """
+    try:
+        with open(paths.MEDIA_MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {'version': MANIFEST_VERSION, 'dirs': {}}
+
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return {'version': MANIFEST_VERSION, 'dirs': {}}
+    return data
+
+def save_manifest(manifest):
+    """Persist the manifest (write to temp file, then rename)"""
+    with atomic_write(paths.MEDIA_MANIFEST_FILE) as f:
+        json.dump(manifest, f, ensure_ascii=False)
+
+def _describe_file(path, extension, st):
+    """Worker: read one file once for its hash and header info"""
+    data = path.read_bytes()
+    info = analyze_audio(data, extension, levels=False)
+    return {
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'sha256': file_sha256(data),
+        'duration': info['duration'],
+        'sample_rate': info['sample_rate'],
+    }
+
+def update_manifest(workers=None):
+    """
+    Bring the manifest up to date with both audio directories.
+
+    Uses the audio index for the file listing and the size+mtime fast path
+    for each file; only new or changed files are read (in a thread pool).
+    The manifest is saved only if something changed.
+
+    Args:
+        workers (int): Thread pool size (default: CPU count)
+
+    Returns:
+        dict: Updated manifest (see load_manifest)
+    """
+    audio_dirs = get_audio_dirs()
+    index = get_audio_index(audio_dirs, workers)
+    old = load_manifest()
+
+    manifest = {'version': MANIFEST_VERSION, 'dirs': {}}
+    to_describe = []
+    changed = set(old['dirs']) != {str(d['path']) for d in audio_dirs}
+
+    for audio_dir in audio_dirs:
+        dir_key = str(audio_dir['path'])
+        old_entries = old['dirs'].get(dir_key, {})
+        entries = manifest['dirs'][dir_key] = {}
+
+        for filename in sorted(index[dir_key]['files']):
+            if not filename.endswith(audio_dir['extension']):
+                continue
+            path = audio_dir['path'] / filename
+            try:
+                st = path.stat()
+            except OSError:
+                continue  # Removed since the index was built
+
+            entry = old_entries.get(filename)
+            if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+                entries[filename] = entry  # Fast path: unchanged
+            else:
+                to_describe.append((dir_key, filename, path, audio_dir['extension'], st))
+
+        if set(entries) != set(old_entries):
+            changed = True
+
+    if to_describe:
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [
+                pool.submit(_describe_file, path, extension, st)
+                for _, _, path, extension, st in to_describe
+            ]
+            for (dir_key, filename, _, _, _), future in zip(to_describe, futures):
+                try:
+                    manifest['dirs'][dir_key][filename] = future.result()
+                except OSError:
+                    continue  # Unreadable file, left out of the manifest
+        changed = True
+
+    if changed:
+        save_manifest(manifest)
+    return manifest
+
+def lookup_media(manifest, filename):
+    """
+    Find a file in the manifest (audio directories in priority order).
+
+    Returns:
+        tuple: (Path, entry dict) or (None, None) if not in the manifest
+    """
+    for audio_dir in get_audio_dirs():
+        entry = manifest['dirs'].get(str(audio_dir['path']), {}).get(filename)
+        if entry:
+            return audio_dir['path'] / filename, entry
+    return None, None
+
+def media_usage(manifest, filenames):
+    """
+    Answer "how much audio do these files add up to".
+
+    Args:
+        manifest (dict): Manifest from update_manifest/load_manifest
+        filenames (iterable): Audio filenames (e.g. the deck's Audio column)
+
+    Returns:
+        dict: {'files': int, 'bytes': int, 'duration': float, 'missing': [filename, ...]}
+    """
+    usage = {'files': 0, 'bytes': 0, 'duration': 0.0, 'missing': []}
+    for filename in sorted(set(filenames)):
+        _, entry = lookup_media(manifest, filename)
+        if entry is None:
+            usage['missing'].append(filename)
+            continue
+        usage['files'] += 1
+        usage['bytes'] += entry['size']
+        usage['duration'] += entry['duration'] or 0.0
+    return usage
+
+def read_deck_audio_references():
+    """Get set of audio filenames referenced in the deck's Audio column"""
+    references = set()
+    try:
+        with open(paths.DECK_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.startswith('|') or line.startswith('| ID |') or line.startswith('|-'):
+                    continue
+                parts = [p.strip() for p in line.strip().split('|')[1:-1]]
+                if len(parts) == 10 and parts[9] and parts[9] != '—':
+                    references.add(parts[9])
+    except FileNotFoundError:
+        pass
+    return references
+
+def format_mb(size):
+    """Format a byte count as megabytes"""
+    return f"{size / (1024 * 1024):.1f} MB"
+
+def main():
+    parser = argparse.ArgumentParser(description="Update the media manifest for both audio directories")
+    parser.add_argument('--deck', action='store_true',
+                        help='Report how much audio the deck references')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of worker threads (default: CPU count)')
+    args = parser.parse_args()
+
+    manifest = update_manifest(workers=args.workers)
+
+    print("=" * 60)
+    print("MEDIA MANIFEST")
+    print("=" * 60)
+    print(f"Manifest: {paths.MEDIA_MANIFEST_FILE}")
+    for audio_dir in get_audio_dirs():
+        entries = manifest['dirs'].get(str(audio_dir['path']), {})
+        size = sum(e['size'] for e in entries.values())
+        print(f"{audio_dir['description']}: {len(entries)} files, {format_mb(size)}")
+
+    if args.deck:
+        usage = media_usage(manifest, read_deck_audio_references())
+        print()
+        print(f"Deck: {paths.DECK_FILE.name}")
+        print(f"Referenced audio: {usage['files']} files, {format_mb(usage['bytes'])}, "
+              f"{usage['duration'] / 60:.1f} min")
+        if usage['missing']:
+            print(f"❌ Missing from library ({len(usage['missing'])}):")
+            for filename in usage['missing']:
+                print(f"   • {filename}")
+    print("=" * 60)
+
+if __name__ == '__main__':
+    main()
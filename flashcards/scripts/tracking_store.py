@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Structured store for word tracking data.
+
+word_tracking.md stays the human-readable (and committed) file, but scripts
+work on an SQLite copy (paths.WORD_TRACKING_DB) with real columns and
+indexes on word and status:
+
+    words(id, word, word_key, status, audio, ipa, word_type, date_added, notes)
+    word_keys(key, word_id)   -- every deck_index.word_keys() key of a row
+
+"sich freuen" is found both under "sich freuen" and under its lemma "freuen",
+so a row can be looked up by any key that decides its deck membership.
+
+The markdown file is a rendered view of the store. It is re-imported
+automatically when it was edited by hand (its hash no longer matches the
+last render), so the store can always be deleted and rebuilt from it.
+
+Usage:
+    python3 tracking_store.py                       # pending words
+    python3 tracking_store.py --status error
+    python3 tracking_store.py --limit 10
+
+    from flashcards.scripts.tracking_store import open_store, select_words
+    conn = open_store()
+    batch = select_words(conn, 'pending', limit=10)
+"""
+
+import argparse
+import hashlib
+import io
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import paths
+from flashcards.scripts.deck_index import word_keys as form_keys
+from flashcards.scripts.file_utils import atomic_write, file_lock
+from flashcards.scripts.word_normalization import word_key
+
+# Bump when the schema changes; older stores are rebuilt from the markdown file
+STORE_VERSION = 2
+
+# Row fields in table column order
+COLUMNS = ('word', 'status', 'audio', 'ipa', 'word_type', 'date_added', 'notes')
+
+TABLE_HEADER = "| Word | Status | Audio | IPA | Word Type | Date Added | Notes |\n"
+TABLE_SEPARATOR = "|------|--------|-------|-----|-----------|------------|-------|\n"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    word_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    audio TEXT NOT NULL,
+    ipa TEXT NOT NULL,
+    word_type TEXT NOT NULL,
+    date_added TEXT NOT NULL,
+    notes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_words_word_key ON words(word_key);
+CREATE TABLE IF NOT EXISTS word_keys (
+    key TEXT NOT NULL,
+    word_id INTEGER NOT NULL,
+    PRIMARY KEY (key, word_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_words_status ON words(status);
+"""
+
+def parse_tracking_markdown(text):
+    """
+    Parse word_tracking.md.
+
+    Args:
+        text (str): File content
+
+    Returns:
+        dict: {'preamble': str, 'header': str, 'separator': str, 'rows': [row dict, ...]}
+
+    Raises:
+        ValueError: If the table header is missing
+    """
+    lines = text.splitlines(keepends=True)
+
+    # Find table start
+    table_start = None
+    for i, line in enumerate(lines):
+        if line.startswith('| Word | Status |'):
+            table_start = i
+            break
+
+    if table_start is None:
+        raise ValueError("Could not find table header in word_tracking.md")
+
+    separator = lines[table_start + 1] if table_start + 1 < len(lines) else TABLE_SEPARATOR
+    rows = []
+    for line in lines[table_start + 2:]:
+        line = line.strip()
+
+        # Stop at end of table (empty line or stats section)
+        if not line or line == '---' or line.startswith('##'):
+            break
+
+        if not line.startswith('|'):
+            continue
+
+        # Parse row
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) < 8:
+            continue
+
+        rows.append(dict(zip(COLUMNS, parts[1:8])))
+
+    return {
+        'preamble': ''.join(lines[:table_start]),
+        'header': lines[table_start],
+        'separator': separator,
+        'rows': rows,
+    }
+
+def format_row(row):
+    """Render one row dict as a table line"""
+    return "| " + " | ".join(row[column] for column in COLUMNS) + " |\n"
+
+def format_statistics(stats):
+    """Statistics section written below the table"""
+    total = sum(stats.values())
+    lines = [
+        "\n---\n\n",
+        "## Statistics\n\n",
+        f"- **Total words:** {total}\n",
+        f"- **In deck:** {stats['in_deck']}\n",
+        f"- **Pending (with audio):** {stats['pending']}\n",
+        f"- **Missing audio:** {stats['missing_audio']}\n",
+    ]
+    if stats['error'] > 0:
+        lines.append(f"- **Error:** {stats['error']}\n")
+    lines.append(f"- **Ready to process:** {stats['pending']}\n")
+    return ''.join(lines)
+
+def _get_meta(conn, key, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def _set_meta(conn, **values):
+    conn.executemany(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        [(key, str(value)) for key, value in values.items()],
+    )
+
+def _signature(path):
+    """size:mtime_ns of a file (None if missing)"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def connect(db_file=None):
+    """
+    Open (and if needed create) the SQLite store.
+
+    Args:
+        db_file (Path): Database file (default: paths.WORD_TRACKING_DB)
+
+    Returns:
+        sqlite3.Connection: Connection with sqlite3.Row row factory
+    """
+    db_file = Path(db_file or paths.WORD_TRACKING_DB)
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != STORE_VERSION:
+        # Schema changed: drop everything, the markdown file is re-imported
+        conn.executescript("DROP TABLE IF EXISTS meta; DROP TABLE IF EXISTS words; DROP TABLE IF EXISTS word_keys;")
+        conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+def replace_rows(conn, rows, preamble=None, header=TABLE_HEADER, separator=TABLE_SEPARATOR):
+    """
+    Replace the whole table (import or regeneration).
+
+    Rows are inserted straight from the iterable (a generator is fine).
+
+    Args:
+        conn: Store connection
+        rows (iterable): Row dicts with COLUMNS keys, in table order
+        preamble (str): Text before the table (default: keep current)
+        header (str): Table header line
+        separator (str): Table separator line
+    """
+    with conn:
+        conn.execute("DELETE FROM words")
+        conn.execute("DELETE FROM word_keys")
+        for row in rows:
+            cursor = conn.execute(
+                "INSERT INTO words (word, word_key, status, audio, ipa, word_type, date_added, notes) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (row['word'], word_key(row['word']), row['status'], row['audio'], row['ipa'],
+                 row['word_type'], row['date_added'], row['notes']),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO word_keys (key, word_id) VALUES (?, ?)",
+                ((key, cursor.lastrowid) for key in form_keys(row['word']) | {word_key(row['word'])}),
+            )
+        if preamble is not None:
+            _set_meta(conn, preamble=preamble)
+        _set_meta(conn, header=header, separator=separator, dirty=1)
+
+def import_markdown(conn, text):
+    """Load word_tracking.md content into the store"""
+    parsed = parse_tracking_markdown(text)
+    replace_rows(conn, parsed['rows'], parsed['preamble'], parsed['header'], parsed['separator'])
+    with conn:
+        _set_meta(conn, md_sha256=hashlib.sha256(text.encode('utf-8')).hexdigest())
+
+def open_store(tracking_file=None, db_file=None):
+    """
+    Open the store, re-importing the markdown file if it changed.
+
+    The size+mtime of the markdown file is compared first; only if it
+    differs is the file hashed and (if the hash differs too) re-imported.
+
+    Args:
+        tracking_file (Path): Markdown view (default: paths.WORD_TRACKING_FILE)
+        db_file (Path): Database file (default: paths.WORD_TRACKING_DB)
+
+    Returns:
+        sqlite3.Connection
+
+    Raises:
+        FileNotFoundError: If neither the store nor the markdown file has data
+        ValueError: If the markdown file has no table
+    """
+    tracking_file = Path(tracking_file or paths.WORD_TRACKING_FILE)
+    with file_lock(tracking_file):
+        return _sync_store(tracking_file, connect(db_file))
+
+def _sync_store(tracking_file, conn):
+    """Re-import the markdown file into the store if it changed"""
+    signature = _signature(tracking_file)
+    if signature is None:
+        if _get_meta(conn, 'header') is None:
+            conn.close()
+            raise FileNotFoundError(tracking_file)
+        return conn  # Store only; the view is rendered on next write
+    if signature == _get_meta(conn, 'md_signature'):
+        return conn  # Fast path: markdown untouched since last sync
+
+    text = tracking_file.read_text(encoding='utf-8')
+    if hashlib.sha256(text.encode('utf-8')).hexdigest() != _get_meta(conn, 'md_sha256'):
+        try:
+            import_markdown(conn, text)
+        except ValueError:
+            conn.close()
+            raise
+    with conn:
+        _set_meta(conn, md_signature=signature)
+    return conn
+
+def get_rows(conn, word_keys=None):
+    """
+    Fetch rows in table order.
+
+    Args:
+        conn: Store connection
+        word_keys (iterable): Only rows matching these keys - the row's
+                              word_key() or any of its deck_index.word_keys()
+                              (default: all)
+
+    Returns:
+        list: Row dicts with 'id' and COLUMNS keys
+    """
+    if word_keys is None:
+        cursor = conn.execute("SELECT * FROM words ORDER BY id")
+        return [dict(row) for row in cursor]
+
+    rows = {}
+    for key in set(word_keys):
+        cursor = conn.execute(
+            "SELECT words.* FROM word_keys JOIN words ON words.id = word_keys.word_id WHERE word_keys.key = ?",
+            (key,),
+        )
+        rows.update((row['id'], dict(row)) for row in cursor)
+    return [rows[row_id] for row_id in sorted(rows)]
+
+def update_rows(conn, rows):
+    """Write back changed rows (matched by id)"""
+    if not rows:
+        return
+    with conn:
+        _set_meta(conn, dirty=1)
+        conn.executemany(
+            "UPDATE words SET status = ?, audio = ?, ipa = ?, word_type = ?, date_added = ?, notes = ? "
+            "WHERE id = ?",
+            [
+                (row['status'], row['audio'], row['ipa'], row['word_type'],
+                 row['date_added'], row['notes'], row['id'])
+                for row in rows
+            ],
+        )
+
+def select_words(conn, status='pending', limit=None):
+    """
+    Select words by status (e.g. the next batch of pending words).
+
+    Args:
+        conn: Store connection
+        status (str): Status value to select
+        limit (int): Maximum number of rows (default: all)
+
+    Returns:
+        list: Row dicts in table order
+    """
+    query = "SELECT * FROM words WHERE status = ? ORDER BY id"
+    params = [status]
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    return [dict(row) for row in conn.execute(query, params)]
+
+def count_statuses(conn):
+    """Status counts: {'in_deck', 'pending', 'missing_audio', 'error', ...}"""
+    stats = {'in_deck': 0, 'pending': 0, 'missing_audio': 0, 'error': 0}
+    for status, count in conn.execute("SELECT status, COUNT(*) FROM words GROUP BY status"):
+        stats[status] = count
+    return stats
+
+def render_to(conn, f):
+    """
+    Stream the markdown view of the store into an open text file.
+
+    Rows are written straight from the cursor, never held in memory as a whole.
+
+    Returns:
+        str: SHA-256 hex digest of the rendered content
+    """
+    digest = hashlib.sha256()
+
+    def emit(text):
+        f.write(text)
+        digest.update(text.encode('utf-8'))
+
+    emit(_get_meta(conn, 'preamble', ''))
+    emit(_get_meta(conn, 'header', TABLE_HEADER))
+    emit(_get_meta(conn, 'separator', TABLE_SEPARATOR))
+    for row in conn.execute("SELECT * FROM words ORDER BY id"):
+        emit(format_row(row))
+    emit(format_statistics(count_statuses(conn)))
+    return digest.hexdigest()
+
+def render_markdown(conn):
+    """Render the markdown view of the store as a string"""
+    buffer = io.StringIO()
+    render_to(conn, buffer)
+    return buffer.getvalue()
+
+def _file_sha256(path):
+    """SHA-256 of a file's content (None if missing)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+class _Unchanged(Exception):
+    """Rendered content equals the file on disk; discard the temp file"""
+
+def write_markdown(conn, tracking_file=None):
+    """
+    Render the store to word_tracking.md if the content differs.
+
+    Skips rendering entirely when the store has no unrendered changes and
+    the file is untouched. Otherwise rows are streamed into a temp file
+    which replaces the markdown file only if its hash differs.
+
+    Returns:
+        bool: True if the file was written
+    """
+    tracking_file = Path(tracking_file or paths.WORD_TRACKING_FILE)
+
+    with file_lock(tracking_file):
+        signature = _signature(tracking_file)
+        if _get_meta(conn, 'dirty') == '0' and signature == _get_meta(conn, 'md_signature'):
+            return False  # Fast path: nothing to render
+
+        current = _file_sha256(tracking_file)
+        written = True
+        try:
+            with atomic_write(tracking_file) as f:
+                digest = render_to(conn, f)
+                if digest == current:
+                    raise _Unchanged()
+        except _Unchanged:
+            written = False
+
+        with conn:
+            _set_meta(conn, md_sha256=digest, md_signature=_signature(tracking_file), dirty=0)
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the word tracking store")
+    parser.add_argument('--status', default='pending',
+                        help='Status to select (default: pending)')
+    parser.add_argument('--limit', type=int, default=None,
+                        help='Maximum number of words')
+    args = parser.parse_args()
+
+    conn = open_store()
+    rows = select_words(conn, args.status, args.limit)
+    conn.close()
+
+    print(f"{len(rows)} words with status '{args.status}':")
+    for row in rows:
+        type_label = f" ({row['word_type']})" if row['word_type'] != '—' else ""
+        print(f"  {row['word']}{type_label}  {row['audio']}")
+
+if __name__ == '__main__':
+    main()
@@ -5,17 +5,43 @@ Unpack Anki .apkg deck to JSON format
 Usage:
     python3 unpack_deck.py <deck.apkg>
     python3 unpack_deck.py  # defaults to german_vocabulary_b1.apkg
+    python3 unpack_deck.py --format jsonl.zst
+    python3 unpack_deck.py --media
 
 Output:
-    temp/deck_data.json - Complete card data with all fields
+    temp/deck_data.json - Complete card data with all fields, plus the
+                          package's media map (filenames only)
+    temp/deck_data.jsonl[.zst] - Same data as a header line plus one compact
+                          line per note, written while the notes are read
+
+--media skips the unpack and instead lists the packaged media (zip central
+directory + media map) and diffs it against the notes' [sound:] references
+and the local audio library: unreferenced, missing and stale files.
+
+Results are cached in temp/unpack_cache/, keyed by the package's content
+hash (re-hashed only when its size or mtime changes). Unpacking the same
+package again copies the cached result (--no-cache to force a fresh unpack).
+
+Only the collection database is taken out of the package (streamed, and
+zstd-decompressed on the fly for collection.anki21b); media files are
+listed from the 'media' entry but never extracted, so unpacking does not
+get slower or use more temp disk as the amount of audio grows.
 """
 
+import argparse
+import hashlib
+import io
+import os
+import re
 import sqlite3
+import time
 import zipfile
+import zlib
 import json
 import sys
 import tempfile
 import shutil
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 from datetime import datetime
 
@@ -30,206 +56,707 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import paths
+from flashcards.scripts.file_utils import atomic_write
+from flashcards.scripts.audio_checker import find_audio_paths
+from flashcards.scripts.media_manifest import format_mb
 
 # Configuration
 DEFAULT_APKG = paths.FLASHCARDS_DIR / 'german_vocabulary_b1.apkg'
 TEMP_DIR = PROJECT_ROOT / 'temp'
 OUTPUT_FILE = TEMP_DIR / 'deck_data.json'
 
+# --format choices: indented JSON document, or streamed (compressed) JSON lines
+OUTPUT_FORMATS = ('json', 'jsonl', 'jsonl.zst')
+ZSTD_LEVEL = 10
+
+# Packaged audio is named "<LANGUAGE_PREFIX>_<file>" by the deck generators
+MEDIA_PREFIX = 'de_'
+SOUND_PATTERN = re.compile(r'\[sound:([^\]]+)\]')
+
+# Unpack cache (paths.UNPACK_CACHE_DIR): bump to invalidate all cached results
+UNPACK_CACHE_VERSION = 1
+MAX_CACHED_RESULTS = 8
+
+# zstd frame magic (collection.anki21b, and the media map of newer exports)
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
 def extract_apkg(apkg_path, extract_to):
-    """Extract .apkg file (it's a ZIP) to temporary directory"""
-    print(f"Extracting {apkg_path.name}...")
+    """
+    Extract the collection database from an .apkg file (it's a ZIP).
+
+    Only the collection is written to extract_to: collection.anki21b is
+    decompressed on the fly while streaming it out of the zip, otherwise
+    collection.anki2 is copied. Media blobs are never extracted.
+
+    Returns:
+        Path: Collection database, or None on failure
+    """
+    print(f"Extracting collection from {apkg_path.name}...")
 
     try:
         with zipfile.ZipFile(apkg_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
-        print(f"✅ Extracted to {extract_to}")
-        return True
+            names = set(zip_ref.namelist())
+            db_path = extract_to / 'collection.anki2'
+
+            if 'collection.anki21b' in names and HAS_ZSTANDARD:
+                print(f"Found newer format: collection.anki21b (compressed)")
+                with zip_ref.open('collection.anki21b') as ifh, open(db_path, 'wb') as ofh:
+                    zstandard.ZstdDecompressor().copy_stream(ifh, ofh)
+                print(f"✅ Decompressed collection.anki21b")
+            elif 'collection.anki2' in names:
+                if 'collection.anki21b' in names:
+                    print(f"⚠️  WARNING: zstandard library not installed")
+                    print(f"   Install with: pip install zstandard")
+                    print(f"   Falling back to collection.anki2 (may have incomplete data)")
+                else:
+                    print(f"Using collection.anki2 (old format)")
+                with zip_ref.open('collection.anki2') as ifh, open(db_path, 'wb') as ofh:
+                    shutil.copyfileobj(ifh, ofh)
+            else:
+                print(f"❌ ERROR: No valid collection database found in package")
+                return None
+
+        print(f"✅ Extracted to {db_path}")
+        return db_path
     except zipfile.BadZipFile:
         print(f"❌ ERROR: {apkg_path} is not a valid .apkg file")
-        return False
+        return None
     except Exception as e:
         print(f"❌ ERROR: Failed to extract: {e}")
-        return False
+        return None
+
+def _read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+def _protobuf_fields(data):
+    """Yield (field number, value) of a protobuf message (varint and length-delimited only)"""
+    pos = 0
+    while pos < len(data):
+        key, pos = _read_varint(data, pos)
+        field, wire_type = key >> 3, key & 7
+        if wire_type == 0:
+            value, pos = _read_varint(data, pos)
+        elif wire_type == 2:
+            length, pos = _read_varint(data, pos)
+            value, pos = data[pos:pos + length], pos + length
+        else:
+            raise ValueError(f"Unsupported protobuf wire type {wire_type}")
+        yield field, value
+
+def parse_media_map(data):
+    """
+    Parse the .apkg 'media' entry into {zip member name: media filename}.
 
-def get_models_from_collection(db_path):
-    """Extract model definitions from collection
+    Older packages store a JSON object ({"0": "de_Hund.wav", ...}); newer
+    exports store a zstd-compressed protobuf list of entries, where the
+    zip member name is the entry's position (or its legacy_zip_filename).
+    """
+    if data.startswith(ZSTD_MAGIC):
+        if not HAS_ZSTANDARD:
+            raise ValueError("media map is zstd-compressed and zstandard is not installed")
+        data = zstandard.ZstdDecompressor().stream_reader(data).read()
+
+    if data[:1] in (b'{', b''):
+        return {str(k): v for k, v in json.loads(data or b'{}').items()}
+
+    # MediaEntries { repeated MediaEntry entries = 1; }
+    # MediaEntry { string name = 1; uint32 size = 2; bytes sha1 = 3; optional uint32 legacy_zip_filename = 255; }
+    media = {}
+    for index, (field, entry) in enumerate(f for f in _protobuf_fields(data) if f[0] == 1):
+        name = None
+        member = str(index)
+        for entry_field, value in _protobuf_fields(entry):
+            if entry_field == 1:
+                name = value.decode('utf-8')
+            elif entry_field == 255:
+                member = str(value)
+        media[member] = name
+    return media
+
+def read_media_map(apkg_path):
+    """
+    Media map of a package, read from its 'media' entry (no blobs are extracted).
 
-    Handles both old format (JSON in col table) and new format (separate tables)
+    Returns:
+        dict: {zip member name: media filename}; empty if the package has no media
+    """
+    with zipfile.ZipFile(apkg_path, 'r') as zip_ref:
+        try:
+            data = zip_ref.read('media')
+        except KeyError:
+            return {}
+    return parse_media_map(data)
+
+def connect_collection(db_path):
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    Open a collection database read-only.
 
-    # Check if we have the new schema (separate notetypes table)
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='notetypes'")
-    has_notetypes_table = cursor.fetchone() is not None
+    immutable=1 tells SQLite the file cannot change while open, so it skips
+    locking and change detection entirely. All queries of one unpack run
+    share this one connection.
+    """
+    uri = f"{Path(db_path).resolve().as_uri()}?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True)
 
-    model_fields = {}
+def _has_table(conn, name):
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone()
+    return row is not None
 
-    if has_notetypes_table:
-        # New format (Anki 2.1.50+): notetypes and fields are in separate tables
-        cursor.execute("SELECT id, name, config FROM notetypes")
-        notetypes = cursor.fetchall()
+def get_models_from_collection(conn):
+    """Extract model definitions from collection
 
-        for notetype_id, notetype_name, config_json in notetypes:
-            # Get field names for this notetype
-            cursor.execute("SELECT name, ord FROM fields WHERE ntid = ? ORDER BY ord", (notetype_id,))
-            fields = cursor.fetchall()
-            field_names = [field[0] for field in fields]
+    Handles both old format (JSON in col table) and new format (separate tables)
 
-            model_fields[str(notetype_id)] = {
-                'name': notetype_name,
-                'fields': field_names
-            }
+    Returns:
+        dict: {model id (str): {'name', 'fields'}}
+    """
+    model_fields = {}
+
+    if _has_table(conn, 'notetypes'):
+        # New format (Anki 2.1.50+): notetypes and fields are in separate tables,
+        # read with one join instead of one fields query per notetype
+        rows = conn.execute(
+            "SELECT nt.id, nt.name, f.name FROM notetypes nt "
+            "LEFT JOIN fields f ON f.ntid = nt.id ORDER BY nt.id, f.ord"
+        )
+        for notetype_id, notetype_name, field_name in rows:
+            model = model_fields.setdefault(str(notetype_id), {'name': notetype_name, 'fields': []})
+            if field_name is not None:
+                model['fields'].append(field_name)
     else:
         # Old format: models are stored as JSON in the col table
-        cursor.execute("SELECT models FROM col")
-        models_json = cursor.fetchone()[0]
+        models_json = conn.execute("SELECT models FROM col").fetchone()[0]
         models = json.loads(models_json)
 
         # Parse models to get field names by model ID
         for model_id, model_data in models.items():
-            model_name = model_data['name']
-            field_names = [field['name'] for field in model_data['flds']]
             model_fields[model_id] = {
-                'name': model_name,
-                'fields': field_names
+                'name': model_data['name'],
+                'fields': [field['name'] for field in model_data['flds']]
             }
 
-    conn.close()
     return model_fields
 
-def unpack_notes(db_path):
-    """Extract all notes from Anki database"""
-    print(f"Reading database: {db_path}")
-
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    # Get model definitions first
-    models = get_models_from_collection(db_path)
-
-    # Query all notes
-    cursor.execute("SELECT id, guid, mid, flds, tags FROM notes")
-    rows = cursor.fetchall()
-
-    print(f"Found {len(rows)} notes in database")
+def iter_notes(conn, models=None):
+    """
+    Yield notes from the collection one at a time (streaming cursor).
 
-    cards = []
-    for row in rows:
-        note_id, guid, model_id, fields_str, tags = row
+    Args:
+        conn (sqlite3.Connection): From connect_collection()
+        models (dict): From get_models_from_collection() (read if omitted)
 
-        # Split fields (separated by \x1f)
-        field_values = fields_str.split('\x1f')
+    Yields:
+        dict: {'note_id', 'guid', 'model_id', 'model_name', 'tags', 'fields'}
+    """
+    if models is None:
+        models = get_models_from_collection(conn)
 
+    for note_id, guid, model_id, fields_str, tags in conn.execute("SELECT id, guid, mid, flds, tags FROM notes"):
         # Get model info
-        model_id_str = str(model_id)
-        if model_id_str not in models:
+        model_info = models.get(str(model_id))
+        if model_info is None:
             print(f"⚠️  Warning: Unknown model ID {model_id}")
             continue
 
-        model_info = models[model_id_str]
-        model_name = model_info['name']
-        field_names = model_info['fields']
-
-        # Map field names to values
+        # Split fields (separated by \x1f) and map field names to values
+        field_values = fields_str.split('\x1f')
         fields_dict = {}
-        for i, field_name in enumerate(field_names):
-            if i < len(field_values):
-                # Clean up HTML tags and audio references for readability
-                value = field_values[i].strip()
-                fields_dict[field_name] = value
-            else:
-                fields_dict[field_name] = ''
+        for i, field_name in enumerate(model_info['fields']):
+            fields_dict[field_name] = field_values[i].strip() if i < len(field_values) else ''
 
-        card = {
+        yield {
             'note_id': note_id,
             'guid': guid,
             'model_id': model_id,
-            'model_name': model_name,
+            'model_name': model_info['name'],
             'tags': tags,
             'fields': fields_dict
         }
 
-        cards.append(card)
-
-    conn.close()
-    return cards
-
-def get_deck_info(db_path):
+def get_deck_info(conn):
     """Get deck name and ID from database
 
     Handles both old format (JSON in col table) and new format (separate tables)
     """
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    if _has_table(conn, 'decks'):
+        # New format (Anki 2.1.50+): decks in separate table
+        return [{'id': deck_id, 'name': deck_name}
+                for deck_id, deck_name in conn.execute("SELECT id, name FROM decks")]
 
-    # Check if we have the new schema (separate decks table)
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='decks'")
-    has_decks_table = cursor.fetchone() is not None
+    # Old format: decks stored as JSON in col table
+    decks = json.loads(conn.execute("SELECT decks FROM col").fetchone()[0])
+    return [{'id': int(deck_id), 'name': deck_data['name']} for deck_id, deck_data in decks.items()]
 
-    deck_info = []
+def output_file_for(output_format):
+    """Output path for a format (derived from OUTPUT_FILE at call time)"""
+    if output_format == 'json':
+        return OUTPUT_FILE
+    return OUTPUT_FILE.with_name(f"{OUTPUT_FILE.stem}.{output_format}")
 
-    if has_decks_table:
-        # New format (Anki 2.1.50+): decks in separate table
-        cursor.execute("SELECT id, name FROM decks")
-        decks = cursor.fetchall()
-        for deck_id, deck_name in decks:
-            deck_info.append({
-                'id': deck_id,
-                'name': deck_name
-            })
+@contextmanager
+def deck_data_writer(output_file, output_format, header):
+    """
+    Write unpacked notes one at a time, as they are handed over.
+
+    'json' collects the notes and writes one indented document at the end.
+    'jsonl' and 'jsonl.zst' write a {"header": ...} line followed by one
+    compact line per note immediately, so memory use does not depend on the
+    number of notes. The file is only put in place if the block completes.
+
+    Args:
+        output_file (Path): Target file
+        output_format (str): One of OUTPUT_FORMATS
+        header (dict): source_file, extracted_at, decks, media
+
+    Yields:
+        callable: write(note) for each note from iter_notes()
+    """
+    def encode(record):
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+    if output_format == 'json':
+        cards = []
+        yield cards.append
+        with atomic_write(output_file) as f:
+            json.dump(dict(header, total_cards=len(cards), cards=cards), f, ensure_ascii=False, indent=2)
+    elif output_format == 'jsonl.zst':
+        if not HAS_ZSTANDARD:
+            raise RuntimeError("jsonl.zst output needs zstandard (pip install zstandard)")
+        with atomic_write(output_file, 'wb') as f:
+            with zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(f, closefd=False) as writer:
+                writer.write(encode({'header': header}).encode('utf-8'))
+                yield lambda note: writer.write(encode(note).encode('utf-8'))
     else:
-        # Old format: decks stored as JSON in col table
-        cursor.execute("SELECT decks FROM col")
-        decks_json = cursor.fetchone()[0]
-        decks = json.loads(decks_json)
+        with atomic_write(output_file) as f:
+            f.write(encode({'header': header}))
+            yield lambda note: f.write(encode(note))
+
+def write_deck_data(output_file, output_format, header, notes):
+    """
+    Write unpacked notes (see deck_data_writer).
+
+    Args:
+        output_file (Path): Target file
+        output_format (str): One of OUTPUT_FORMATS
+        header (dict): source_file, extracted_at, decks, media
+        notes (iterable): Notes from iter_notes()
+
+    Returns:
+        int: Number of notes written
+    """
+    count = 0
+    with deck_data_writer(output_file, output_format, header) as write:
+        for note in notes:
+            write(note)
+            count += 1
+    return count
+
+def _iter_lines(path):
+    """Text lines of a .jsonl or .jsonl.zst file, decompressed on the fly"""
+    with open(path, 'rb') as raw:
+        if path.name.endswith('.zst'):
+            if not HAS_ZSTANDARD:
+                raise RuntimeError(f"{path.name} needs zstandard (pip install zstandard)")
+            raw = zstandard.ZstdDecompressor().stream_reader(raw)
+        with io.TextIOWrapper(raw, encoding='utf-8') as f:
+            yield from f
+
+def read_deck_data(path):
+    """
+    Open unpacked deck data in any of the output formats.
+
+    Args:
+        path (Path): deck_data.json, .jsonl or .jsonl.zst
 
-        for deck_id, deck_data in decks.items():
-            deck_info.append({
-                'id': int(deck_id),
-                'name': deck_data['name']
-            })
+    Returns:
+        tuple: (header dict, iterator of notes); for JSONL formats the notes
+               are parsed lazily, one line at a time
+    """
+    path = Path(path)
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        cards = data.pop('cards')
+        return data, iter(cards)
+
+    lines = _iter_lines(path)
+    header = json.loads(next(lines))['header']
+    return header, (json.loads(line) for line in lines if line.strip())
+
+@contextmanager
+def open_apkg(apkg_path):
+    """
+    Read notes straight from a package, without an intermediate JSON file.
 
-    conn.close()
-    return deck_info
+    Only the collection database is extracted (to a temp dir that is removed
+    on exit); notes are read lazily from one read-only connection.
 
-def decompress_anki21b(extract_dir):
-    """Decompress collection.anki21b if it exists (Anki 2.1.50+)
+    Usage:
+        with open_apkg(apkg_path) as (header, notes):
+            for note in notes:
+                ...
 
-    Returns path to the database to use (either decompressed or original)
+    Yields:
+        tuple: (header dict with source_file/extracted_at/decks/media,
+                iterator of notes as in iter_notes())
+
+    Raises:
+        ValueError: If the package has no readable collection
     """
-    anki21b_path = extract_dir / 'collection.anki21b'
-    anki2_path = extract_dir / 'collection.anki2'
+    extract_dir = Path(tempfile.mkdtemp())
+    try:
+        # Stream only the collection database out of the package
+        collection_db = extract_apkg(apkg_path, extract_dir)
+        if collection_db is None:
+            raise ValueError(f"No readable collection in {apkg_path}")
 
-    if anki21b_path.exists():
-        print(f"Found newer format: collection.anki21b (compressed)")
+        media = read_media_map(apkg_path)
+        print(f"Media files in package: {len(media)}")
 
-        if not HAS_ZSTANDARD:
-            print(f"⚠️  WARNING: zstandard library not installed")
-            print(f"   Install with: pip install zstandard")
-            print(f"   Falling back to collection.anki2 (may have incomplete data)")
-            return anki2_path
+        # One read-only connection for all queries
+        print(f"Reading database: {collection_db}")
+        conn = connect_collection(collection_db)
+        try:
+            deck_info = get_deck_info(conn)
+            print(f"Deck(s): {', '.join(d['name'] for d in deck_info)}")
+
+            count = conn.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+            print(f"Found {count} notes in database")
+
+            header = {
+                'source_file': str(apkg_path),
+                'extracted_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'decks': deck_info,
+                'media': media,
+            }
+            yield header, iter_notes(conn)
+        finally:
+            conn.close()
+    finally:
+        # Cleanup temp extraction directory
+        shutil.rmtree(extract_dir, ignore_errors=True)
+
+def iter_apkg_notes(apkg_path):
+    """Yield the notes of a package one at a time (see open_apkg)"""
+    with open_apkg(apkg_path) as (_, notes):
+        yield from notes
 
-        print(f"Decompressing collection.anki21b...")
-        decompressed_path = extract_dir / 'collection_decompressed.anki2'
+def unpack_to_file(apkg_path, output_file, output_format='json'):
+    """
+    Unpack a package (zip + SQLite) and write its notes.
+
+    Returns:
+        int: Number of notes written
+    """
+    try:
+        with open_apkg(apkg_path) as (header, notes):
+            # Notes go straight from the cursor to the output file
+            print()
+            print(f"Writing output to: {output_file}")
+            return write_deck_data(output_file, output_format, header, notes)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
+
+def package_media(apkg_path):
+    """
+    Media in a package, from the zip central directory and the media map.
+
+    Nothing is decompressed except the (small) media map.
+
+    Returns:
+        dict: {media filename: {'member', 'size', 'crc32'}}
+    """
+    media_map = read_media_map(apkg_path)
+    with zipfile.ZipFile(apkg_path, 'r') as zip_ref:
+        members = {info.filename: info for info in zip_ref.infolist()}
+    media = {}
+    for member, filename in media_map.items():
+        info = members.get(member)
+        if info is not None:
+            media[filename] = {'member': member, 'size': info.file_size, 'crc32': info.CRC}
+    return media
+
+def _local_crc32(path):
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+def diff_package_media(apkg_path):
+    """
+    Compare a package's media with the [sound:] references of its notes and
+    with the local audio library (paths.AUDIO_GENERATED / AUDIO_DUOLINGO).
+
+    Packaged names are mapped to library names by stripping MEDIA_PREFIX
+    and located through the audio index. Packaged sizes come from the zip
+    central directory and local sizes from one stat() per file; only local
+    files whose size matches are read, to compare their CRC-32 with the one
+    stored in the zip. Nothing is hashed.
+
+    Args:
+        apkg_path (Path): Package
+
+    Returns:
+        dict: {'packaged': int, 'bytes': int,
+               'unreferenced': [packaged, not referenced by any note],
+               'missing': [referenced by a note, not packaged],
+               'not_in_library': [packaged, no local source file],
+               'stale': [{'file', 'reason', 'packaged_size', 'local_size'}]}
+    """
+    media = package_media(apkg_path)
+
+    referenced = set()
+    for note in iter_apkg_notes(apkg_path):
+        for value in note['fields'].values():
+            referenced.update(SOUND_PATTERN.findall(value))
+
+    local_names = {
+        filename: filename[len(MEDIA_PREFIX):] if filename.startswith(MEDIA_PREFIX) else filename
+        for filename in media
+    }
+    local_paths = find_audio_paths(local_names.values())
+
+    not_in_library = []
+    stale = []
+    for filename, packaged in sorted(media.items()):
+        local_path = local_paths.get(local_names[filename])
+        try:
+            local_size = os.stat(local_path).st_size if local_path else None
+        except OSError:
+            local_size = None  # Removed since the audio index was built
+        if local_size is None:
+            not_in_library.append(filename)
+        elif local_size != packaged['size']:
+            stale.append({'file': filename, 'reason': 'size',
+                          'packaged_size': packaged['size'], 'local_size': local_size})
+        elif _local_crc32(local_path) != packaged['crc32']:
+            stale.append({'file': filename, 'reason': 'content',
+                          'packaged_size': packaged['size'], 'local_size': local_size})
+
+    return {
+        'packaged': len(media),
+        'bytes': sum(m['size'] for m in media.values()),
+        'unreferenced': sorted(media.keys() - referenced),
+        'missing': sorted(referenced - media.keys()),
+        'not_in_library': not_in_library,
+        'stale': stale,
+    }
+
+def print_media_report(report):
+    """Print the result of diff_package_media()"""
+    print(f"Packaged media: {report['packaged']} files ({format_mb(report['bytes'])})")
+    sections = [
+        ('unreferenced', "Unreferenced (in package, no note uses it)"),
+        ('missing', "Missing (referenced by a note, not in package)"),
+        ('not_in_library', "Not in local audio library"),
+    ]
+    for key, title in sections:
+        icon = '⚠️ ' if report[key] else '✅'
+        print(f"{icon} {title}: {len(report[key])}")
+        for filename in report[key]:
+            print(f"    {filename}")
+    icon = '⚠️ ' if report['stale'] else '✅'
+    print(f"{icon} Stale (differs from local file): {len(report['stale'])}")
+    for item in report['stale']:
+        print(f"    {item['file']} ({item['reason']}: packaged {item['packaged_size']} B, local {item['local_size']} B)")
+
+def _file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def _load_cache_index():
+    try:
+        with open(paths.UNPACK_CACHE_DIR / 'index.json', 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {'version': UNPACK_CACHE_VERSION, 'packages': {}, 'results': {}}
+    if not isinstance(index, dict) or index.get('version') != UNPACK_CACHE_VERSION:
+        return {'version': UNPACK_CACHE_VERSION, 'packages': {}, 'results': {}}
+    return index
+
+def _save_cache_index(index):
+    try:
+        with atomic_write(paths.UNPACK_CACHE_DIR / 'index.json') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass  # Cache is an optimization only
+
+def package_hash(apkg_path, index):
+    """
+    SHA-256 of a package, reusing the recorded hash while size and mtime match.
 
+    Records the (size, mtime, hash) of the package in index.
+    """
+    st = os.stat(apkg_path)
+    key = str(Path(apkg_path).resolve())
+    entry = index['packages'].get(key)
+    if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+        return entry['sha256']
+    sha256 = _file_sha256(apkg_path)
+    index['packages'][key] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha256}
+    return sha256
+
+def _prune_cache(index):
+    """
+    Keep the MAX_CACHED_RESULTS most recently used results, and only the
+    package entries whose hash still has a result.
+    """
+    results = sorted(index['results'].items(), key=lambda item: item[1]['used_at'], reverse=True)
+    for name, _ in results[MAX_CACHED_RESULTS:]:
         try:
-            dctx = zstandard.ZstdDecompressor()
-            with open(anki21b_path, 'rb') as ifh:
-                with open(decompressed_path, 'wb') as ofh:
-                    dctx.copy_stream(ifh, ofh)
-            print(f"✅ Decompressed successfully")
-            return decompressed_path
-        except Exception as e:
-            print(f"❌ ERROR: Failed to decompress: {e}")
-            print(f"   Falling back to collection.anki2")
-            return anki2_path
+            (paths.UNPACK_CACHE_DIR / name).unlink()
+        except FileNotFoundError:
+            pass
+        del index['results'][name]
+
+    cached_hashes = {name.split('.', 1)[0] for name in index['results']}
+    index['packages'] = {key: entry for key, entry in index['packages'].items()
+                         if entry['sha256'] in cached_hashes}
+
+def restamp_header(header, apkg_path):
+    """
+    Header of a cached result as if just unpacked from apkg_path.
+
+    A result is shared by every package with the same content, so its
+    stored source_file/extracted_at describe whichever package filled it.
+    """
+    return dict(header, source_file=str(apkg_path),
+                extracted_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+def export_cached(cached_file, output_file, output_format, apkg_path):
+    """
+    Write a cached result to output_file with a header for apkg_path.
+
+    Plain JSONL only gets a new first line (the notes are copied as bytes);
+    the other formats are re-encoded note by note.
+    """
+    if output_format == 'jsonl':
+        with open(cached_file, 'rb') as src, atomic_write(output_file, 'wb') as dst:
+            header = json.loads(src.readline())['header']
+            line = json.dumps({'header': restamp_header(header, apkg_path)}, ensure_ascii=False, separators=(',', ':'))
+            dst.write((line + '\n').encode('utf-8'))
+            shutil.copyfileobj(src, dst)
+        return
+    header, notes = read_deck_data(cached_file)
+    write_deck_data(output_file, output_format, restamp_header(header, apkg_path), notes)
+
+def _record_result(index, name, total_cards):
+    """Mark a cached result as just used, prune old ones and save the index"""
+    index['results'][name] = {'total_cards': total_cards, 'used_at': time.time()}
+    _prune_cache(index)
+    _save_cache_index(index)
+
+def unpack_cached(apkg_path, output_format='json'):
+    """
+    Unpacked data for a package, from the unpack cache when possible.
+
+    Results are stored in paths.UNPACK_CACHE_DIR as "<package sha256>.<format>".
+    A package whose size and mtime are unchanged is not even re-hashed, so a
+    hit costs one stat() and skips the zip and SQLite work entirely. The
+    cached file's source_file/extracted_at may describe another package with
+    the same content; export_cached() writes it out with the right header.
+
+    Args:
+        apkg_path (Path): Package
+        output_format (str): One of OUTPUT_FORMATS
+
+    Returns:
+        tuple: (cached result file, number of notes, True if it was a cache hit)
+    """
+    index = _load_cache_index()
+    sha256 = package_hash(apkg_path, index)
+    name = f"{sha256}.{output_format}"
+    cached_file = paths.UNPACK_CACHE_DIR / name
+    result = index['results'].get(name)
+
+    hit = result is not None and cached_file.exists()
+    if hit:
+        print(f"✅ Unpack cache hit: {apkg_path.name} ({sha256[:12]})")
+        total_cards = result['total_cards']
     else:
-        print(f"Using collection.anki2 (old format)")
-        return anki2_path
+        total_cards = unpack_to_file(apkg_path, cached_file, output_format)
+
+    _record_result(index, name, total_cards)
+    return cached_file, total_cards, hit
+
+@contextmanager
+def open_cached(apkg_path, output_format='jsonl'):
+    """
+    Read the notes of a package, from the unpack cache when possible.
+
+    A hit streams the cached result. A miss reads the notes straight from
+    the package (see open_apkg) and writes the cache file as a side effect
+    while they pass through, so the first run does not serialize the notes
+    and parse them back. Notes the caller does not consume are still
+    written, so the cached result is always complete.
+
+    Usage:
+        with open_cached(apkg_path, 'jsonl') as (header, notes):
+            for note in notes:
+                ...
+
+    Yields:
+        tuple: (header dict, iterator of notes)
+    """
+    index = _load_cache_index()
+    sha256 = package_hash(apkg_path, index)
+    name = f"{sha256}.{output_format}"
+    cached_file = paths.UNPACK_CACHE_DIR / name
+    result = index['results'].get(name)
+
+    if result is not None and cached_file.exists():
+        print(f"✅ Unpack cache hit: {apkg_path.name} ({sha256[:12]})")
+        header, notes = read_deck_data(cached_file)
+        yield restamp_header(header, apkg_path), notes
+        _record_result(index, name, result['total_cards'])
+        return
+
+    with ExitStack() as stack:
+        try:
+            header, notes = stack.enter_context(open_apkg(apkg_path))
+        except ValueError as e:
+            print(f"❌ ERROR: {e}")
+            sys.exit(1)
+        write = stack.enter_context(deck_data_writer(cached_file, output_format, header))
+        written = 0
+
+        def tee():
+            nonlocal written
+            for note in notes:
+                write(note)
+                written += 1
+                yield note
+
+        passing = tee()
+        yield header, passing
+        for _ in passing:
+            pass  # Notes the caller left unread still go into the cache file
+    _record_result(index, name, written)
 
 def main():
+    parser = argparse.ArgumentParser(description="Unpack an Anki .apkg deck to JSON")
+    parser.add_argument('apkg', nargs='?', help=f'Package to unpack (default: {DEFAULT_APKG.name})')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json',
+                        help='json (indented document), jsonl or jsonl.zst (streamed, one note per line)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always unpack, ignoring (and not updating) the unpack cache')
+    parser.add_argument('--media', action='store_true',
+                        help='Only list packaged media and diff it against notes and the local audio library')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("ANKI DECK UNPACKER")
     print("=" * 70)
@@ -237,8 +764,8 @@ def main():
     print()
 
     # Get input file
-    if len(sys.argv) > 1:
-        apkg_path = Path(sys.argv[1])
+    if args.apkg:
+        apkg_path = Path(args.apkg)
         if not apkg_path.is_absolute():
             apkg_path = Path.cwd() / apkg_path
     else:
@@ -251,62 +778,34 @@ def main():
 
     print()
 
-    # Create temp directory if it doesn't exist
-    TEMP_DIR.mkdir(exist_ok=True)
-
-    # Extract to temporary directory
-    extract_dir = Path(tempfile.mkdtemp())
-
-    try:
-        if not extract_apkg(apkg_path, extract_dir):
-            sys.exit(1)
-
-        print()
-
-        # Decompress collection.anki21b if it exists, otherwise use collection.anki2
-        collection_db = decompress_anki21b(extract_dir)
-        if not collection_db.exists():
-            print(f"❌ ERROR: No valid collection database found in package")
-            sys.exit(1)
-
+    if args.media:
+        # Media mode: no output file, no media extraction
+        report = diff_package_media(apkg_path)
         print()
+        print_media_report(report)
+        print("=" * 70)
+        problems = report['unreferenced'] or report['missing'] or report['not_in_library'] or report['stale']
+        sys.exit(1 if problems else 0)
 
-        # Get deck info
-        deck_info = get_deck_info(collection_db)
-        print(f"Deck(s): {', '.join(d['name'] for d in deck_info)}")
-        print()
-
-        # Unpack all notes
-        cards = unpack_notes(collection_db)
-
-        # Prepare output data
-        output_data = {
-            'source_file': str(apkg_path),
-            'extracted_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'decks': deck_info,
-            'total_cards': len(cards),
-            'cards': cards
-        }
-
-        # Write to JSON
-        print()
-        print(f"Writing output to: {OUTPUT_FILE}")
-        with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+    # Create temp directory if it doesn't exist
+    TEMP_DIR.mkdir(exist_ok=True)
+    output_file = output_file_for(args.format)
 
-        print(f"✅ Successfully unpacked {len(cards)} cards")
+    if args.no_cache:
+        total_cards = unpack_to_file(apkg_path, output_file, args.format)
+    else:
+        cached_file, total_cards, _ = unpack_cached(apkg_path, args.format)
+        export_cached(cached_file, output_file, args.format, apkg_path)
 
-    finally:
-        # Cleanup temp extraction directory
-        shutil.rmtree(extract_dir, ignore_errors=True)
+    print(f"✅ Successfully unpacked {total_cards} cards")
 
     print()
     print("=" * 70)
     print("SUMMARY")
     print("=" * 70)
     print(f"Input: {apkg_path}")
-    print(f"Output: {OUTPUT_FILE}")
-    print(f"Total cards: {len(cards)}")
+    print(f"Output: {output_file}")
+    print(f"Total cards: {total_cards}")
     print()
     print(f"End time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 70)
@@ -6,8 +6,30 @@ Update word_tracking.md based on current deck status
 - Preserves all other metadata (Word Type, IPA, Notes)
 - Sets Date Added when status changes to in_deck
 - Does NOT add new words automatically
+
+Rows are read and updated through the tracking store (tracking_store.py);
+word_tracking.md is re-rendered from it.
+
+Incremental by default: the deck words and audio file lists of the last run
+are kept in paths.WORD_TRACKING_STATE. Only rows whose word is affected by
+a deck or audio change since then are re-evaluated, and the file is not
+rewritten if the result is identical. A hand-edited tracking file (or
+--full) falls back to re-evaluating every row.
+
+Every run also writes a JSON change report next to the tracking file
+(word_tracking.changes.json): status transitions, audio changes, words that
+entered the deck with their dates, and totals. With --exit-code the script
+exits with EXIT_NO_CHANGES when no row changed, so batch drivers can skip
+downstream steps without parsing anything.
+
+Usage:
+    python3 update_word_tracking.py
+    python3 update_word_tracking.py --full
+    python3 update_word_tracking.py --exit-code || echo "nothing to do"
 """
 
+import argparse
+import json
 import os
 import sys
 from datetime import datetime
@@ -18,199 +40,228 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import paths
-from flashcards.scripts.audio_checker import check_audio as get_audio_filename
+from flashcards.scripts.audio_checker import get_audio_dirs, get_audio_index, lookup_audio_batch
+from flashcards.scripts.deck_index import deck_membership, load_deck_index, word_keys
+from flashcards.scripts.file_utils import atomic_write, file_lock
+from flashcards.scripts.tracking_store import count_statuses, get_rows, open_store, update_rows, write_markdown
+from flashcards.scripts.word_normalization import word_key
 
 """
 NOTE: Do not cache paths.DECK_FILE/WORD_TRACKING_FILE at import time because
 tests may monkeypatch these values. Always resolve them at call time.
 """
 
-def check_audio(word):
-    """Check if audio exists for word using audio_checker.py"""
-    audio_file = get_audio_filename(word)
+# Exit status for --exit-code runs in which no row changed
+# (1 is left for errors, 2 for argparse usage errors)
+EXIT_NO_CHANGES = 3
+
+def format_audio(audio_file):
+    """Format the Audio column for a resolved audio filename (or None)"""
     if audio_file:
         return f"✅ {audio_file}"
     return "❌ missing"
 
+def audio_filename(audio):
+    """Audio filename from an Audio column value (None if missing)"""
+    if audio.startswith('✅'):
+        return audio[1:].strip()
+    return None
+
 def read_words_in_deck():
     """
     Get words in deck with two matching strategies:
     - words_set: set of all words (for word-only matching when tracking has no type)
     - words_with_types: dict mapping word to set of types (for homonym matching)
-    """
-    words_set = set()
-    words_with_types = {}
-
-    deck_file = paths.DECK_FILE
-    try:
-        with open(deck_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Extract German words and word types from table
-            for line in content.split('\n'):
-                if line.startswith('|') and ('Reverse' in line or 'Cloze' in line):
-                    parts = [p.strip() for p in line.split('|')]
-                    if len(parts) >= 6:
-                        word_type = parts[3].strip()  # Word Type column
-                        german = parts[5]              # German column
-                        # Extract base word (remove cloze markers, take last word)
-                        german = german.replace('{{c1::', '').replace('{{c2::', '').replace('}}', '')
-                        german = german.split()[-1] if german else ''  # Last word (the actual vocabulary word)
-                        if german:
-                            word_lower = german.lower()
-                            # Add to word-only set
-                            words_set.add(word_lower)
-                            # Add to type-specific dict
-                            if word_type:
-                                if word_lower not in words_with_types:
-                                    words_with_types[word_lower] = set()
-                                words_with_types[word_lower].add(word_type)
-    except FileNotFoundError:
-        print(f"WARNING: {deck_file} not found")
-
-    return words_set, words_with_types
-
-def update_tracking_file():
-    """Update word_tracking.md with current status and audio info"""
-
-    print("Reading current word tracking...")
-
-    # Read existing tracking file
-    tracking_file = paths.WORD_TRACKING_FILE
-    with open(tracking_file, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    # Find table start
-    table_start = None
-    for i, line in enumerate(lines):
-        if line.startswith('| Word | Status |'):
-            table_start = i
-            break
-
-    if table_start is None:
-        print("ERROR: Could not find table header in word_tracking.md")
-        return
-
-    # Get words in deck
-    print("Checking deck status...")
-    words_set, words_with_types = read_words_in_deck()
-    print(f"Found {len(words_set)} unique words in deck")
 
-    # Process table rows
-    print("\nUpdating word tracking...")
-    today = datetime.now().strftime('%Y-%m-%d')
+    Both come from the shared deck index (deck_index.py) and are keyed by
+    normalized lemma and surface forms ("der Hund" → "der hund", "hund").
+    """
+    if not paths.DECK_FILE.exists():
+        print(f"WARNING: {paths.DECK_FILE} not found")
+    return deck_membership(load_deck_index())
 
-    stats = {
-        'in_deck': 0,
-        'pending': 0,
-        'missing_audio': 0,
-        'error': 0
-    }
+# Bump when the state layout changes; older state forces a full update
+STATE_VERSION = 1
 
-    updated_rows = []
-    header_line = lines[table_start]
-    separator_line = lines[table_start + 1]
+def load_state():
+    """Load the state of the last run (None if missing or outdated)"""
+    try:
+        with open(paths.WORD_TRACKING_STATE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+def save_state(state):
+    """Persist run state (write to temp file, then rename)"""
+    try:
+        with atomic_write(paths.WORD_TRACKING_STATE) as f:
+            json.dump(dict(state, version=STATE_VERSION), f, ensure_ascii=False)
+    except OSError:
+        pass  # State is an optimization only
+
+def file_signature(path):
+    """(size, mtime_ns) of a file, used to detect edits made outside this script"""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def deck_snapshot(words_set, words_with_types):
+    """Deck membership as {word key: sorted word types}"""
+    return {word: sorted(words_with_types.get(word, ())) for word in words_set}
+
+def audio_snapshot():
+    """Audio file lists per directory, straight from the audio index"""
+    audio_dirs = get_audio_dirs()
+    index = get_audio_index(audio_dirs)
+    return {dir_key: sorted(entry['files']) for dir_key, entry in index.items()}
+
+def changed_words(state, deck, audio):
+    """
+    Word keys whose deck membership or audio availability may have changed.
 
-    updated_rows.append(header_line)
-    updated_rows.append(separator_line)
+    Args:
+        state (dict): State of the last run
+        deck (dict): Current deck_snapshot()
+        audio (dict): Current audio_snapshot()
 
-    changes = []
+    Returns:
+        set: Changed deck/audio keys; get_rows() matches them against every
+             key of a row, so "sich freuen" is affected by a change to "freuen"
+    """
+    old_deck = state['deck']
+    changed = {w for w in old_deck.keys() | deck.keys() if old_deck.get(w) != deck.get(w)}
 
-    for i in range(table_start + 2, len(lines)):
-        line = lines[i].strip()
+    old_audio = state['audio']
+    for dir_key in old_audio.keys() | audio.keys():
+        added_or_removed = set(old_audio.get(dir_key, ())) ^ set(audio.get(dir_key, ()))
+        changed.update(word_key(Path(name).stem) for name in added_or_removed)
 
-        # Stop at end of table (empty line or stats section)
-        if not line or line == '---' or line.startswith('##'):
-            break
+    return changed
 
-        if not line.startswith('|'):
-            continue
+def evaluate_row(row, audio_file, words_set, words_with_types, today, changes):
+    """
+    Compute the updated row for one tracked word.
+
+    Args:
+        row (dict): Tracking store row
+        audio_file (str): Resolved audio filename, or None
+        words_set (set): Deck word keys
+        words_with_types (dict): Deck word key → set of word types
+        today (str): Date to record when a word enters the deck
+        changes (list): Change records are appended here
+                        ({'word', 'word_type', 'field', 'old', 'new', 'date_added'})
+
+    Returns:
+        dict: Updated copy of the row
+    """
+    word = row['word']
+    old_status = row['status']
+    old_audio = row['audio']
+    word_type = row['word_type']
+    date_added = row['date_added']
+
+    # Update audio
+    new_audio = format_audio(audio_file)
+
+    # Update status - two-tier matching strategy (lemma and phrase keys)
+    keys = word_keys(word)
+    is_in_deck = False
+
+    if word_type == '—' or not word_type.strip():
+        # No word type specified → match on word alone (backward compatibility)
+        is_in_deck = any(key in words_set for key in keys)
+    else:
+        # Word type specified → match on (word, type) for homonym safety
+        is_in_deck = any(word_type.strip() in words_with_types.get(key, ()) for key in keys)
+
+    if is_in_deck:
+        new_status = 'in_deck'
+        # If status changed to in_deck, update date
+        if old_status != 'in_deck' and date_added == '—':
+            date_added = today
+    else:
+        # Not in deck - check audio
+        if '✅' in new_audio:
+            new_status = 'pending'
+        elif old_status == 'error':
+            new_status = 'error'  # Preserve error status
+        else:
+            new_status = 'missing_audio'
+
+    # Track status and audio changes
+    change = {'word': word, 'word_type': word_type, 'date_added': date_added}
+    if old_status != new_status:
+        changes.append(dict(change, field='status', old=old_status, new=new_status))
+    if old_audio != new_audio:
+        changes.append(dict(change, field='audio', old=old_audio, new=new_audio))
+
+    return dict(row, status=new_status, audio=new_audio, date_added=date_added)
+
+def format_change(change):
+    """Human-readable line for a change record"""
+    if change['field'] == 'audio':
+        return f"  {change['word']}: audio {change['old']} → {change['new']}"
+    word_type = change['word_type']
+    type_label = f" ({word_type})" if word_type != '—' else ""
+    line = f"  {change['word']}{type_label}: {change['old']} → {change['new']}"
+    if change['new'] == 'in_deck' and change['date_added'] != '—':
+        line += f" (date: {change['date_added']})"
+    return line
+
+def change_report_file():
+    """Path of the JSON change report (next to the tracking file)"""
+    tracking_file = paths.WORD_TRACKING_FILE
+    return tracking_file.with_name(f"{tracking_file.stem}.changes.json")
 
-        # Parse row
-        parts = [p.strip() for p in line.split('|')]
-        if len(parts) < 8:
-            continue
+def build_report(changes, stats, mode, written):
+    """
+    Machine-readable summary of one run.
 
-        word = parts[1]
-        old_status = parts[2]
-        old_audio = parts[3]
-        ipa = parts[4]
-        word_type = parts[5]
-        date_added = parts[6]
-        notes = parts[7]
+    Args:
+        changes (list): Change records from evaluate_row()
+        stats (dict): Status counts after the run
+        mode (str): 'full', 'incremental' or 'unchanged' (fast path)
+        written (bool): Whether word_tracking.md was rewritten
 
-        # Update audio
-        new_audio = check_audio(word)
+    Returns:
+        dict: Report as written to change_report_file()
+    """
+    status_changes = [c for c in changes if c['field'] == 'status']
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'tracking_file': str(paths.WORD_TRACKING_FILE),
+        'mode': mode,
+        'changed': bool(changes),
+        'written': written,
+        'status_changes': [
+            {'word': c['word'], 'word_type': c['word_type'], 'from': c['old'], 'to': c['new']}
+            for c in status_changes
+        ],
+        'audio_changes': [
+            {'word': c['word'], 'from': audio_filename(c['old']), 'to': audio_filename(c['new'])}
+            for c in changes if c['field'] == 'audio'
+        ],
+        'new_in_deck': [
+            {'word': c['word'], 'word_type': c['word_type'], 'date_added': c['date_added']}
+            for c in status_changes if c['new'] == 'in_deck'
+        ],
+        'totals': dict(stats, total=sum(stats.values())),
+    }
 
-        # Update status - two-tier matching strategy
-        word_lower = word.lower()
-        is_in_deck = False
+def write_report(report):
+    """Write the change report (temp file + rename, so readers never see half a report)"""
+    with atomic_write(change_report_file()) as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write('\n')
 
-        if word_type == '—' or not word_type.strip():
-            # No word type specified → match on word alone (backward compatibility)
-            is_in_deck = word_lower in words_set
-        else:
-            # Word type specified → match on (word, type) for homonym safety
-            is_in_deck = (word_lower in words_with_types and
-                         word_type.strip() in words_with_types[word_lower])
-
-        if is_in_deck:
-            new_status = 'in_deck'
-            # If status changed to in_deck, update date
-            if old_status != 'in_deck' and date_added == '—':
-                date_added = today
-                type_label = f" ({word_type})" if word_type != '—' else ""
-                changes.append(f"  {word}{type_label}: {old_status} → in_deck (date: {today})")
-            elif old_status != 'in_deck':
-                type_label = f" ({word_type})" if word_type != '—' else ""
-                changes.append(f"  {word}{type_label}: {old_status} → in_deck")
-        else:
-            # Not in deck - check audio
-            if '✅' in new_audio:
-                new_status = 'pending'
-            elif old_status == 'error':
-                new_status = 'error'  # Preserve error status
-            else:
-                new_status = 'missing_audio'
-
-        # Track audio changes
-        if old_audio != new_audio:
-            changes.append(f"  {word}: audio {old_audio} → {new_audio}")
-
-        # Update stats
-        stats[new_status] = stats.get(new_status, 0) + 1
-
-        # Write updated row
-        updated_rows.append(f"| {word} | {new_status} | {new_audio} | {ipa} | {word_type} | {date_added} | {notes} |\n")
-
-    # Write file
-    print(f"\nWriting updated tracking file...")
-
-    with open(tracking_file, 'w', encoding='utf-8') as f:
-        # Write header section (everything before table)
-        for line in lines[:table_start]:
-            f.write(line)
-
-        # Write updated table
-        for row in updated_rows:
-            f.write(row)
-
-        # Write statistics
-        f.write("\n---\n\n")
-        f.write("## Statistics\n\n")
-        total = sum(stats.values())
-        f.write(f"- **Total words:** {total}\n")
-        f.write(f"- **In deck:** {stats['in_deck']}\n")
-        f.write(f"- **Pending (with audio):** {stats['pending']}\n")
-        f.write(f"- **Missing audio:** {stats['missing_audio']}\n")
-        if stats['error'] > 0:
-            f.write(f"- **Error:** {stats['error']}\n")
-        f.write(f"- **Ready to process:** {stats['pending']}\n")
-
-    # Print summary
+def print_summary(stats, changes, written):
+    """Print the stats block and the list of changes"""
     print("\n" + "="*60)
-    print("WORD TRACKING UPDATED")
+    print("WORD TRACKING UPDATED" if written else "WORD TRACKING UP TO DATE")
     print("="*60)
-    print(f"Total words: {total}")
+    print(f"Total words: {sum(stats.values())}")
     print(f"In deck: {stats['in_deck']}")
     print(f"Pending (with audio): {stats['pending']}")
     print(f"Missing audio: {stats['missing_audio']}")
@@ -220,11 +271,120 @@ def update_tracking_file():
     if changes:
         print("\nChanges made:")
         for change in changes:
-            print(change)
+            print(format_change(change))
     else:
         print("\nNo changes detected")
 
     print("="*60)
 
+def update_tracking_file(full=False):
+    """
+    Update word tracking with current status and audio info.
+
+    Rows are read from and written to the tracking store; word_tracking.md
+    is re-rendered from it afterwards. The tracking file is locked for the
+    whole run, so concurrent batches cannot overwrite each other's updates.
+
+    Args:
+        full (bool): Re-evaluate every row even if the last run's state is valid
+
+    Returns:
+        dict: Change report (see build_report), also written to
+              change_report_file(); None if the tracking file could not be read
+    """
+    with file_lock(paths.WORD_TRACKING_FILE):
+        return _update_tracking_file(full)
+
+def _update_tracking_file(full):
+    """update_tracking_file() body, called with the tracking file locked"""
+
+    # Get words in deck and current audio file lists
+    print("Checking deck status...")
+    words_set, words_with_types = read_words_in_deck()
+    print(f"Found {len(words_set)} unique words in deck")
+
+    tracking_file = paths.WORD_TRACKING_FILE
+    deck = deck_snapshot(words_set, words_with_types)
+    audio_files = audio_snapshot()
+
+    # Decide which words need re-evaluation
+    state = None if full else load_state()
+    if state is not None and state.get('tracking') != file_signature(tracking_file):
+        state = None  # Tracking file was edited since the last run
+    affected = None if state is None else changed_words(state, deck, audio_files)
+
+    if affected is not None and not affected:
+        # Fast path: nothing that could change a row has changed
+        report = build_report([], state['stats'], 'unchanged', written=False)
+        write_report(report)
+        print_summary(state['stats'], [], written=False)
+        return report
+
+    print("Reading current word tracking...")
+    try:
+        conn = open_store()
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return None
+
+    # Process table rows
+    if affected is None:
+        print("\nUpdating word tracking (full)...")
+    else:
+        print(f"\nUpdating word tracking ({len(affected)} changed words)...")
+    today = datetime.now().strftime('%Y-%m-%d')
+
+    # Only affected rows are re-evaluated (indexed lookup by word key)
+    rows = get_rows(conn, affected)
+
+    # Resolve audio for the re-evaluated words in one batch
+    audio = lookup_audio_batch(row['word'] for row in rows)
+    print(f"Audio found for {len(audio['found'])} words, missing for {len(audio['missing'])}")
+    for description, hits in audio['by_dir'].items():
+        print(f"  {description}: {hits}")
+
+    changes = []
+    updated = []
+    for row in rows:
+        new_row = evaluate_row(row, audio['found'].get(row['word']),
+                               words_set, words_with_types, today, changes)
+        if new_row != row:
+            updated.append(new_row)
+    update_rows(conn, updated)
+
+    # Write file only if something changed
+    stats = count_statuses(conn)
+    written = write_markdown(conn)
+    conn.close()
+    if written:
+        print(f"\nWrote updated tracking file ({len(updated)} rows changed)")
+
+    save_state({
+        'tracking': file_signature(tracking_file),
+        'deck': deck,
+        'audio': audio_files,
+        'stats': stats,
+    })
+
+    report = build_report(changes, stats, 'full' if affected is None else 'incremental', written)
+    write_report(report)
+    print_summary(stats, changes, written)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Update word_tracking.md from deck and audio status")
+    parser.add_argument('--full', action='store_true',
+                        help='Re-evaluate every row instead of only words affected by changes')
+    parser.add_argument('--exit-code', action='store_true',
+                        help=f'Exit with status {EXIT_NO_CHANGES} if no row changed')
+    args = parser.parse_args()
+
+    report = update_tracking_file(full=args.full)
+    if report is None:
+        return 1
+    if args.exit_code and not report['changed']:
+        return EXIT_NO_CHANGES
+    return 0
+
 if __name__ == '__main__':
-    update_tracking_file()
+    sys.exit(main())
@@ -4,9 +4,23 @@ Validate unpacked deck against source MD file
 
 Usage:
     python3 validate_deck.py
-    # Reads: temp/deck_data.json + german_vocabulary_b1.md
+    python3 validate_deck.py --input temp/deck_data.jsonl.zst
+    python3 validate_deck.py --apkg german_vocabulary_b1.apkg   # no unpack step
+    # Reads: temp/deck_data.json (or .jsonl / .jsonl.zst, the newest one)
+    #        + german_vocabulary_b1.md
     # Outputs: temp/validation_report_YYYY-MM-DD_HH-MM.md
 
+Deck notes are read once; IDs are counted as they stream in and the
+per-card rules (registered with @rule) run over chunks of notes, in this
+process by default; --workers N opts into a process pool (the rules are
+cheap, so pickling the chunks usually costs more than it saves). Only IDs, orphans and issues are kept, so JSONL
+input is validated in flat memory.
+With --apkg the notes go through unpack_deck's unpack cache: the first run
+for a package version validates them straight from the package while the
+cached JSONL is written alongside, later runs stream the cached JSONL;
+deck_data.* is then not needed (unpack_deck.py still writes it when the intermediate
+file is wanted for inspection).
+
 Validation checks:
 1. Orphaned cards (in deck, not in MD source)
 2. Missing cards (in MD, not in deck)
@@ -14,20 +28,29 @@ Validation checks:
 4. Empty required fields
 5. Invalid cloze syntax
 6. Duplicate IDs
+7. Audio referenced in source but missing from the media library
+8. Duplicate words (same lemma, word type and card type on several cards)
 """
 
-import json
+import argparse
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from datetime import datetime
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # Add project root to Python path
 PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 import paths
+from flashcards.scripts.deck_index import duplicate_lemmas, load_deck_index
+from flashcards.scripts.file_utils import atomic_write
+from flashcards.scripts.audio_checker import find_audio_paths
+from flashcards.scripts.media_manifest import format_mb, load_manifest, media_usage
+from flashcards.scripts.unpack_deck import OUTPUT_FORMATS, open_cached, read_deck_data
 
 # Configuration
 TEMP_DIR = PROJECT_ROOT / 'temp'
@@ -36,20 +59,36 @@ MD_SOURCE_FILE = paths.DECK_FILE
 timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M')
 REPORT_FILE = TEMP_DIR / f'validation_report_{timestamp}.md'
 
-def load_deck_data():
-    """Load unpacked deck data from JSON"""
-    print(f"Loading deck data: {DECK_DATA_FILE}")
+# Unpack cache format used for --apkg (streamed, no optional dependency)
+APKG_CACHE_FORMAT = 'jsonl'
+
+def find_deck_data():
+    """Newest unpacked deck data file (any unpack_deck.py output format), or None"""
+    candidates = [DECK_DATA_FILE] + [
+        DECK_DATA_FILE.with_name(f"{DECK_DATA_FILE.stem}.{fmt}") for fmt in OUTPUT_FORMATS if fmt != 'json'
+    ]
+    existing = [path for path in candidates if path.exists()]
+    return max(existing, key=lambda path: path.stat().st_mtime_ns) if existing else None
+
+def load_deck_data(path=None):
+    """
+    Open unpacked deck data.
 
-    if not DECK_DATA_FILE.exists():
-        print(f"❌ ERROR: Deck data not found: {DECK_DATA_FILE}")
+    Args:
+        path (Path): Deck data file (default: find_deck_data())
+
+    Returns:
+        tuple: (header dict, iterator of deck notes)
+    """
+    path = Path(path) if path else find_deck_data()
+    print(f"Loading deck data: {path or DECK_DATA_FILE}")
+
+    if path is None or not path.exists():
+        print(f"❌ ERROR: Deck data not found: {path or DECK_DATA_FILE}")
         print("Run unpack_deck.py first!")
         sys.exit(1)
 
-    with open(DECK_DATA_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
-    print(f"✅ Loaded {data['total_cards']} cards from deck")
-    return data
+    return read_deck_data(path)
 
 def parse_md_source():
     """Parse the markdown source file and extract card IDs"""
@@ -111,14 +150,55 @@ def parse_md_source():
     print(f"✅ Found {len(md_ids)} unique card IDs in source")
     return md_ids, md_cards
 
+# Precompiled patterns for the per-note rules
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+CLOZE_PATTERN = re.compile(r'\{\{c\d+::.+?\}\}')
+
+# Notes per chunk handed to a worker process
+CHUNK_SIZE = 500
+
+# Registered per-note rules, in report order (see rule())
+RULES = []
+
+def rule(issue_key, fields=None, models=None, detail='message'):
+    """
+    Register a per-note check.
+
+    The check gets one deck note and returns None (no issue) or the issue
+    detail. It only runs on notes that have at least one of `fields` and
+    whose model name contains one of `models` (None: no restriction), so
+    new checks ride along in the single pass over the deck.
+
+    Args:
+        issue_key (str): Key in validation_issues the issues are collected under
+        fields (list): Note fields the rule needs
+        models (list): Model name substrings the rule applies to
+        detail (str): Key of the issue detail in each record ('message' or 'issues')
+    """
+    def register(check):
+        RULES.append({
+            'name': check.__name__,
+            'issue_key': issue_key,
+            'fields': tuple(fields) if fields else None,
+            'models': tuple(models) if models else None,
+            'detail': detail,
+            'check': check,
+        })
+        return check
+    return register
+
+def rules_for(model_name, field_names):
+    """Registered rules that apply to notes of one model with the given fields"""
+    return [
+        r for r in RULES
+        if (r['models'] is None or any(m in model_name for m in r['models']))
+        and (r['fields'] is None or any(f in field_names for f in r['fields']))
+    ]
+
+@rule('gender_mismatches', fields=['Article'])
 def validate_gender_article(card):
     """Check if gender matches article in noun cards"""
     fields = card['fields']
-
-    # Only check cards with Article field
-    if 'Article' not in fields:
-        return None
-
     article = fields.get('Article', '').strip().lower()
     gender = fields.get('Gender', '').strip().lower()
 
@@ -138,6 +218,7 @@ def validate_gender_article(card):
 
     return None
 
+@rule('empty_fields', fields=['Example_DE', 'Example_RU', 'Notes'], detail='issues')
 def validate_empty_fields(card):
     """Check for empty required fields"""
     fields = card['fields']
@@ -150,17 +231,15 @@ def validate_empty_fields(card):
         if field_name in fields:
             value = fields[field_name].strip()
             # Remove HTML tags for checking
-            value_clean = re.sub(r'<[^>]+>', '', value)
+            value_clean = HTML_TAG_PATTERN.sub('', value)
             if not value_clean or value_clean == '—':
                 issues.append(f"Empty field: {field_name}")
 
     return issues if issues else None
 
+@rule('cloze_errors', models=['Cloze'])
 def validate_cloze_syntax(card):
     """Validate cloze deletion syntax"""
-    if 'Cloze' not in card['model_name']:
-        return None
-
     fields = card['fields']
 
     # Find cloze field
@@ -174,12 +253,12 @@ def validate_cloze_syntax(card):
         return "No cloze syntax found in cloze card"
 
     # Check for valid cloze syntax
-    if not re.search(r'\{\{c\d+::.+?\}\}', cloze_field):
+    if not CLOZE_PATTERN.search(cloze_field):
         return f"Invalid cloze syntax: {cloze_field[:50]}..."
 
     return None
 
-def generate_report(deck_data, md_ids, md_cards, orphaned, missing, validation_issues):
+def generate_report(total_cards, md_ids, md_cards, orphaned, missing, validation_issues):
     """Generate markdown validation report"""
     print(f"Generating report: {REPORT_FILE}")
 
@@ -190,10 +269,14 @@ def generate_report(deck_data, md_ids, md_cards, orphaned, missing, validation_i
 
     # Summary
     lines.append("## Summary")
-    lines.append(f"- **Cards in deck:** {deck_data['total_cards']}")
+    lines.append(f"- **Cards in deck:** {total_cards}")
     lines.append(f"- **Unique IDs in source MD:** {len(md_ids)}")
     lines.append(f"- **Orphaned cards** (in deck, not in MD): **{len(orphaned)}**")
     lines.append(f"- **Missing cards** (in MD, not in deck): **{len(missing)}**")
+    if 'media' in validation_issues:
+        media = validation_issues['media']
+        lines.append(f"- **Audio referenced in MD:** {media['files'] + len(media['missing'])} files "
+                     f"({format_mb(media['bytes'])}, {media['duration'] / 60:.1f} min)")
     lines.append("")
 
     # Orphaned cards (main use case)
@@ -300,6 +383,21 @@ def generate_report(deck_data, md_ids, md_cards, orphaned, missing, validation_i
         lines.append("No duplicate IDs found.")
         lines.append("")
 
+    # Duplicate words (homonyms with the same word type need a review)
+    if validation_issues.get('duplicate_words'):
+        lines.append("### ⚠️ Duplicate Words")
+        lines.append("")
+        lines.append("Same lemma, word type and card type on several cards (intended homonyms are fine):")
+        lines.append("")
+        for (lemma, word_type, card_type), card_ids in validation_issues['duplicate_words'].items():
+            ids = ', '.join(f"`{card_id}`" for card_id in card_ids)
+            lines.append(f"- **{lemma}** ({word_type}, {card_type}): {ids}")
+        lines.append("")
+    else:
+        lines.append("### ✅ Duplicate Words")
+        lines.append("No word appears twice with the same word type and card type.")
+        lines.append("")
+
     # Gender/Article mismatches
     if 'gender_mismatches' in validation_issues and validation_issues['gender_mismatches']:
         lines.append("### ❌ Gender/Article Mismatches")
@@ -336,102 +434,189 @@ def generate_report(deck_data, md_ids, md_cards, orphaned, missing, validation_i
         lines.append("All cloze cards have valid syntax.")
         lines.append("")
 
+    # Missing audio files
+    if 'media' in validation_issues and validation_issues['media']['missing']:
+        lines.append("### ❌ Missing Audio Files")
+        lines.append("")
+        for filename in validation_issues['media']['missing']:
+            lines.append(f"- `{filename}`")
+        lines.append("")
+    else:
+        lines.append("### ✅ Audio Files")
+        lines.append("All audio referenced in source MD exists in the media library.")
+        lines.append("")
+
     # Write report
-    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+    with atomic_write(REPORT_FILE) as f:
         f.write('\n'.join(lines))
 
     print(f"✅ Report generated: {REPORT_FILE}")
 
+def check_chunk(cards):
+    """
+    Run the registered rules over a chunk of deck notes.
+
+    Rule selection is resolved once per model and field set, not per note.
+
+    Returns:
+        dict: {issue key: [issue records in note order]}
+    """
+    issues = defaultdict(list)
+    applicable = {}
+    for card in cards:
+        fields = card['fields']
+        dispatch_key = (card['model_name'], tuple(fields))
+        if dispatch_key not in applicable:
+            applicable[dispatch_key] = rules_for(card['model_name'], fields)
+        for r in applicable[dispatch_key]:
+            detail = r['check'](card)
+            if detail:
+                issues[r['issue_key']].append({'guid': card['guid'], r['detail']: detail})
+    return dict(issues)
+
+def check_deck_notes(deck_notes, md_ids, workers=1, chunk_size=CHUNK_SIZE):
+    """
+    One pass over the deck: IDs, duplicate IDs and per-card rules.
+
+    IDs are counted as notes are read; the rules run over chunks of
+    chunk_size notes, in this process unless workers > 1 asks for a process
+    pool (started once the deck is larger than one chunk). Chunk results are merged in deck order, so the issues are the
+    same for any number of workers. Only notes not in the MD source
+    (orphans) and a bounded number of chunks in flight are kept.
+
+    Args:
+        deck_notes (iterable): Deck notes (from load_deck_data() or read_deck_data())
+        md_ids (set): Card IDs in the MD source
+        workers (int): Worker processes (default 1: no pool - serial is faster
+                       for these rules on decks of tens of thousands of notes)
+        chunk_size (int): Notes per chunk
+
+    Returns:
+        tuple: (total notes, {guid: count}, {guid: orphaned note}, validation_issues)
+    """
+    workers = workers or 1
+    validation_issues = {'duplicate_ids': {}}
+    for r in RULES:
+        validation_issues.setdefault(r['issue_key'], [])
+    id_counts = defaultdict(int)
+    orphaned_by_id = {}
+    total_cards = 0
+
+    def merge(chunk_issues):
+        for issue_key, records in chunk_issues.items():
+            validation_issues[issue_key].extend(records)
+
+    pool = None
+    in_flight = deque()
+    chunk = []
+    try:
+        for card in deck_notes:
+            total_cards += 1
+            guid = card['guid']
+            id_counts[guid] += 1
+            if guid not in md_ids:
+                orphaned_by_id[guid] = card
+            chunk.append(card)
+            if len(chunk) < chunk_size:
+                continue
+
+            if workers <= 1:
+                merge(check_chunk(chunk))
+            else:
+                if pool is None:
+                    pool = ProcessPoolExecutor(max_workers=workers)
+                in_flight.append(pool.submit(check_chunk, chunk))
+                # Bound memory: wait for the oldest chunk (keeps deck order)
+                if len(in_flight) >= 2 * workers:
+                    merge(in_flight.popleft().result())
+            chunk = []
+
+        while in_flight:
+            merge(in_flight.popleft().result())
+        if chunk:
+            merge(check_chunk(chunk))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    for guid, count in id_counts.items():
+        if count > 1:
+            validation_issues['duplicate_ids'][guid] = count
+
+    return total_cards, id_counts, orphaned_by_id, validation_issues
+
 def main():
+    parser = argparse.ArgumentParser(description="Validate an unpacked deck against the source MD file")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--input', default=None,
+                        help='deck_data.json / .jsonl / .jsonl.zst (default: newest in temp/)')
+    source.add_argument('--apkg', default=None,
+                        help='Read notes straight from an .apkg (no unpack_deck.py run needed)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processes running the per-card rules (default: 1, no pool)')
+    args = parser.parse_args()
+
     print("=" * 70)
     print("DECK VALIDATOR")
     print("=" * 70)
     print(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
 
-    # Load deck data
-    deck_data = load_deck_data()
-    print()
-
     # Load source MD
     md_ids, md_cards = parse_md_source()
     print()
 
-    # Extract deck IDs (GUIDs)
-    deck_ids = set()
-    deck_cards_by_id = {}
+    # Read deck notes lazily, from the package or from unpacked deck data
+    if args.apkg:
+        apkg_path = Path(args.apkg)
+        if not apkg_path.exists():
+            print(f"❌ ERROR: File not found: {apkg_path}")
+            sys.exit(1)
+        # Cache hit: the cached JSONL is streamed; miss: notes come straight
+        # from the package and fill the cache as they are validated
+        deck_source = open_cached(apkg_path, APKG_CACHE_FORMAT)
+    else:
+        deck_source = nullcontext(load_deck_data(args.input))
 
-    for card in deck_data['cards']:
-        guid = card['guid']
-        deck_ids.add(guid)
-        deck_cards_by_id[guid] = card
+    print()
+    print("Running validation checks...")
+    with deck_source as (_, deck_notes):
+        total_cards, id_counts, orphaned_by_id, validation_issues = check_deck_notes(deck_notes, md_ids, args.workers)
 
-    print(f"Unique card IDs in deck: {len(deck_ids)}")
+    print(f"✅ Read {total_cards} cards from deck")
+    print(f"Unique card IDs in deck: {len(id_counts)}")
     print()
 
     # Find orphaned and missing cards
     print("Analyzing differences...")
-    orphaned_ids = deck_ids - md_ids
-    missing_ids = md_ids - deck_ids
-
-    orphaned_cards = [deck_cards_by_id[guid] for guid in orphaned_ids]
-    orphaned_cards.sort(key=lambda c: c['guid'])  # Sort by ID for consistent output
+    missing_ids = md_ids - id_counts.keys()
+    orphaned_cards = sorted(orphaned_by_id.values(), key=lambda c: c['guid'])  # Sort by ID for consistent output
 
-    print(f"Orphaned cards (in deck, not in MD): {len(orphaned_ids)}")
+    print(f"Orphaned cards (in deck, not in MD): {len(orphaned_cards)}")
     print(f"Missing cards (in MD, not in deck): {len(missing_ids)}")
     print()
 
-    # Run validation checks
-    print("Running validation checks...")
-    validation_issues = {
-        'duplicate_ids': {},
-        'gender_mismatches': [],
-        'empty_fields': [],
-        'cloze_errors': []
+    # Check referenced audio against the audio index; sizes and durations
+    # come from the stored media manifest (nothing is stat'ed or hashed here)
+    audio_refs = {c['Audio'] for c in md_cards.values() if c['Audio'] and c['Audio'] != '—'}
+    audio_paths = find_audio_paths(audio_refs)
+    media = media_usage(load_manifest(), audio_paths)
+    media['files'] = len(audio_paths)
+    media['missing'] = sorted(audio_refs - audio_paths.keys())
+    validation_issues['media'] = media
+
+    # Check for duplicate words via the shared deck index
+    deck_index = load_deck_index(MD_SOURCE_FILE)
+    validation_issues['duplicate_words'] = {
+        (deck_index['cards'][ids[0]]['lemma'], word_type, card_type): ids
+        for (_, word_type, card_type), ids in sorted(duplicate_lemmas(deck_index).items())
     }
 
-    # Check for duplicate IDs
-    id_counts = defaultdict(int)
-    for card in deck_data['cards']:
-        id_counts[card['guid']] += 1
-
-    for guid, count in id_counts.items():
-        if count > 1:
-            validation_issues['duplicate_ids'][guid] = count
-
-    # Validate each card
-    for card in deck_data['cards']:
-        guid = card['guid']
-
-        # Gender/article check
-        gender_issue = validate_gender_article(card)
-        if gender_issue:
-            validation_issues['gender_mismatches'].append({
-                'guid': guid,
-                'message': gender_issue
-            })
-
-        # Empty fields check
-        empty_issue = validate_empty_fields(card)
-        if empty_issue:
-            validation_issues['empty_fields'].append({
-                'guid': guid,
-                'issues': empty_issue
-            })
-
-        # Cloze syntax check
-        cloze_issue = validate_cloze_syntax(card)
-        if cloze_issue:
-            validation_issues['cloze_errors'].append({
-                'guid': guid,
-                'message': cloze_issue
-            })
-
     print("✅ Validation complete")
     print()
 
     # Generate report
-    generate_report(deck_data, md_ids, md_cards, orphaned_cards, missing_ids, validation_issues)
+    generate_report(total_cards, md_ids, md_cards, orphaned_cards, missing_ids, validation_issues)
 
     print()
     print("=" * 70)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Word normalization shared by the audio index and the deck/tracking matchers.
+
+German words reach the scripts in several spellings of the same thing:
+NFD vs NFC umlauts ("Büro" vs "Büro"), different casing
+and ASCII transliterations ("Maenner" for "Männer", "Strasse" for "Straße").
+All matchers build their index keys with these functions once, at index
+build time, so lookups stay exact dictionary hits instead of fuzzy
+comparisons.
+
+normalize_word() keeps "ß" ("Maße" and "Masse" are different words); only
+the optional transliteration folds it to "ss".
+
+Usage:
+    from flashcards.scripts.word_normalization import normalize_word, word_key
+
+    normalize_word("MÄNNER") == normalize_word("Männer")    # 'männer'
+    word_key("Maenner") == word_key("Männer")              # 'maenner'
+"""
+
+import unicodedata
+
+# ASCII transliteration applied after lowercasing
+TRANSLITERATION = str.maketrans({
+    'ä': 'ae',
+    'ö': 'oe',
+    'ü': 'ue',
+    'ß': 'ss',
+})
+
+def normalize_word(word):
+    """
+    Normalize a word for comparison: NFC, lowercase, strip whitespace.
+
+    Uses lower(), not casefold(): casefold() maps "ß" to "ss" and would make
+    "Maße" and "Masse" compare equal.
+
+    Args:
+        word (str): Word as typed (any Unicode normal form, any casing)
+
+    Returns:
+        str: Normalized comparison key
+    """
+    if not word:
+        return ''
+    return unicodedata.normalize('NFC', word).strip().lower()
+
+def transliterate_word(word):
+    """
+    ASCII-fold an already normalized word (ä → ae, ö → oe, ü → ue, ß → ss).
+
+    Args:
+        word (str): Output of normalize_word()
+
+    Returns:
+        str: Transliterated key
+    """
+    return word.translate(TRANSLITERATION)
+
+def word_key(word, transliterate=True):
+    """
+    Build the lookup key for a word.
+
+    Args:
+        word (str): Word as typed
+        transliterate (bool): Also fold umlauts and ß, so "Maenner" matches "Männer"
+
+    Returns:
+        str: Key to use in (and to look up from) word indexes
+    """
+    key = normalize_word(word)
+    return transliterate_word(key) if transliterate else key
@@ -14,7 +14,20 @@ FLASHCARDS_SCRIPTS = FLASHCARDS_DIR / "scripts"
 
 VOCABULARY_DIR = PROJECT_ROOT / "vocabulary"
 
+TEMP_DIR = PROJECT_ROOT / "temp"
+
 # Common files
 DECK_FILE = FLASHCARDS_DIR / "german_vocabulary_b1.md"
 WORD_TRACKING_FILE = FLASHCARDS_DIR / "word_tracking.md"
 CLEANED_WORDS_FILE = VOCABULARY_DIR / "cleaned_german_words.md"
+DELETED_CARD_IDS_FILE = FLASHCARDS_DIR / "deleted_card_ids.md"
+CARD_QUEUE_DB = FLASHCARDS_SCRIPTS / "card_queue.db"
+
+# Cache files (regenerated on demand, safe to delete)
+AUDIO_INDEX_CACHE = TEMP_DIR / "audio_index.json"
+AUDIO_INTEGRITY_CACHE = TEMP_DIR / "audio_integrity.json"
+MEDIA_MANIFEST_FILE = TEMP_DIR / "media_manifest.json"
+WORD_TRACKING_STATE = TEMP_DIR / "word_tracking_state.json"
+WORD_TRACKING_DB = TEMP_DIR / "word_tracking.db"
+DECK_INDEX_CACHE = TEMP_DIR / "deck_index.json"
+UNPACK_CACHE_DIR = TEMP_DIR / "unpack_cache"
@@ -29,3 +29,19 @@ def fake_genanki(monkeypatch):
     # Provide minimal attributes if needed by create_note_models (not used in tests)
     monkeypatch.setitem(sys.modules, "genanki", fake)
     return fake
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch, tmp_path):
+    """Keep on-disk caches out of the project temp/ directory during tests."""
+    import paths
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(paths, "AUDIO_INDEX_CACHE", cache_dir / "audio_index.json", raising=False)
+    monkeypatch.setattr(paths, "AUDIO_INTEGRITY_CACHE", cache_dir / "audio_integrity.json", raising=False)
+    monkeypatch.setattr(paths, "MEDIA_MANIFEST_FILE", cache_dir / "media_manifest.json", raising=False)
+    monkeypatch.setattr(paths, "WORD_TRACKING_STATE", cache_dir / "word_tracking_state.json", raising=False)
+    monkeypatch.setattr(paths, "WORD_TRACKING_DB", cache_dir / "word_tracking.db", raising=False)
+    monkeypatch.setattr(paths, "DECK_INDEX_CACHE", cache_dir / "deck_index.json", raising=False)
+    monkeypatch.setattr(paths, "UNPACK_CACHE_DIR", cache_dir / "unpack_cache", raising=False)
+    monkeypatch.setattr(paths, "CARD_QUEUE_DB", cache_dir / "card_queue.db", raising=False)
+    return cache_dir
@@ -0,0 +1,188 @@
+"""Tests for audio_checker.py lookups and the persistent audio index.
+
+Covers:
+- Priority order (generated WAV before Duolingo MP3) and case-insensitive matching
+- Index cache written to paths.AUDIO_INDEX_CACHE and reused across processes
+- Incremental updates when files are added or removed
+- Batch lookups with per-directory hit statistics (sequential and thread pool)
+- Unicode-normalized and umlaut-transliterated matching
+- Exact filenames before fuzzy matches across all directories (Masse/Maße)
+"""
+
+import importlib
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture
+def audio_dirs(tmp_path, monkeypatch):
+    import paths
+
+    generated = tmp_path / "generated_audio"
+    duolingo = tmp_path / "words_from_duolingo"
+    generated.mkdir()
+    duolingo.mkdir()
+    (generated / "Tisch.wav").write_bytes(b"RIFF")
+    (duolingo / "Tisch.mp3").write_bytes(b"ID3")
+    (duolingo / "Sehr.mp3").write_bytes(b"ID3")
+    (duolingo / "frau.mp3").write_bytes(b"ID3")
+
+    monkeypatch.setattr(paths, "AUDIO_GENERATED", generated, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_DUOLINGO", duolingo, raising=False)
+
+    mod = importlib.import_module("flashcards.scripts.audio_checker")
+    # Start every test from a cold process-level index
+    monkeypatch.setattr(mod, "_audio_index", {})
+    monkeypatch.setattr(mod, "_cache_loaded", False)
+    return mod, generated, duolingo
+
+
+def age_directory(path: Path):
+    """Push directory mtime into the past so the cache entry is not racy."""
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - 10 * 1_000_000_000))
+
+
+def test_check_audio_priority_and_casing(audio_dirs):
+    mod, _, _ = audio_dirs
+
+    assert mod.check_audio("Tisch") == "Tisch.wav"   # WAV wins over MP3
+    assert mod.check_audio("sehr") == "Sehr.mp3"     # Capitalized file
+    assert mod.check_audio("Frau") == "frau.mp3"     # Lowercase file
+    assert mod.check_audio("Baum") is None
+    assert mod.check_audio("") is None
+    assert mod.get_audio_field("sehr") == "[sound:Sehr.mp3]"
+
+
+def test_index_cache_persisted_and_reused(audio_dirs, monkeypatch):
+    import paths
+    mod, generated, duolingo = audio_dirs
+    age_directory(generated)
+    age_directory(duolingo)
+
+    assert mod.check_audio("Tisch") == "Tisch.wav"
+
+    cache = json.loads(paths.AUDIO_INDEX_CACHE.read_text(encoding="utf-8"))
+    assert cache["version"] == mod.INDEX_CACHE_VERSION
+    entry = cache["dirs"][str(duolingo)]
+    assert entry["keys"]["sehr"] == "Sehr.mp3"
+    assert entry["mtime_ns"] == duolingo.stat().st_mtime_ns
+
+    # New "process": directories unchanged, so nothing may be re-listed
+    monkeypatch.setattr(mod, "_audio_index", {})
+    monkeypatch.setattr(mod, "_cache_loaded", False)
+
+    def fail_scan(*args):
+        raise AssertionError("directory was rescanned")
+
+    monkeypatch.setattr(mod, "_scan_directory", fail_scan)
+    assert mod.check_audio("sehr") == "Sehr.mp3"
+
+
+def test_index_updates_incrementally(audio_dirs):
+    mod, generated, duolingo = audio_dirs
+    age_directory(generated)
+    age_directory(duolingo)
+
+    assert mod.check_audio("Baum") is None
+    assert mod.find_audio_path("Sehr.mp3") == duolingo / "Sehr.mp3"
+
+    (generated / "Baum.wav").write_bytes(b"RIFF")
+    (duolingo / "Sehr.mp3").unlink()
+
+    assert mod.check_audio("Baum") == "Baum.wav"
+    assert mod.check_audio("sehr") is None
+    assert mod.find_audio_path("Sehr.mp3") is None
+    assert mod.find_audio_path("Baum.wav") == generated / "Baum.wav"
+
+
+def test_lookup_audio_batch(audio_dirs, monkeypatch):
+    mod, _, _ = audio_dirs
+
+    calls = []
+    real_get_index = mod.get_audio_index
+    monkeypatch.setattr(mod, "get_audio_index", lambda *a: calls.append(a) or real_get_index(*a))
+
+    result = mod.lookup_audio_batch(["Tisch", "sehr", "Baum", "Tisch", "", "Frau"])
+
+    assert len(calls) == 1  # Index revalidated once per batch, not per word
+    assert result["found"] == {"Tisch": "Tisch.wav", "sehr": "Sehr.mp3", "Frau": "frau.mp3"}
+    assert result["missing"] == ["Baum", ""]
+    assert result["by_dir"] == {"Generated (Piper TTS)": 1, "Legacy (Duolingo)": 2}
+
+    report = mod.check_multiple_words(["Tisch", "Baum"])
+    assert report["found"] == [("Tisch", "Tisch.wav")]
+    assert report["missing"] == ["Baum"]
+
+
+def test_normalized_and_transliterated_matching(audio_dirs):
+    import unicodedata
+    mod, generated, duolingo = audio_dirs
+
+    # NFD filename (as written by macOS) and an "ß" spelling
+    (generated / unicodedata.normalize("NFD", "Männer.wav")).write_bytes(b"RIFF")
+    (duolingo / "Straße.mp3").write_bytes(b"ID3")
+    nfd_name = unicodedata.normalize("NFD", "Männer.wav")
+
+    assert mod.check_audio("Männer") == nfd_name        # NFC input, NFD file
+    assert mod.check_audio("MÄNNER") == nfd_name
+    assert mod.check_audio("Strasse") == "Straße.mp3"   # transliteration maps ß → ss
+    assert mod.check_audio("Maenner") == nfd_name       # umlaut transliteration
+
+    result = mod.lookup_audio_batch(["Maenner", "Männer"], transliterate=False)
+    assert result["found"] == {"Männer": nfd_name}
+    assert result["missing"] == ["Maenner"]
+
+
+def test_word_key():
+    from flashcards.scripts.word_normalization import normalize_word, word_key
+
+    assert normalize_word(" Straße ") == "straße"
+    assert normalize_word("Maße") != normalize_word("Masse")
+    assert word_key("Straße") == word_key("STRASSE") == "strasse"
+    assert word_key("Maenner") == word_key("M\u0061\u0308nner") == "maenner"
+    assert word_key("Bär") != word_key("Bar")
+    assert word_key("Männer", transliterate=False) == "männer"
+
+
+def test_exact_match_beats_fuzzy_match_in_earlier_directory(audio_dirs):
+    mod, generated, duolingo = audio_dirs
+
+    # Different words: Maße/Masse, Buße/Busse
+    (generated / "Maße.wav").write_bytes(b"RIFF")
+    (duolingo / "Masse.mp3").write_bytes(b"ID3")
+    (generated / "Buße.wav").write_bytes(b"RIFF")
+    (duolingo / "Busse.mp3").write_bytes(b"ID3")
+
+    assert mod.check_audio("Masse") == "Masse.mp3"
+    assert mod.check_audio("Busse") == "Busse.mp3"
+    assert mod.check_audio("Maße") == "Maße.wav"
+    assert mod.check_audio("Buße") == "Buße.wav"
+    assert mod.lookup_audio_batch(["Masse", "Busse"])["found"] == {"Masse": "Masse.mp3", "Busse": "Busse.mp3"}
+
+    # Without transliteration "ß" never matches "ss"
+    (duolingo / "Masse.mp3").unlink()
+    age_directory(duolingo)
+    assert mod.lookup_audio_batch(["Masse"], transliterate=False)["missing"] == ["Masse"]
+
+
+def test_cold_index_parallel_scan(audio_dirs):
+    mod, generated, duolingo = audio_dirs
+    for i in range(20):
+        (generated / f"Wort{i}.wav").write_bytes(b"RIFF" * i)
+
+    result = mod.lookup_audio_batch(["Wort3", "Tisch", "sehr", "Baum"], workers=4)
+    assert result["found"] == {"Wort3": "Wort3.wav", "Tisch": "Tisch.wav", "sehr": "Sehr.mp3"}
+
+    entry = mod.get_audio_index()[str(generated)]
+    assert entry["files"]["Wort7.wav"][0] == 28  # size stat'ed by a worker
+    assert len(entry["files"]) == 21
@@ -0,0 +1,129 @@
+"""Tests for audio_dedupe.py duplicate detection.
+
+Covers:
+- Byte-identical copies under different casings, winner by audio_checker priority
+- Audio payload fingerprints ignoring WAV metadata chunks
+- Words shadowed by higher-priority audio, and deck references that must be kept
+- Deck references protected in identical/same-audio groups and reclaimable totals
+"""
+
+import importlib
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def wav_bytes(samples: bytes, extra_chunk: bytes = b"") -> bytes:
+    fmt = b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, 22050, 44100, 2, 16)
+    data = b"data" + struct.pack("<I", len(samples)) + samples
+    body = b"WAVE" + fmt + extra_chunk + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@pytest.fixture
+def libraries(tmp_paths, tmp_path, monkeypatch):
+    import paths
+
+    generated = tmp_path / "generated_audio"
+    duolingo = tmp_path / "words_from_duolingo"
+    generated.mkdir()
+    duolingo.mkdir()
+    monkeypatch.setattr(paths, "AUDIO_GENERATED", generated, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_DUOLINGO", duolingo, raising=False)
+
+    mod = importlib.import_module("flashcards.scripts.audio_dedupe")
+    return mod, generated, duolingo, tmp_paths[0]
+
+
+def test_identical_copies_under_different_casing(libraries):
+    mod, generated, duolingo, _ = libraries
+
+    (duolingo / "Frau.mp3").write_bytes(b"ID3-frau-audio")
+    (duolingo / "frau.mp3").write_bytes(b"ID3-frau-audio")
+    (duolingo / "Mann.mp3").write_bytes(b"ID3-mann-audio")  # same size, different content
+
+    report = mod.find_duplicates()
+
+    assert len(report["identical"]) == 1
+    group = report["identical"][0]
+    # check_audio("Frau") resolves the capitalized file, so it wins
+    assert group["winner"]["file"] == "Frau.mp3"
+    assert [r["file"] for r in group["redundant"]] == ["frau.mp3"]
+
+
+def test_pcm_fingerprint_ignores_metadata(libraries):
+    mod, generated, _, _ = libraries
+
+    samples = struct.pack("<4h", 1, 2, 3, 4)
+    (generated / "Tisch.wav").write_bytes(wav_bytes(samples))
+    (generated / "Tische.wav").write_bytes(wav_bytes(samples, b"LIST" + struct.pack("<I", 4) + b"INFO"))
+
+    assert mod.find_duplicates()["same_audio"] == []
+
+    report = mod.find_duplicates(pcm=True)
+    assert report["identical"] == []
+    assert len(report["same_audio"]) == 1
+    assert report["same_audio"][0]["winner"]["file"] == "Tisch.wav"
+
+
+def test_shadowed_and_referenced(libraries):
+    mod, generated, duolingo, deck = libraries
+
+    (generated / "Tisch.wav").write_bytes(wav_bytes(b"\x00\x00"))
+    (duolingo / "Tisch.mp3").write_bytes(b"ID3-tisch")
+    (generated / "Buch.wav").write_bytes(wav_bytes(b"\x01\x00"))
+    (duolingo / "Buch.mp3").write_bytes(b"ID3-buch")
+    deck.write_text(
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+        "| 00000001 | Reverse RU→DE | Noun | книга | das Buch | — | — | — | — | Buch.mp3 |\n",
+        encoding="utf-8",
+    )
+
+    report = mod.find_duplicates()
+    shadowed = {g["winner"]["file"]: g for g in report["shadowed"]}
+
+    assert set(shadowed) == {"Tisch.wav", "Buch.wav"}
+    assert [r["file"] for r in shadowed["Tisch.wav"]["redundant"]] == ["Tisch.mp3"]
+    assert shadowed["Tisch.wav"]["referenced"] == []
+    assert [r["file"] for r in shadowed["Buch.wav"]["referenced"]] == ["Buch.mp3"]
+
+
+def test_referenced_copies_are_kept_in_every_group_type(libraries):
+    mod, generated, duolingo, deck = libraries
+
+    (duolingo / "Frau.mp3").write_bytes(b"ID3-frau-audio")
+    (duolingo / "frau.mp3").write_bytes(b"ID3-frau-audio")
+    (duolingo / "Mann.mp3").write_bytes(b"ID3-mann-audio")
+    (duolingo / "mann.mp3").write_bytes(b"ID3-mann-audio")
+    deck.write_text(
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+        "| 00000001 | Reverse RU→DE | Noun | женщина | die Frau | — | — | — | — | frau.mp3 |\n",
+        encoding="utf-8",
+    )
+
+    report = mod.find_duplicates()
+    groups = {g["winner"]["file"]: g for g in report["identical"]}
+    assert [r["file"] for r in groups["Frau.mp3"]["referenced"]] == ["frau.mp3"]
+    assert groups["Mann.mp3"]["referenced"] == []
+    # Only the unreferenced mann.mp3 can go
+    assert mod.reclaimable_bytes(report) == len(b"ID3-mann-audio")
+
+
+def test_sharp_s_spellings_are_not_shadowed(libraries):
+    mod, generated, duolingo, _ = libraries
+
+    (generated / "Maße.wav").write_bytes(wav_bytes(b"\x02\x00"))
+    (duolingo / "Masse.mp3").write_bytes(b"ID3-masse")
+    (generated / "Buße.wav").write_bytes(wav_bytes(b"\x03\x00"))
+    (duolingo / "Busse.mp3").write_bytes(b"ID3-busse")
+
+    assert mod.find_duplicates()["shadowed"] == []
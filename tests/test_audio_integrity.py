@@ -0,0 +1,138 @@
+"""Tests for audio_integrity.py header parsing, level checks and caching.
+
+Covers:
+- WAV: valid, truncated, empty, corrupt, silent and clipped files
+- MP3: frame walking, duration and truncated last frame
+- Scan cache: unchanged files are not re-read
+"""
+
+import importlib
+import json
+import math
+import struct
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def make_wav(path: Path, samples: list[int], rate: int = 22050):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+
+
+def tone(seconds: float, amplitude: int, rate: int = 22050) -> list[int]:
+    n = int(seconds * rate)
+    return [int(amplitude * math.sin(2 * math.pi * 440 * i / rate)) for i in range(n)]
+
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, mono, no padding -> 417-byte frames
+MP3_FRAME = bytes([0xFF, 0xFB, 0x90, 0xC0]) + b"\x00" * 413
+
+
+@pytest.fixture
+def integrity(tmp_path, monkeypatch):
+    import paths
+
+    generated = tmp_path / "generated_audio"
+    duolingo = tmp_path / "words_from_duolingo"
+    generated.mkdir()
+    duolingo.mkdir()
+    monkeypatch.setattr(paths, "AUDIO_GENERATED", generated, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_DUOLINGO", duolingo, raising=False)
+
+    mod = importlib.import_module("flashcards.scripts.audio_integrity")
+    return mod, generated, duolingo
+
+
+def test_wav_header_checks(integrity, tmp_path):
+    mod, _, _ = integrity
+
+    good = tmp_path / "good.wav"
+    make_wav(good, tone(0.5, 8000))
+    data = good.read_bytes()
+
+    result = mod.analyze_audio(data, ".wav")
+    assert result["sample_rate"] == 22050
+    assert result["duration"] == pytest.approx(0.5, abs=0.01)
+    assert "truncated" not in result["issues"]
+
+    assert "truncated" in mod.analyze_audio(data[: len(data) // 2], ".wav")["issues"]
+    assert mod.analyze_audio(b"", ".wav")["issues"] == ["empty"]
+    assert mod.analyze_audio(b"not a wav file at all", ".wav")["issues"] == ["corrupt"]
+
+    header_only = tmp_path / "header.wav"
+    make_wav(header_only, [])
+    assert "empty" in mod.analyze_audio(header_only.read_bytes(), ".wav")["issues"]
+
+
+def test_wav_levels(integrity, tmp_path):
+    pytest.importorskip("numpy")
+    mod, _, _ = integrity
+
+    normal = tmp_path / "normal.wav"
+    silent = tmp_path / "silent.wav"
+    clipped = tmp_path / "clipped.wav"
+    make_wav(normal, tone(0.5, 8000))
+    make_wav(silent, tone(0.5, 5))
+    make_wav(clipped, [32767 if s > 0 else -32768 for s in tone(0.5, 8000)])
+
+    assert mod.analyze_audio(normal.read_bytes(), ".wav")["issues"] == []
+    assert "silent" in mod.analyze_audio(silent.read_bytes(), ".wav")["issues"]
+
+    # Digital silence: level clamped to the floor, so the cache stays valid JSON
+    zeros = tmp_path / "zeros.wav"
+    make_wav(zeros, [0] * 8000)
+    result = mod.analyze_audio(zeros.read_bytes(), ".wav")
+    assert result["rms_dbfs"] == importlib.import_module("flashcards.scripts.audio_formats").FLOOR_DBFS
+    assert "silent" in result["issues"]
+    json.dumps(result, allow_nan=False)
+    assert "clipped" in mod.analyze_audio(clipped.read_bytes(), ".wav")["issues"]
+
+
+def test_mp3_frames_and_truncation(integrity):
+    mod, _, _ = integrity
+
+    id3 = b"ID3\x03\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+    data = id3 + MP3_FRAME * 20
+
+    result = mod.analyze_audio(data, ".mp3")
+    assert result["issues"] == []
+    assert result["sample_rate"] == 44100
+    assert result["channels"] == 1
+    assert result["duration"] == pytest.approx(20 * 1152 / 44100, abs=0.001)
+
+    assert "truncated" in mod.analyze_audio(data[:-100], ".mp3")["issues"]
+    assert mod.analyze_audio(b"ID3garbage" * 10, ".mp3")["issues"] == ["corrupt"]
+
+
+def test_scan_audio_uses_cache(integrity, monkeypatch):
+    mod, generated, duolingo = integrity
+
+    make_wav(generated / "Tisch.wav", tone(0.5, 8000))
+    (generated / "Leer.wav").write_bytes(b"")
+    (duolingo / "Sehr.mp3").write_bytes(MP3_FRAME * 20)
+
+    results = mod.scan_audio(workers=2)
+    by_file = {r["file"]: r for r in results}
+    assert set(by_file) == {"Tisch.wav", "Leer.wav", "Sehr.mp3"}
+    assert by_file["Leer.wav"]["issues"] == ["empty"]
+    assert by_file["Sehr.mp3"]["issues"] == []
+    assert by_file["Tisch.wav"]["sha256"]
+
+    # Second scan: nothing changed, so no file may be read or analyzed again
+    def fail(*args):
+        raise AssertionError("file was re-analyzed")
+
+    monkeypatch.setattr(mod, "_analyze_file", fail)
+    again = mod.scan_audio(workers=2)
+    assert [r["issues"] for r in again] == [r["issues"] for r in results]
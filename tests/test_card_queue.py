@@ -0,0 +1,119 @@
+"""Tests for card_queue.py (multi-producer pending-card queue).
+
+Covers:
+- Concurrent producers, batched draining into the deck
+- Redelivery of a batch left claimed by a crashed consumer (no double insert)
+- Validation and backpressure on enqueue
+- JSONL input with malformed lines is refused as a whole
+"""
+
+import importlib
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+HEADER = (
+    "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+    "|---|---|---|---|---|---|---|---|---|---|\n"
+)
+
+
+def _card(german):
+    return {
+        "card_type": "Cloze", "word_type": "Noun", "russian": "—", "german": german,
+        "extra": "—", "example_de": "—", "example_ru": "—", "notes": "—", "audio": "—",
+    }
+
+
+def _deck_words(deck):
+    return [line.split("|")[5].strip() for line in deck.read_text(encoding="utf-8").splitlines()[2:]]
+
+
+@pytest.fixture
+def queue(tmp_paths, monkeypatch, tmp_path):
+    import paths
+    deck, _ = tmp_paths
+    deck.write_text(HEADER, encoding="utf-8")
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    return importlib.import_module("flashcards.scripts.card_queue"), deck
+
+
+def test_parallel_producers_and_batched_drain(queue):
+    cq, deck = queue
+
+    def produce(worker):
+        for i in range(5):
+            cq.enqueue_cards([_card(f"das Wort{worker}x{i}")], producer=f"worker-{worker}")
+
+    threads = [threading.Thread(target=produce, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cq.queue_status() == {f"worker-{w}": 5 for w in range(4)}
+    assert cq.drain_queue(batch_size=8) == (3, 20)
+    assert cq.queue_status() == {}
+    assert sorted(_deck_words(deck)) == sorted(f"das Wort{w}x{i}" for w in range(4) for i in range(5))
+
+
+def test_crashed_consumer_batch_is_redelivered_once(queue, monkeypatch):
+    cq, deck = queue
+    cq.enqueue_cards([_card("der Tisch"), _card("die Frage"), _card("das Haus")])
+
+    # Consumer dies after inserting the batch but before acknowledging it
+    real_ack = cq.ack_batch
+    monkeypatch.setattr(cq, "ack_batch", lambda conn, batch_id: (_ for _ in ()).throw(KeyboardInterrupt))
+    with pytest.raises(KeyboardInterrupt):
+        cq.drain_queue(batch_size=2)
+    monkeypatch.setattr(cq, "ack_batch", real_ack)
+    assert _deck_words(deck) == ["der Tisch", "die Frage"]
+
+    assert cq.drain_queue(batch_size=2) == (2, 1)
+    assert _deck_words(deck) == ["der Tisch", "die Frage", "das Haus"]
+
+
+def test_enqueue_validates_and_applies_backpressure(queue):
+    cq, _ = queue
+
+    with pytest.raises(ValueError, match="card 1: .*Case mismatch"):
+        cq.enqueue_cards([_card("der Tisch"), dict(_card("die Frage"), word_type="noun")])
+    assert cq.queue_status() == {}
+
+    cq.enqueue_cards([_card("der Tisch"), _card("die Frage")], max_pending=3)
+    with pytest.raises(TimeoutError):
+        cq.enqueue_cards([_card("das Haus"), _card("der Baum")], max_pending=3, timeout=0)
+    assert cq.queue_status() == {"—": 2}
+
+
+def test_jsonl_with_broken_line_is_not_enqueued(queue, tmp_path):
+    cq, _ = queue
+    jsonl = tmp_path / "cards.jsonl"
+    jsonl.write_text(
+        json.dumps(_card("der Tisch")) + "\n"
+        + '{"card_type": "Cloze", "german": \n'
+        + json.dumps(_card("die Frage")) + "\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="line 2: invalid JSON"):
+        cq.read_cards_file(jsonl)
+    assert cq.queue_status() == {}
+
+    jsonl.write_text(json.dumps(_card("der Tisch")) + "\n\n" + json.dumps(_card("die Frage")) + "\n", encoding="utf-8")
+    assert cq.enqueue_cards(cq.read_cards_file(jsonl)) == 2
+
+    # A .json file without a "cards" array is rejected with a message
+    wrong = tmp_path / "cards.json"
+    wrong.write_text(json.dumps({"items": [_card("der Tisch")]}), encoding="utf-8")
+    with pytest.raises(ValueError, match="Missing 'cards' array"):
+        cq.read_cards_file(wrong)
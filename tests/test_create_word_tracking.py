@@ -0,0 +1,43 @@
+"""Tests for create_word_tracking.py (initial word_tracking.md).
+
+Covers:
+- End-to-end run: deck status, audio lookup and rendering under the tracking lock
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_create_tracking_file_end_to_end(tmp_paths, tmp_path, monkeypatch):
+    import paths
+    deck, tracking = tmp_paths
+    deck.write_text(
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+        "| 00000001 | Reverse RU→DE | Noun | собака | der Hund | — | — | — | — | de_Hund.wav |\n",
+        encoding="utf-8",
+    )
+    cleaned = tmp_path / "cleaned_german_words.md"
+    cleaned.write_text("1. Hund\n2. Katze\n3. Baum\n", encoding="utf-8")
+    generated = tmp_path / "generated"
+    duolingo = tmp_path / "duolingo"
+    generated.mkdir()
+    duolingo.mkdir()
+    (generated / "Katze.wav").write_bytes(b"RIFF")
+    monkeypatch.setattr(paths, "CLEANED_WORDS_FILE", cleaned, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_GENERATED", generated, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_DUOLINGO", duolingo, raising=False)
+
+    mod = importlib.reload(importlib.import_module("flashcards.scripts.create_word_tracking"))
+    mod.create_tracking_file(workers=1)
+
+    text = tracking.read_text(encoding="utf-8")
+    assert "| Hund | in_deck |" in text
+    assert "| Katze | pending | ✅ Katze.wav |" in text
+    assert "| Baum | missing_audio | ❌ missing |" in text
@@ -0,0 +1,99 @@
+"""Tests for deck_index.py (lemma / surface-form index over the deck).
+
+Covers:
+- Form extraction: articles, cloze markers, separable verbs, reflexives
+- Lookups by lemma, phrase and transliterated spelling
+- ß kept apart from ss (Buße vs Busse)
+- Index cached per deck version and rebuilt when the deck changes
+- Duplicate lemma groups for the validator
+"""
+
+import importlib
+import json
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def write_deck(md_path: Path, rows: list[str]):
+    header = (
+        "- Total cards: 0\n\n"
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+    )
+    md_path.write_text(header + "\n".join(rows) + "\n", encoding="utf-8")
+
+
+def test_card_forms():
+    di = importlib.import_module("flashcards.scripts.deck_index")
+
+    assert di.card_forms("der Hund") == ("Hund", ["der Hund", "Hund"])
+    assert di.card_forms("{{c1::das}} Auto") == ("Auto", ["das Auto", "Auto"])
+    assert di.card_forms("an|fangen") == ("anfangen", ["anfangen"])
+    assert di.card_forms("sich freuen") == ("freuen", ["sich freuen", "freuen"])
+    assert di.card_forms("der") == ("der", ["der"])  # The article itself
+    assert di.card_forms("") == ("", [])
+
+
+def test_lookup_and_cache(tmp_paths):
+    import paths
+    deck, _ = tmp_paths
+    di = importlib.import_module("flashcards.scripts.deck_index")
+
+    write_deck(deck, [
+        "| 00000001 | Reverse RU→DE | Noun | собака | der Hund | — | — | — | — | Hund.mp3 |",
+        "| 00000002 | Cloze | Noun | собака | {{c1::der}} Hund | — | — | — | — | Hund.mp3 |",
+        "| 00000003 | Reverse RU→DE | Noun | офис | das Büro | — | — | — | — | Büro.mp3 |",
+        "| 00000004 | Reverse RU→DE | Article | — | der | — | — | — | — | Der.mp3 |",
+    ])
+
+    index = di.load_deck_index()
+    assert [c["id"] for c in di.lookup_cards(index, "Hund")] == ["00000001", "00000002"]
+    assert [c["id"] for c in di.lookup_cards(index, "der Hund")] == ["00000001", "00000002"]
+    assert [c["id"] for c in di.lookup_cards(index, "Buero")] == ["00000003"]
+    assert [c["id"] for c in di.lookup_cards(index, "der")] == ["00000004"]
+    assert di.lookup_cards(index, "Katze") == []
+
+    words_set, words_with_types = di.deck_membership(index)
+    assert {"hund", "der hund", "buero", "der"} <= words_set
+    assert words_with_types["der"] == {"Article"}
+
+    cache = json.loads(paths.DECK_INDEX_CACHE.read_text(encoding="utf-8"))
+    assert cache["version"] == di.DECK_INDEX_VERSION
+
+    # New deck version: index rebuilt, duplicates detected
+    write_deck(deck, [
+        "| 00000001 | Reverse RU→DE | Noun | собака | der Hund | — | — | — | — | Hund.mp3 |",
+        "| 00000005 | Reverse RU→DE | Noun | пёс | Hund | — | — | — | — | Hund.mp3 |",
+    ])
+    index = di.load_deck_index()
+    assert "00000003" not in index["cards"]
+    assert di.duplicate_lemmas(index) == {("hund", "Noun", "Reverse RU→DE"): ["00000001", "00000005"]}
+
+
+def test_eszett_is_not_folded_into_ss(tmp_paths):
+    deck, _ = tmp_paths
+    di = importlib.import_module("flashcards.scripts.deck_index")
+
+    write_deck(deck, [
+        "| 00000001 | Reverse RU→DE | Noun | покаяние | die Buße | — | — | — | — | — |",
+        "| 00000002 | Reverse RU→DE | Noun | автобусы | die Busse | — | — | — | — | — |",
+        "| 00000003 | Reverse RU→DE | Noun | приветы | die Grüße | — | — | — | — | — |",
+    ])
+
+    index = di.load_deck_index()
+    assert [c["id"] for c in di.lookup_cards(index, "Buße")] == ["00000001"]
+    assert [c["id"] for c in di.lookup_cards(index, "Busse")] == ["00000002"]
+    assert [c["id"] for c in di.lookup_cards(index, "Gruesse")] == ["00000003"]
+    assert di.duplicate_lemmas(index) == {}
+
+    # Only "Buße" in the deck: "Busse" is a different word, not an ASCII spelling
+    write_deck(deck, ["| 00000001 | Reverse RU→DE | Noun | покаяние | die Buße | — | — | — | — | — |"])
+    index = di.load_deck_index()
+    assert di.lookup_cards(index, "Busse") == []
+    words_set, _ = di.deck_membership(index)
+    assert words_set.isdisjoint(di.word_keys("die Busse"))
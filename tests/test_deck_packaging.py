@@ -2,6 +2,8 @@
 
 import importlib
 import json
+import os
+import shutil
 import sys
 from pathlib import Path
 
@@ -213,6 +215,10 @@ def deck_roundtrip(tmp_path, monkeypatch):
     return {
         "data": data,
         "cards_by_id": index_cards_by_id(data),
+        "apkg_path": apkg_path,
+        "unpack_mod": unpack_mod,
+        "temp_dir": temp_dir,
+        "gen_mod": gen_mod,
     }
 
 
@@ -270,3 +276,270 @@ def test_field_transformations(deck_roundtrip):
     prep_card = cards_by_id["00000008"]
     assert prep_card["fields"]["Preposition"] == "mit"
     assert prep_card["fields"]["Case"] == "+ Dativ"
+
+
+def test_media_map_without_extracting_blobs(deck_roundtrip):
+    assert sorted(deck_roundtrip["data"]["media"].values()) == ["de_Hund.wav", "de_gehen.mp3"]
+
+
+def _protobuf_entry(name, size):
+    encoded = name.encode("utf-8")
+    entry = bytes([0x0a, len(encoded)]) + encoded + bytes([0x10, size])
+    return bytes([0x0a, len(entry)]) + entry
+
+
+def test_anki21b_collection_and_protobuf_media(tmp_path):
+    import sqlite3
+    import zipfile
+    zstandard = pytest.importorskip("zstandard")
+    unpack_mod = importlib.import_module("flashcards.scripts.unpack_deck")
+
+    db_path = tmp_path / "source.anki2"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE notes (id INTEGER)")
+    conn.execute("INSERT INTO notes VALUES (42)")
+    conn.commit()
+    conn.close()
+
+    media = _protobuf_entry("de_Hund.wav", 8) + _protobuf_entry("de_gehen.mp3", 7)
+    apkg = tmp_path / "deck.apkg"
+    with zipfile.ZipFile(apkg, "w") as zf:
+        zf.writestr("collection.anki2", b"legacy stub")
+        zf.writestr("collection.anki21b", zstandard.ZstdCompressor().compress(db_path.read_bytes()))
+        zf.writestr("media", zstandard.ZstdCompressor().compress(media))
+        zf.writestr("0", b"RIFF----")
+        zf.writestr("1", b"ID3----")
+
+    extract_dir = tmp_path / "extract"
+    extract_dir.mkdir()
+    collection = unpack_mod.extract_apkg(apkg, extract_dir)
+    assert [p.name for p in extract_dir.iterdir()] == [collection.name]  # No media blobs on disk
+    assert sqlite3.connect(collection).execute("SELECT id FROM notes").fetchall() == [(42,)]
+
+    assert unpack_mod.read_media_map(apkg) == {"0": "de_Hund.wav", "1": "de_gehen.mp3"}
+
+
+def test_new_schema_models_with_one_read_only_connection(tmp_path):
+    import sqlite3
+    unpack_mod = importlib.import_module("flashcards.scripts.unpack_deck")
+
+    db_path = tmp_path / "collection.anki2"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(
+        "CREATE TABLE notetypes (id INTEGER, name TEXT, config BLOB);"
+        "CREATE TABLE fields (ntid INTEGER, ord INTEGER, name TEXT);"
+        "CREATE TABLE decks (id INTEGER, name TEXT);"
+        "CREATE TABLE notes (id INTEGER, guid TEXT, mid INTEGER, flds TEXT, tags TEXT);"
+        "INSERT INTO notetypes VALUES (1, 'Verb', NULL), (2, 'Empty', NULL);"
+        "INSERT INTO fields VALUES (1, 1, 'Infinitive'), (1, 0, 'ID');"
+        "INSERT INTO decks VALUES (7, 'Deutsch');"
+        "INSERT INTO notes VALUES (10, 'g1', 1, '00000004\x1fgehen', ''), (11, 'g2', 99, 'x', '');"
+    )
+    conn.commit()
+    conn.close()
+
+    conn = unpack_mod.connect_collection(db_path)
+    assert unpack_mod.get_models_from_collection(conn) == {
+        "1": {"name": "Verb", "fields": ["ID", "Infinitive"]},
+        "2": {"name": "Empty", "fields": []},
+    }
+    assert unpack_mod.get_deck_info(conn) == [{"id": 7, "name": "Deutsch"}]
+    notes = list(unpack_mod.iter_notes(conn))  # Unknown model 99 is skipped
+    assert [n["fields"] for n in notes] == [{"ID": "00000004", "Infinitive": "gehen"}]
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("DELETE FROM notes")
+    conn.close()
+
+
+def test_streamed_jsonl_output_and_validation(deck_roundtrip, monkeypatch):
+    pytest.importorskip("zstandard")
+    unpack_mod = deck_roundtrip["unpack_mod"]
+    temp_dir = deck_roundtrip["temp_dir"]
+
+    for output_format in ("jsonl", "jsonl.zst"):
+        monkeypatch.setattr(sys, "argv", ["unpack_deck.py", str(deck_roundtrip["apkg_path"]), "--format", output_format])
+        unpack_mod.main()
+        output_file = temp_dir / f"deck_data.{output_format}"
+        header, notes = unpack_mod.read_deck_data(output_file)
+        assert header["media"] == deck_roundtrip["data"]["media"]
+        assert list(notes) == deck_roundtrip["data"]["cards"]
+    assert (temp_dir / "deck_data.jsonl.zst").stat().st_size < (temp_dir / "deck_data.json").stat().st_size / 2
+
+    validate_mod = importlib.reload(importlib.import_module("flashcards.scripts.validate_deck"))
+    report = temp_dir / "report.md"
+    monkeypatch.setattr(validate_mod, "DECK_DATA_FILE", temp_dir / "deck_data.json", raising=False)
+    monkeypatch.setattr(validate_mod, "REPORT_FILE", report, raising=False)
+    assert validate_mod.find_deck_data() == temp_dir / "deck_data.jsonl.zst"  # Newest output
+    monkeypatch.setattr(sys, "argv", ["validate_deck.py"])
+    validate_mod.main()
+    text = report.read_text(encoding="utf-8")
+    assert f"- **Cards in deck:** {len(TEST_CARDS)}" in text
+    assert "**Orphaned cards** (in deck, not in MD): **0**" in text
+
+
+def test_unpack_cache_skips_zip_and_sqlite_on_hit(deck_roundtrip, monkeypatch):
+    unpack_mod = deck_roundtrip["unpack_mod"]
+    apkg_path = deck_roundtrip["apkg_path"]
+    output_file = deck_roundtrip["temp_dir"] / "deck_data.json"
+    output_file.unlink()
+
+    def fail_extract(*args):
+        raise AssertionError("package was unpacked again")
+
+    unpack_mod.unpack_cached(apkg_path, "jsonl")
+
+    # Same package (the fixture already unpacked it): served from the cache
+    monkeypatch.setattr(unpack_mod, "extract_apkg", fail_extract)
+    monkeypatch.setattr(sys, "argv", ["unpack_deck.py", str(apkg_path)])
+    unpack_mod.main()
+    unpacked = json.loads(output_file.read_text(encoding="utf-8"))
+    assert dict(unpacked, extracted_at=None) == dict(deck_roundtrip["data"], extracted_at=None)
+
+    # A copy at another path is a hit too, but the header names the copy
+    copy = apkg_path.with_name("copy.apkg")
+    shutil.copyfile(apkg_path, copy)
+    monkeypatch.setattr(sys, "argv", ["unpack_deck.py", str(copy), "--format", "jsonl"])
+    unpack_mod.main()
+    monkeypatch.setattr(sys, "argv", ["unpack_deck.py", str(copy)])
+    unpack_mod.main()
+    for output in (output_file, output_file.with_suffix(".jsonl")):
+        header, notes = unpack_mod.read_deck_data(output)
+        assert header["source_file"] == str(copy)
+        assert list(notes) == deck_roundtrip["data"]["cards"]
+
+    # Touched but identical package: re-hashed, still a hit
+    st = apkg_path.stat()
+    os.utime(apkg_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert unpack_mod.unpack_cached(apkg_path)[1:] == (len(TEST_CARDS), True)
+
+    # Different content: miss
+    with open(apkg_path, "ab") as f:
+        f.write(b"\0")
+    with pytest.raises(AssertionError, match="unpacked again"):
+        unpack_mod.unpack_cached(apkg_path)
+
+
+def test_unpack_cache_prunes_package_entries_with_results(deck_roundtrip, monkeypatch):
+    import paths
+    unpack_mod = deck_roundtrip["unpack_mod"]
+    apkg_path = deck_roundtrip["apkg_path"]
+    monkeypatch.setattr(unpack_mod, "MAX_CACHED_RESULTS", 1)
+
+    changed = apkg_path.with_name("changed.apkg")
+    shutil.copyfile(apkg_path, changed)
+    with open(changed, "ab") as f:
+        f.write(b"\0")
+    unpack_mod.unpack_cached(apkg_path)
+    unpack_mod.unpack_cached(changed)
+
+    index = json.loads((paths.UNPACK_CACHE_DIR / "index.json").read_text(encoding="utf-8"))
+    assert list(index["packages"]) == [str(changed.resolve())]
+    assert [name.split(".", 1)[0] for name in index["results"]] == [index["packages"][str(changed.resolve())]["sha256"]]
+    assert sorted(p.name for p in paths.UNPACK_CACHE_DIR.iterdir()) == sorted(index["results"]) + ["index.json"]
+
+
+def test_validate_straight_from_apkg(deck_roundtrip, monkeypatch):
+    import paths
+    unpack_mod = deck_roundtrip["unpack_mod"]
+    temp_dir = deck_roundtrip["temp_dir"]
+
+    notes = unpack_mod.iter_apkg_notes(deck_roundtrip["apkg_path"])
+    assert next(notes)["guid"] in deck_roundtrip["cards_by_id"]  # Lazy: one note at a time
+    notes.close()
+
+    validate_mod = importlib.reload(importlib.import_module("flashcards.scripts.validate_deck"))
+    report = temp_dir / "report_apkg.md"
+    monkeypatch.setattr(validate_mod, "DECK_DATA_FILE", temp_dir / "missing.json", raising=False)
+    monkeypatch.setattr(validate_mod, "REPORT_FILE", report, raising=False)
+    monkeypatch.setattr(sys, "argv", ["validate_deck.py", "--apkg", str(deck_roundtrip["apkg_path"])])
+
+    # Cache miss: notes are validated straight from the package, not read back
+    def fail_read(*args):
+        raise AssertionError("cache file was parsed on a miss")
+
+    real_read = unpack_mod.read_deck_data
+    monkeypatch.setattr(unpack_mod, "read_deck_data", fail_read)
+    validate_mod.main()
+    text = report.read_text(encoding="utf-8")
+    assert f"- **Cards in deck:** {len(TEST_CARDS)}" in text
+    assert "**Missing cards** (in MD, not in deck): **0**" in text
+    monkeypatch.setattr(unpack_mod, "read_deck_data", real_read)
+
+    # ...while the cache file was written alongside
+    cached = list(paths.UNPACK_CACHE_DIR.glob("*.jsonl"))
+    assert len(cached) == 1
+    _, cached_notes = unpack_mod.read_deck_data(cached[0])
+    assert len(list(cached_notes)) == len(TEST_CARDS)
+
+    # Validating the same package again is served from the unpack cache
+    def fail_extract(*args):
+        raise AssertionError("package was unpacked again")
+
+    monkeypatch.setattr(unpack_mod, "extract_apkg", fail_extract)
+    report.unlink()
+    validate_mod.main()
+    assert f"- **Cards in deck:** {len(TEST_CARDS)}" in report.read_text(encoding="utf-8")
+
+
+def test_media_diff_against_notes_and_library(deck_roundtrip, monkeypatch):
+    unpack_mod = deck_roundtrip["unpack_mod"]
+    apkg_path = deck_roundtrip["apkg_path"]
+    import paths
+    media_manifest = importlib.import_module("flashcards.scripts.media_manifest")
+
+    def fail_hash(*args):
+        raise AssertionError("audio library was hashed")
+
+    monkeypatch.setattr(media_manifest, "update_manifest", fail_hash)
+    monkeypatch.setattr(media_manifest, "_describe_file", fail_hash)
+    crc_reads = []
+    real_crc32 = unpack_mod._local_crc32
+    monkeypatch.setattr(unpack_mod, "_local_crc32", lambda path: crc_reads.append(path.name) or real_crc32(path))
+
+    media = unpack_mod.package_media(apkg_path)
+    assert media["de_Hund.wav"]["size"] == len(b"RIFF----")
+
+    report = unpack_mod.diff_package_media(apkg_path)
+    assert report["packaged"] == 2
+    assert report["unreferenced"] == report["missing"] == report["not_in_library"] == report["stale"] == []
+
+    # Same size, new content (CRC mismatch) and a different size
+    hund = paths.AUDIO_GENERATED / "Hund.wav"
+    hund.write_bytes(b"RIFF++++")
+    st = hund.stat()
+    os.utime(hund, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    (paths.AUDIO_DUOLINGO / "gehen.mp3").write_bytes(b"ID3-------")
+
+    crc_reads.clear()
+    report = unpack_mod.diff_package_media(apkg_path)
+    assert [(s["file"], s["reason"]) for s in report["stale"]] == [
+        ("de_Hund.wav", "content"),
+        ("de_gehen.mp3", "size"),
+    ]
+    assert crc_reads == ["Hund.wav"]  # Size mismatch decided without reading the file
+
+    (paths.AUDIO_DUOLINGO / "gehen.mp3").unlink()
+    assert unpack_mod.diff_package_media(apkg_path)["not_in_library"] == ["de_gehen.mp3"]
+
+
+def test_build_and_validate_do_not_hash_audio(deck_roundtrip, monkeypatch):
+    media_manifest = importlib.import_module("flashcards.scripts.media_manifest")
+
+    def fail_describe(*args):
+        raise AssertionError("audio file was read/hashed")
+
+    monkeypatch.setattr(media_manifest, "_describe_file", fail_describe)
+    monkeypatch.setattr(media_manifest, "update_manifest", fail_describe)
+
+    gen_mod = deck_roundtrip["gen_mod"]
+    gen_mod.main()
+    assert gen_mod.OUTPUT_FILE.exists()
+
+    validate_mod = importlib.reload(importlib.import_module("flashcards.scripts.validate_deck"))
+    report = deck_roundtrip["temp_dir"] / "report_nohash.md"
+    monkeypatch.setattr(validate_mod, "REPORT_FILE", report, raising=False)
+    monkeypatch.setattr(sys, "argv", ["validate_deck.py", "--apkg", str(deck_roundtrip["apkg_path"])])
+    validate_mod.main()
+    text = report.read_text(encoding="utf-8")
+    assert "- **Audio referenced in MD:** 2 files" in text
+    assert "### ✅ Audio Files" in text
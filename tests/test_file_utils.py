@@ -0,0 +1,66 @@
+"""Tests for file_utils.py locking and atomic writes.
+
+Covers:
+- atomic_write replaces the file and keeps permissions
+- A failing write leaves the original file and no temp files behind
+- file_lock is re-entrant in-process and exclusive across processes
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def test_atomic_write_replaces_or_keeps_original(tmp_path):
+    fu = importlib.import_module("flashcards.scripts.file_utils")
+    target = tmp_path / "deck.md"
+    target.write_text("old\n", encoding="utf-8")
+    os.chmod(target, 0o640)
+
+    fu.write_text_atomic(target, "new\n")
+    assert target.read_text(encoding="utf-8") == "new\n"
+    assert (target.stat().st_mode & 0o777) == 0o640
+
+    with pytest.raises(RuntimeError):
+        with fu.atomic_write(target) as f:
+            f.write("half-written")
+            raise RuntimeError("crash mid-write")
+
+    assert target.read_text(encoding="utf-8") == "new\n"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["deck.md"]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fcntl locks only")
+def test_file_lock_reentrant_and_exclusive(tmp_path):
+    fu = importlib.import_module("flashcards.scripts.file_utils")
+    target = tmp_path / "word_tracking.md"
+
+    probe = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from flashcards.scripts.file_utils import file_lock\n"
+        "try:\n"
+        "    with file_lock(sys.argv[2], timeout=0.2):\n"
+        "        sys.exit(0)\n"
+        "except TimeoutError:\n"
+        "    sys.exit(3)\n"
+    )
+
+    def other_process_can_lock():
+        result = subprocess.run([sys.executable, "-c", probe, str(PROJECT_ROOT), str(target)])
+        return result.returncode == 0
+
+    with fu.file_lock(target):
+        with fu.file_lock(target):  # Nested use in the same process must not deadlock
+            assert not other_process_can_lock()
+        assert not other_process_can_lock()
+
+    assert other_process_can_lock()
@@ -104,3 +104,288 @@ def test_update_deck_metadata_counts_and_updates(tmp_paths, monkeypatch):
     # Generated should be updated to today (YYYY-MM-DD) pattern
     import re
     assert re.search(r"- Generated: \d{4}-\d{2}-\d{2}", updated)
+
+
+def _card(german, card_type="Reverse", word_type="Noun"):
+    return {
+        "card_type": card_type,
+        "word_type": word_type,
+        "russian": "—",
+        "german": german,
+        "extra": "—",
+        "example_de": "—",
+        "example_ru": "—",
+        "notes": "—",
+        "audio": "—",
+    }
+
+
+def test_card_ids_are_content_derived_and_collision_checked(monkeypatch, tmp_path):
+    import paths
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+
+    card = mod.expand_reverse_card(_card("der Schritt"))[0]
+    first = mod.generate_card_id("der Schritt", "Reverse RU→DE")
+    assert first == mod.generate_card_id("Der Schritt", "Reverse RU→DE")
+    assert first != mod.generate_card_id("der Schritt", "Reverse DE→RU")
+
+    # Same content already in the deck → not new; different content → next salt
+    key = mod.card_content_key(card)
+    assert mod.assign_card_id(card, {first: key}, set()) == (first, False)
+    other = ("die frage", "Noun", "Reverse RU→DE")
+    assert mod.assign_card_id(card, {first: other}, set()) == (mod.generate_card_id("der Schritt", "Reverse RU→DE", 1), True)
+
+    # Deleted IDs are never reused
+    deleted = tmp_path / "deleted_card_ids.md"
+    deleted.write_text(f"# Deleted\n\n```\n{first}\n```\n", encoding="utf-8")
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", deleted, raising=False)
+    deck_ids, deleted_ids = mod.load_card_ids([])
+    card_id, is_new = mod.assign_card_id(card, deck_ids, deleted_ids)
+    assert is_new and card_id != first and deck_ids[card_id] == key
+
+
+def test_insert_is_idempotent(tmp_paths, monkeypatch, tmp_path):
+    import paths
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    deck.write_text(
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n",
+        encoding="utf-8",
+    )
+
+    assert mod.insert_cards_into_deck([_card("der Schritt"), _card("gehen", "Cloze", "Verb")]) == 3
+    after_first = deck.read_text(encoding="utf-8")
+    assert mod.insert_cards_into_deck([_card("der Schritt"), _card("gehen", "Cloze", "Verb")]) == 0
+    assert deck.read_text(encoding="utf-8") == after_first
+
+    ids = [line.split("|")[1].strip() for line in after_first.splitlines()[2:]]
+    assert len(set(ids)) == 3
+
+
+def test_insert_updates_header_in_same_write(tmp_paths, monkeypatch, tmp_path):
+    import paths
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    deck.write_text(
+        "# Deck\n\n"
+        "- Total cards: 0\n"
+        "- Generated: 2000-01-01\n\n"
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+        "| 11111111 | Reverse RU→DE | Noun | шаг | der Schritt | — | — | — | — | — |",  # no trailing newline
+        encoding="utf-8",
+    )
+
+    writes = []
+    real_atomic_write = mod.atomic_write
+    monkeypatch.setattr(mod, "atomic_write", lambda path: writes.append(path) or real_atomic_write(path))
+
+    assert mod.insert_cards_into_deck([_card("die Frage")]) == 2
+    assert writes == [mod.journal_file(), deck]
+
+    lines = deck.read_text(encoding="utf-8").splitlines()
+    assert "- Total cards: 3" in lines
+    assert "- Generated: 2000-01-01" not in lines
+    assert lines[7].startswith("| 11111111 |")
+    assert [line.split("|")[5].strip() for line in lines[8:]] == ["die Frage", "die Frage"]
+
+
+def test_deck_rows_parsed_once_per_insert(tmp_paths, monkeypatch, tmp_path):
+    import paths
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    deck.write_text(
+        "- Total cards: 0\n\n"
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+        "| 22222222 | Cloze | Noun | дом | das Haus | — | — | — | — | — |\n",
+        encoding="utf-8",
+    )
+
+    parses = []
+    real_parse = mod.parse_deck_rows
+    monkeypatch.setattr(mod, "parse_deck_rows", lambda lines: parses.append(1) or real_parse(lines))
+    assert mod.insert_cards_into_deck([_card("die Frage")]) == 2
+    assert parses == [1]
+    assert "- Total cards: 3" in deck.read_text(encoding="utf-8")
+
+
+def test_duplicates_skipped_reported_or_merged(tmp_paths, monkeypatch, tmp_path):
+    import paths
+    import pytest
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    original = (
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+        "| 11111111 | Cloze | Noun | шаг | {{c1::der}} Schritt | — | — | — | — | — |\n"
+    )
+    deck.write_text(original, encoding="utf-8")
+
+    with_audio = dict(_card("der Schritt", "Cloze"), audio="Schritt.mp3")
+    batch = [
+        with_audio,                          # Same lemma as the deck's cloze card
+        _card("die Frage", "Cloze"),
+        _card("Frage", "Cloze"),             # Duplicate within the batch
+        _card("der Schritt", "Reverse RU→DE"),  # Different card type: not a duplicate
+    ]
+
+    # report: nothing inserted
+    with pytest.raises(mod.DuplicateCardsError) as excinfo:
+        mod.insert_cards_into_deck(batch, on_duplicate="report")
+    assert len(excinfo.value.duplicates) == 2
+    assert deck.read_text(encoding="utf-8") == original
+
+    # skip: duplicates dropped, the rest inserted
+    assert mod.insert_cards_into_deck(batch, on_duplicate="skip") == 2
+    rows = deck.read_text(encoding="utf-8").splitlines()[2:]
+    assert [r.split("|")[5].strip() for r in rows] == ["{{c1::der}} Schritt", "die Frage", "der Schritt"]
+    assert rows[0].endswith("| — |")
+
+    # merge: empty fields of the existing card are filled in
+    assert mod.insert_cards_into_deck([with_audio], on_duplicate="merge") == 0
+    rows = deck.read_text(encoding="utf-8").splitlines()[2:]
+    assert rows[0] == "| 11111111 | Cloze | Noun | шаг | {{c1::der}} Schritt | — | — | — | — | Schritt.mp3 |"
+    assert len(rows) == 3
+
+
+def test_eszett_and_ss_lemmas_are_not_duplicates(tmp_paths, monkeypatch, tmp_path):
+    import paths
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    deck.write_text(
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+        "| 11111111 | Reverse RU→DE | Noun | покаяние | die Buße | — | — | — | — | — |\n",
+        encoding="utf-8",
+    )
+
+    assert mod.insert_cards_into_deck([_card("die Busse", "Reverse RU→DE")], on_duplicate="skip") == 1
+    rows = deck.read_text(encoding="utf-8").splitlines()[2:]
+    assert [r.split("|")[5].strip() for r in rows] == ["die Buße", "die Busse"]
+
+
+def test_jsonl_ingestion_collects_errors_and_inserts_in_batches(tmp_paths, monkeypatch, tmp_path):
+    import json
+    import paths
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    deck.write_text(
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n",
+        encoding="utf-8",
+    )
+
+    bad_type = dict(_card("das Haus", "Cloze"), word_type="noun")
+    missing = {k: v for k, v in _card("der Baum", "Cloze").items() if k != "audio"}
+    records = [
+        json.dumps(_card("der Tisch", "Cloze")),
+        json.dumps(bad_type),
+        "{not json",
+        "",
+        json.dumps(missing),
+        json.dumps(_card("die Frage", "Cloze")),
+        json.dumps(_card("gehen", "Cloze", "Verb")),
+    ]
+    jsonl = tmp_path / "pending_cards.jsonl"
+    jsonl.write_text("\n".join(records) + "\n", encoding="utf-8")
+
+    batches = []
+    real_insert = mod.insert_cards_into_deck
+    monkeypatch.setattr(mod, "insert_cards_into_deck",
+                        lambda cards, on_duplicate: batches.append(len(cards)) or real_insert(cards, on_duplicate))
+
+    inserted, valid, errors = mod.insert_jsonl_cards(jsonl, batch_size=2)
+    assert (inserted, valid) == (3, 3)
+    assert batches == [2, 1]
+    assert [line for line, _ in errors] == [2, 3, 5]
+    assert "Case mismatch" in errors[0][1]
+    assert "invalid JSON" in errors[1][1]
+    assert errors[2][1] == "missing required field: audio"
+
+    germans = [r.split("|")[5].strip() for r in deck.read_text(encoding="utf-8").splitlines()[2:]]
+    assert germans == ["der Tisch", "die Frage", "gehen"]
+
+
+def test_jsonl_report_mode_checks_whole_file_before_first_batch(tmp_paths, monkeypatch, tmp_path):
+    import json
+    import paths
+    import pytest
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    original = (
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+    )
+    deck.write_text(original, encoding="utf-8")
+
+    # The duplicate of record 1 only shows up in the third batch
+    records = [_card("der Tisch", "Cloze"), _card("die Frage", "Cloze"), _card("gehen", "Cloze", "Verb"),
+               _card("das Haus", "Cloze"), _card("Tisch", "Cloze")]
+    jsonl = tmp_path / "pending_cards.jsonl"
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+    with pytest.raises(mod.DuplicateCardsError) as excinfo:
+        mod.insert_jsonl_cards(jsonl, on_duplicate="report", batch_size=2)
+    assert [(card["german"], existing) for card, existing in excinfo.value.duplicates] == [
+        ("Tisch", "earlier card in this file"),
+    ]
+    assert deck.read_text(encoding="utf-8") == original
+
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in records[:4]), encoding="utf-8")
+    assert mod.insert_jsonl_cards(jsonl, on_duplicate="report", batch_size=2)[:2] == (4, 4)
+
+
+def test_interrupted_insert_is_rolled_forward_or_back(tmp_paths, monkeypatch, tmp_path):
+    import paths
+    import pytest
+    deck, _ = tmp_paths
+    monkeypatch.setattr(paths, "DELETED_CARD_IDS_FILE", tmp_path / "missing.md", raising=False)
+    mod = importlib.import_module("flashcards.scripts.insert_cards")
+    original = (
+        "- Total cards: 0\n\n"
+        "| ID | Card Type | Word Type | Russian | German | Extra | Example_DE | Example_RU | Notes | Audio |\n"
+        "|---|---|---|---|---|---|---|---|---|---|\n"
+    )
+
+    # Crash after the journal was written, before the deck was replaced
+    real_atomic_write = mod.atomic_write
+
+    def crashing_atomic_write(path):
+        if path == deck:
+            raise KeyboardInterrupt("killed")
+        return real_atomic_write(path)
+
+    def crash_insert(cards):
+        deck.write_text(original, encoding="utf-8")
+        monkeypatch.setattr(mod, "atomic_write", crashing_atomic_write)
+        with pytest.raises(KeyboardInterrupt):
+            mod.insert_cards_into_deck(cards)
+        monkeypatch.setattr(mod, "atomic_write", real_atomic_write)
+        assert deck.read_text(encoding="utf-8") == original
+        assert mod.journal_file().exists()
+
+    # Deck untouched since: roll forward
+    crash_insert([_card("der Tisch")])
+    assert mod.recover_journal() == "rolled_forward"
+    text = deck.read_text(encoding="utf-8")
+    assert "- Total cards: 2\n" in text
+    assert text.count("| der Tisch |") == 2
+    assert not mod.journal_file().exists()
+    assert mod.recover_journal() is None
+
+    # Deck edited before recovery: roll back (deck kept as is)
+    crash_insert([_card("der Tisch")])
+    edited = original.replace("Total cards: 0", "Total cards: 7")
+    deck.write_text(edited, encoding="utf-8")
+    assert mod.recover_journal() == "rolled_back"
+    assert deck.read_text(encoding="utf-8") == edited
+    assert not mod.journal_file().exists()
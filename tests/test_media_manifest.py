@@ -0,0 +1,99 @@
+"""Tests for media_manifest.py incremental updates and usage totals."""
+
+import importlib
+import os
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def wav_bytes(n_samples: int, rate: int = 8000) -> bytes:
+    samples = b"\x10\x00" * n_samples
+    fmt = b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, rate, rate * 2, 2, 16)
+    data = b"data" + struct.pack("<I", len(samples)) + samples
+    body = b"WAVE" + fmt + data
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+
+@pytest.fixture
+def manifest_mod(tmp_path, monkeypatch):
+    import paths
+
+    generated = tmp_path / "generated_audio"
+    duolingo = tmp_path / "words_from_duolingo"
+    generated.mkdir()
+    duolingo.mkdir()
+    (generated / "Tisch.wav").write_bytes(wav_bytes(8000))   # 1.0 s
+    (generated / "Buch.wav").write_bytes(wav_bytes(4000))    # 0.5 s
+    (duolingo / "notes.csv").write_text("not audio", encoding="utf-8")
+    monkeypatch.setattr(paths, "AUDIO_GENERATED", generated, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_DUOLINGO", duolingo, raising=False)
+
+    mod = importlib.import_module("flashcards.scripts.media_manifest")
+    return mod, generated, duolingo
+
+
+def test_manifest_entries(manifest_mod):
+    import paths
+    mod, generated, _ = manifest_mod
+
+    manifest = mod.update_manifest(workers=2)
+    entries = manifest["dirs"][str(generated)]
+
+    assert set(entries) == {"Tisch.wav", "Buch.wav"}
+    assert entries["Tisch.wav"]["duration"] == pytest.approx(1.0)
+    assert entries["Tisch.wav"]["sample_rate"] == 8000
+    assert entries["Tisch.wav"]["size"] == (generated / "Tisch.wav").stat().st_size
+    assert len(entries["Tisch.wav"]["sha256"]) == 64
+    assert paths.MEDIA_MANIFEST_FILE.exists()
+    assert mod.load_manifest() == manifest
+
+
+def test_manifest_updates_incrementally(manifest_mod, monkeypatch):
+    mod, generated, duolingo = manifest_mod
+    first = mod.update_manifest()
+
+    described = []
+    real_describe = mod._describe_file
+    monkeypatch.setattr(mod, "_describe_file", lambda p, *a: described.append(p.name) or real_describe(p, *a))
+
+    # Nothing changed: no file is read again
+    assert mod.update_manifest() == first
+    assert described == []
+
+    # Modify one file (new size), add one, remove one
+    (generated / "Tisch.wav").write_bytes(wav_bytes(16000))
+    (duolingo / "Sehr.mp3").write_bytes(b"")
+    (generated / "Buch.wav").unlink()
+    for directory in (generated, duolingo):
+        # Make sure the audio index sees the change even within one mtime tick
+        st = directory.stat()
+        os.utime(directory, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    manifest = mod.update_manifest()
+    assert sorted(described) == ["Sehr.mp3", "Tisch.wav"]
+    assert set(manifest["dirs"][str(generated)]) == {"Tisch.wav"}
+    assert manifest["dirs"][str(generated)]["Tisch.wav"]["duration"] == pytest.approx(2.0)
+    assert manifest["dirs"][str(duolingo)]["Sehr.mp3"]["size"] == 0
+
+
+def test_media_usage(manifest_mod):
+    mod, generated, _ = manifest_mod
+    manifest = mod.update_manifest()
+
+    usage = mod.media_usage(manifest, ["Tisch.wav", "Buch.wav", "Tisch.wav", "Fehlt.mp3"])
+    assert usage["files"] == 2
+    assert usage["bytes"] == sum(f.stat().st_size for f in generated.iterdir())
+    assert usage["duration"] == pytest.approx(1.5)
+    assert usage["missing"] == ["Fehlt.mp3"]
+
+    path, entry = mod.lookup_media(manifest, "Buch.wav")
+    assert path == generated / "Buch.wav"
+    assert mod.lookup_media(manifest, "Fehlt.mp3") == (None, None)
@@ -0,0 +1,76 @@
+"""Tests for tracking_store.py (SQLite store behind word_tracking.md).
+
+Covers:
+- Import of the markdown table and status queries
+- Rendering back to markdown (round trip, statistics section)
+- Re-import after the markdown file was edited by hand
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+TRACKING = (
+    "# Word Tracking\n\n"
+    "---\n\n"
+    "| Word | Status | Audio | IPA | Word Type | Date Added | Notes |\n"
+    "|------|--------|-------|-----|-----------|------------|-------|\n"
+    "| Tisch | in_deck | ✅ Tisch.wav | — | Noun | 2025-11-08 | — |\n"
+    "| Männer | pending | ✅ Männer.wav | — | Noun | — | — |\n"
+    "| Baum | pending | ✅ Baum.mp3 | — | Noun | — | — |\n"
+    "| Fehler | error | ❌ missing | — | Noun | — | retry |\n"
+    "\n---\n\n"
+    "## Statistics\n\n"
+    "- **Total words:** 4\n"
+    "- **In deck:** 1\n"
+    "- **Pending (with audio):** 2\n"
+    "- **Missing audio:** 0\n"
+    "- **Error:** 1\n"
+    "- **Ready to process:** 2\n"
+)
+
+
+def test_import_query_and_render(tmp_paths):
+    _, tracking = tmp_paths
+    tracking.write_text(TRACKING, encoding="utf-8")
+    store = importlib.import_module("flashcards.scripts.tracking_store")
+
+    conn = store.open_store()
+    assert [r["word"] for r in store.select_words(conn, "pending")] == ["Männer", "Baum"]
+    assert [r["word"] for r in store.select_words(conn, "pending", limit=1)] == ["Männer"]
+    assert store.count_statuses(conn) == {"in_deck": 1, "pending": 2, "missing_audio": 0, "error": 1}
+    assert [r["word"] for r in store.get_rows(conn, ["maenner"])] == ["Männer"]
+
+    # Unchanged store renders to the same file, so nothing is written
+    assert store.render_markdown(conn) == TRACKING
+    assert store.write_markdown(conn) is False
+
+    row = store.get_rows(conn, ["baum"])[0]
+    store.update_rows(conn, [dict(row, status="in_deck", date_added="2025-12-01")])
+    assert store.write_markdown(conn) is True
+    text = tracking.read_text(encoding="utf-8")
+    assert "| Baum | in_deck | ✅ Baum.mp3 | — | Noun | 2025-12-01 | — |" in text
+    assert "- **In deck:** 2\n" in text
+    conn.close()
+
+
+def test_hand_edited_markdown_is_reimported(tmp_paths):
+    _, tracking = tmp_paths
+    tracking.write_text(TRACKING, encoding="utf-8")
+    store = importlib.import_module("flashcards.scripts.tracking_store")
+
+    conn = store.open_store()
+    assert store.select_words(conn, "error")[0]["notes"] == "retry"
+    conn.close()
+
+    tracking.write_text(TRACKING.replace("| Fehler | error |", "| Fehler | pending |"), encoding="utf-8")
+    conn = store.open_store()
+    assert store.select_words(conn, "error") == []
+    assert [r["word"] for r in store.select_words(conn, "pending")] == ["Männer", "Baum", "Fehler"]
+    conn.close()
@@ -6,9 +6,13 @@ Covers:
 - Lowercasing and homonym safety
 - Status transitions: in_deck, pending, missing_audio, and preserving error
 - Date update when status changes to in_deck
+- Incremental runs: only words affected by deck/audio changes are re-evaluated
+- JSON change report and the --exit-code "no changes" status
+- Multi-word rows ("sich freuen") refreshed when their lemma changes
 """
 
 import importlib
+import json
 import sys
 from pathlib import Path
 
@@ -97,10 +101,20 @@ def test_update_tracking_statuses_and_dates(tmp_paths, monkeypatch):
 
     # Mock audio: pretend Frage has audio, Schritt has audio, Fehler no audio
     uwt = importlib.import_module("flashcards.scripts.update_word_tracking")
-    monkeypatch.setattr(uwt, "get_audio_filename", lambda w: {
+    audio_files = {
         'Schritt': 'de_schritt.mp3',
         'Frage': 'de_frage.mp3',
-    }.get(w, None))
+    }
+
+    def fake_lookup(words):
+        words = list(words)
+        return {
+            'found': {w: audio_files[w] for w in words if w in audio_files},
+            'missing': [w for w in words if w not in audio_files],
+            'by_dir': {},
+        }
+
+    monkeypatch.setattr(uwt, "lookup_audio_batch", fake_lookup)
 
     # Run update
     uwt.update_tracking_file()
@@ -130,3 +144,133 @@ def test_update_tracking_statuses_and_dates(tmp_paths, monkeypatch):
     assert data['Frage']['status'] == 'in_deck'
     # Error stays error regardless of audio
     assert data['Fehler']['status'] == 'error'
+
+
+def test_incremental_update_touches_only_changed_words(tmp_paths, tmp_path, monkeypatch):
+    import paths
+    deck, tracking = tmp_paths
+
+    generated = tmp_path / "generated_audio"
+    duolingo = tmp_path / "words_from_duolingo"
+    generated.mkdir()
+    duolingo.mkdir()
+    (duolingo / "Tisch.mp3").write_bytes(b"ID3")
+    monkeypatch.setattr(paths, "AUDIO_GENERATED", generated, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_DUOLINGO", duolingo, raising=False)
+
+    write_deck(deck, [
+        "| 00000001 | Reverse RU→DE | Noun | стол | der Tisch | — | — | — | — | Tisch.mp3 |",
+    ])
+    write_tracking(tracking, [
+        "| Tisch | pending | ✅ Tisch.mp3 | — | Noun | 2025-11-08 | — |",
+        "| Baum | missing_audio | ❌ missing | — | Noun | — | — |",
+        "| Haus | missing_audio | ❌ missing | — | Noun | — | — |",
+    ])
+
+    uwt = importlib.import_module("flashcards.scripts.update_word_tracking")
+    real_lookup = uwt.lookup_audio_batch
+    assert uwt.update_tracking_file()['written'] is True  # First run: full evaluation
+
+    # Nothing changed: no lookup, no rewrite
+    def fail_lookup(words):
+        raise AssertionError("audio was re-resolved")
+
+    monkeypatch.setattr(uwt, "lookup_audio_batch", fail_lookup)
+    before = tracking.stat().st_mtime_ns
+    assert uwt.update_tracking_file()['written'] is False
+    assert tracking.stat().st_mtime_ns == before
+
+    # New audio for Baum: only Baum is re-evaluated
+    (generated / "Baum.wav").write_bytes(b"RIFF")
+
+    evaluated = []
+    monkeypatch.setattr(uwt, "lookup_audio_batch", lambda words: real_lookup(evaluated.extend(words) or evaluated))
+
+    assert uwt.update_tracking_file()['written'] is True
+    assert evaluated == ["Baum"]
+
+    rows = {r.split("|")[1].strip(): r for r in read_tracking_rows(tracking)}
+    assert "| Baum | pending | ✅ Baum.wav |" in rows["Baum"]
+    assert "| Tisch | in_deck |" in rows["Tisch"]
+    assert "| Haus | missing_audio |" in rows["Haus"]
+
+
+def test_incremental_matches_full_for_multi_word_rows(tmp_paths, tmp_path, monkeypatch):
+    import paths
+    deck, tracking = tmp_paths
+    generated = tmp_path / "generated_audio"
+    duolingo = tmp_path / "words_from_duolingo"
+    generated.mkdir()
+    duolingo.mkdir()
+    monkeypatch.setattr(paths, "AUDIO_GENERATED", generated, raising=False)
+    monkeypatch.setattr(paths, "AUDIO_DUOLINGO", duolingo, raising=False)
+
+    tisch = "| 00000001 | Reverse RU→DE | Noun | стол | der Tisch | — | — | — | — | — |"
+    write_deck(deck, [tisch])
+    write_tracking(tracking, [
+        "| sich freuen | missing_audio | ❌ missing | — | — | — | — |",
+        "| Tisch | in_deck | ❌ missing | — | Noun | 2025-11-08 | — |",
+    ])
+
+    uwt = importlib.import_module("flashcards.scripts.update_word_tracking")
+    uwt.update_tracking_file()
+
+    # "freuen" enters the deck: the "sich freuen" row matches it through its lemma key
+    write_deck(deck, [tisch, "| 00000002 | Reverse RU→DE | Verb | радоваться | freuen | — | — | — | — | — |"])
+    report = uwt.update_tracking_file()
+    assert report["mode"] == "incremental"
+    assert [c["word"] for c in report["new_in_deck"]] == ["sich freuen"]
+    incremental = tracking.read_text(encoding="utf-8")
+
+    assert uwt.update_tracking_file(full=True)["changed"] is False
+    assert tracking.read_text(encoding="utf-8") == incremental
+
+
+def test_change_report_and_exit_code(tmp_paths, monkeypatch):
+    deck, tracking = tmp_paths
+    write_deck(deck, [
+        "| 00000001 | Reverse RU→DE | Noun | стол | der Tisch | — | — | — | — | Tisch.mp3 |",
+    ])
+    write_tracking(tracking, [
+        "| Tisch | pending | ✅ Tisch.mp3 | — | Noun | — | — |",
+        "| Baum | missing_audio | ❌ missing | — | Noun | — | — |",
+        "| Haus | missing_audio | ❌ missing | — | Noun | — | — |",
+    ])
+
+    uwt = importlib.import_module("flashcards.scripts.update_word_tracking")
+    audio_files = {'Tisch': 'Tisch.mp3', 'Baum': 'Baum.wav'}
+
+    def fake_lookup(words):
+        words = list(words)
+        return {
+            'found': {w: audio_files[w] for w in words if w in audio_files},
+            'missing': [w for w in words if w not in audio_files],
+            'by_dir': {},
+        }
+
+    monkeypatch.setattr(uwt, "lookup_audio_batch", fake_lookup)
+    monkeypatch.setattr(uwt, "audio_snapshot", lambda: {})
+    monkeypatch.setattr(sys, "argv", ["update_word_tracking.py", "--exit-code"])
+    assert uwt.main() == 0
+
+    report_file = tracking.with_name("word_tracking.changes.json")
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert report["changed"] is True
+    assert report["mode"] == "full"
+    assert {(c["word"], c["from"], c["to"]) for c in report["status_changes"]} == {
+        ("Tisch", "pending", "in_deck"),
+        ("Baum", "missing_audio", "pending"),
+    }
+    assert report["audio_changes"] == [{"word": "Baum", "from": None, "to": "Baum.wav"}]
+    assert [(c["word"], c["date_added"]) for c in report["new_in_deck"]] == [
+        ("Tisch", report["generated_at"][:10]),
+    ]
+    assert report["totals"] == {"in_deck": 1, "pending": 1, "missing_audio": 1, "error": 0, "total": 3}
+
+    # Second run: nothing changed, the report says so and the exit code signals it
+    assert uwt.main() == uwt.EXIT_NO_CHANGES
+    report = json.loads(report_file.read_text(encoding="utf-8"))
+    assert report["changed"] is False
+    assert report["mode"] == "unchanged"
+    assert report["status_changes"] == [] and report["new_in_deck"] == []
+    assert report["totals"]["total"] == 3
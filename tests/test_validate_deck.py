@@ -0,0 +1,77 @@
+"""Tests for validate_deck.py (per-card rule engine).
+
+Covers:
+- Rule dispatch by model and fields
+- Same issues, in deck order, with and without the process pool
+- Serial unless workers > 1 is asked for
+- A newly registered rule runs in the same pass
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def _notes():
+    notes = []
+    for i in range(23):
+        guid = f"{i:08d}"
+        if i % 3 == 0:
+            fields = {"Article": "der", "Noun": "Hund", "Gender": "f" if i % 2 else "m",
+                      "Example_DE": "<b>Der Hund</b>", "Example_RU": "—", "Notes": "x"}
+            model = "German Noun"
+        elif i % 3 == 1:
+            fields = {"Cloze_German": "{{c1::die}} Katze" if i % 2 else "die Katze",
+                      "Example_DE": "<br>", "Example_RU": "y", "Notes": "z"}
+            model = "German Noun Cloze"
+        else:
+            fields = {"Infinitive": "gehen", "Example_DE": "a", "Example_RU": "b", "Notes": "c"}
+            model = "German Verb"
+        notes.append({"guid": guid, "model_name": model, "fields": fields})
+    notes.append(dict(notes[2]))  # Duplicate ID
+    return notes
+
+
+def test_rule_dispatch():
+    mod = importlib.reload(importlib.import_module("flashcards.scripts.validate_deck"))
+    names = lambda rules: [r["name"] for r in rules]
+    assert names(mod.rules_for("German Verb", {"Infinitive": "", "Notes": ""})) == ["validate_empty_fields"]
+    assert names(mod.rules_for("German Noun Cloze", {"Cloze_German": ""})) == ["validate_cloze_syntax"]
+    assert names(mod.rules_for("German Noun", {"Article": ""})) == ["validate_gender_article"]
+
+
+def test_parallel_chunks_match_serial(monkeypatch):
+    mod = importlib.reload(importlib.import_module("flashcards.scripts.validate_deck"))
+    md_ids = {f"{i:08d}" for i in range(20)}
+
+    # Serial by default: the pool is opt-in
+    def fail_pool(*args, **kwargs):
+        raise AssertionError("process pool started without --workers")
+
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", fail_pool)
+    serial = mod.check_deck_notes(iter(_notes()), md_ids, chunk_size=4)
+    monkeypatch.setattr(mod, "ProcessPoolExecutor", importlib.import_module("concurrent.futures").ProcessPoolExecutor)
+    total, id_counts, orphaned, issues = serial
+    assert total == 24
+    assert sorted(orphaned) == ["00000020", "00000021", "00000022"]
+    assert issues["duplicate_ids"] == {"00000002": 2}
+    assert [i["guid"] for i in issues["gender_mismatches"]] == ["00000003", "00000009", "00000015", "00000021"]
+    assert [i["guid"] for i in issues["cloze_errors"]] == ["00000004", "00000010", "00000016", "00000022"]
+    assert issues["empty_fields"][0] == {"guid": "00000000", "issues": ["Empty field: Example_RU"]}
+
+    assert mod.check_deck_notes(iter(_notes()), md_ids, workers=3, chunk_size=4) == serial
+
+    # A new rule is picked up by the same pass (and by the worker processes)
+    def validate_verb_notes(card):
+        return "verb" if card["fields"]["Notes"] == "c" else None
+
+    monkeypatch.setattr(mod, "RULES", list(mod.RULES))
+    mod.rule("verb_notes", fields=("Infinitive",), models=("Verb",))(validate_verb_notes)
+    _, _, _, issues = mod.check_deck_notes(iter(_notes()), md_ids, workers=2, chunk_size=5)
+    assert len(issues["verb_notes"]) == 8
+    assert issues["gender_mismatches"] == serial[3]["gender_mismatches"]